@@ -0,0 +1,376 @@
+"""In-process stand-in for the Deluge Web UI ``/json`` endpoint.
+
+Serves enough of the JSON-RPC API for the integration (auth, session
+status, torrent listing with filters, config, torrent operations,
+``web.update_ui``) over a real aiohttp server, with a configurable library
+size and injected latency. Config changes and torrent operations are
+queued as events for sessions that registered for them and returned by
+``web.get_events``, which holds the call up to ``event_wait`` seconds and
+then answers None, like Deluge's Web UI after its 300 s hold.
+Files registered with ``serve_file`` are served over GET ``/files/<name>``
+with ETag revalidation, as a stand-in for .torrent download sites.
+
+    fake = FakeDeluge(torrents=10_000, latency=0.005)
+    await fake.start()
+    ... DelugeClient(fake.host, fake.port, fake.password) ...
+    await fake.stop()
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import random
+import secrets
+from aiohttp import web
+
+EVENT_HOLD = 300.0  # seconds Deluge's Web UI holds an idle web.get_events
+STATES = ("Downloading", "Seeding", "Paused", "Queued")
+LABELS = ("", "tv", "movies", "linux-isos", "music")
+TRACKERS = ("tracker.example.org", "open.example.net", "private.example.com")
+
+
+class FakeDeluge:
+    """Fake Deluge Web UI holding a synthetic torrent library."""
+
+    def __init__(
+        self,
+        torrents: int = 100,
+        latency: float = 0.0,
+        password: str = "deluge",
+        legacy: bool = False,
+        seed: int = 1,
+        event_wait: float = EVENT_HOLD,
+    ):
+        """Create the fake daemon.
+
+        ``legacy`` emulates Deluge 1.3: no ``core.*_torrents`` plural
+        methods and no ``web.update_ui`` batching.
+        """
+        self.password = password
+        self.latency = latency
+        self.legacy = legacy
+        self.host = "127.0.0.1"
+        self.port = None
+        self.config = {
+            "max_download_speed": -1.0,
+            "max_upload_speed": -1.0,
+            "max_connections_global": 200,
+            "max_active_downloading": 3,
+            "max_active_seeding": 5,
+            "max_upload_slots_global": 4,
+        }
+        self.calls = {}  # method -> count
+        self.logins = 0
+        self.bytes_sent = 0
+        self._sessions = set()
+        self.event_wait = event_wait
+        self._listeners = {}  # session id -> registered event names
+        self._events = {}  # session id -> queued [name, args]
+        self._event_ready = asyncio.Event()
+        self._closing = False
+        self.files = {}  # name -> (body, ETag or None, chunked)
+        self.file_requests = 0
+        self.files_not_modified = 0
+        self._runner = None
+        self._rng = random.Random(seed)
+        self.torrents = {}
+        for index in range(torrents):
+            self.add_synthetic_torrent(index)
+
+    # -- library -------------------------------------------------------
+
+    def add_synthetic_torrent(self, index: int) -> str:
+        """Add one generated torrent and return its hash."""
+        rng = self._rng
+        torrent_id = hashlib.sha1(f"torrent-{index}".encode()).hexdigest()
+        state = rng.choices(STATES, weights=(5, 60, 30, 5))[0]
+        size = rng.randint(50, 50_000) * 1024 * 1024
+        progress = 100.0 if state == "Seeding" else round(rng.uniform(0, 99.9), 2)
+        self.torrents[torrent_id] = {
+            "name": f"Synthetic.Torrent.{index:06d}.1080p",
+            "state": state,
+            "progress": progress,
+            # Demand: what the torrent would transfer without a global limit
+            "download_payload_rate": rng.randint(50, 4000) * 1024 if state == "Downloading" else 0,
+            "upload_payload_rate": rng.randint(1, 500) * 1024 if state == "Seeding" and rng.random() < 0.1 else 0,
+            "eta": rng.randint(60, 86_400) if state == "Downloading" else 0,
+            "ratio": round(rng.uniform(0, 5), 3),
+            "label": rng.choice(LABELS),
+            "time_added": 1_700_000_000 + index,
+            "total_size": size,
+            "total_done": int(size * progress / 100),
+            "queue": index if state != "Seeding" else -1,
+            "tracker_host": rng.choice(TRACKERS),
+            "max_download_speed": -1,
+            "max_upload_speed": -1,
+        }
+        return torrent_id
+
+    def _scaled_rates(self):
+        """Return (download, upload) session rates after the global limits."""
+        down = sum(t["download_payload_rate"] for t in self.torrents.values() if t["state"] == "Downloading")
+        up = sum(t["upload_payload_rate"] for t in self.torrents.values() if t["state"] == "Seeding")
+        if self.config["max_download_speed"] > 0:
+            down = min(down, self.config["max_download_speed"] * 1024)
+        if self.config["max_upload_speed"] > 0:
+            up = min(up, self.config["max_upload_speed"] * 1024)
+        return down, up
+
+    def _filter(self, filter_dict: dict) -> list:
+        """Apply a Deluge filter_dict (id/state/label, lists or scalars)."""
+        ids = list(self.torrents)
+        for key, value in (filter_dict or {}).items():
+            values = [value] if isinstance(value, str) else list(value)
+            if key == "id":
+                wanted = set(values)
+                ids = [i for i in ids if i in wanted]
+                continue
+            if key == "state" and "Active" in values:
+                values.remove("Active")
+                ids = [
+                    i for i in ids
+                    if self.torrents[i]["download_payload_rate"] or self.torrents[i]["upload_payload_rate"]
+                ]
+                if not values:
+                    continue
+            ids = [i for i in ids if self.torrents[i].get(key) in values]
+        return ids
+
+    def _filter_tree(self) -> dict:
+        """Return ``core.get_filter_tree`` output with state counts only."""
+        counts = {}
+        for info in self.torrents.values():
+            counts[info["state"]] = counts.get(info["state"], 0) + 1
+        active = len(self._filter({"state": "Active"}))
+        return {"state": [["All", len(self.torrents)], ["Active", active], *sorted(counts.items())]}
+
+    def _status(self, filter_dict: dict, keys: list) -> dict:
+        """Return ``core.get_torrents_status`` output."""
+        return {
+            torrent_id: {key: self.torrents[torrent_id].get(key) for key in keys}
+            for torrent_id in self._filter(filter_dict)
+        }
+
+    # -- events --------------------------------------------------------
+
+    def emit(self, name: str, *args) -> None:
+        """Queue an event for every session listening to ``name``."""
+        for session_id, names in self._listeners.items():
+            if name in names:
+                self._events.setdefault(session_id, []).append([name, list(args)])
+        self._event_ready.set()
+
+    async def _get_events(self, session_id: str):
+        """Return the session's queued events, or None after ``event_wait`` idle seconds."""
+        if session_id not in self._listeners:
+            return None
+        deadline = asyncio.get_running_loop().time() + self.event_wait
+        while not self._events.get(session_id):
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0 or self._closing:
+                return None
+            self._event_ready.clear()
+            try:
+                await asyncio.wait_for(self._event_ready.wait(), remaining)
+            except asyncio.TimeoutError:
+                return None
+        return self._events.pop(session_id)
+
+    # -- JSON-RPC ------------------------------------------------------
+
+    async def _rpc(self, method: str, params: list, session_id: str = None):
+        """Dispatch one authenticated call; raise KeyError for unknown methods."""
+        if method == "web.register_event_listener":
+            self._listeners.setdefault(session_id, set()).add(params[0])
+            return None
+        if method == "web.get_events":
+            return await self._get_events(session_id)
+        if method == "daemon.get_method_list":
+            return sorted(self._methods())
+        if method == "core.get_session_status":
+            down, up = self._scaled_rates()
+            stats = {"download_rate": down, "upload_rate": up, "num_peers": 42, "dht_nodes": 300}
+            return {key: stats.get(key, 0) for key in params[0]}
+        if method == "core.get_torrents_status":
+            return self._status(params[0], params[1])
+        if method == "core.get_filter_tree":
+            return self._filter_tree()
+        if method == "core.get_config":
+            return dict(self.config)
+        if method == "core.get_config_values":
+            return {key: self.config.get(key) for key in params[0]}
+        if method == "core.set_config":
+            for key, value in params[0].items():
+                self.config[key] = value
+                self.emit("ConfigValueChangedEvent", key, value)
+            return None
+        if method in ("core.pause_torrent", "core.pause_torrents"):
+            return self._set_state(params[0], "Paused")
+        if method in ("core.resume_torrent", "core.resume_torrents"):
+            return self._set_state(params[0], "Downloading")
+        if method == "core.remove_torrent":
+            if params[0] not in self.torrents:
+                raise LookupError(f"Torrent not found: {params[0]}")
+            self._remove([params[0]])
+            return True
+        if method == "core.remove_torrents":
+            # Deluge 2 reports unknown hashes per torrent instead of failing the call
+            errors = [[torrent_id, "Torrent not found"] for torrent_id in params[0] if torrent_id not in self.torrents]
+            self._remove(params[0])
+            return errors
+        if method in ("core.add_torrent_magnet", "core.add_torrent_file"):
+            torrent_id = self.add_synthetic_torrent(len(self.torrents) + 1_000_000)
+            self.emit("TorrentAddedEvent", torrent_id, False)
+            return torrent_id
+        if method == "web.update_ui":
+            keys, filter_dict = params
+            down, up = self._scaled_rates()
+            return {
+                "connected": True,
+                "torrents": self._status(filter_dict, keys),
+                "filters": self._filter_tree(),
+                "stats": {
+                    "download_rate": down,
+                    "upload_rate": up,
+                    "max_download": self.config["max_download_speed"],
+                    "max_upload": self.config["max_upload_speed"],
+                    "num_connections": 42,
+                    "dht_nodes": 300,
+                },
+            }
+        raise KeyError(method)
+
+    def _methods(self) -> set:
+        """Return the method names this fake exposes."""
+        methods = {
+            "daemon.get_method_list", "core.get_session_status", "core.get_torrents_status",
+            "core.get_config", "core.get_config_values", "core.set_config", "core.get_filter_tree",
+            "core.pause_torrent", "core.resume_torrent", "core.remove_torrent",
+            "core.add_torrent_magnet", "core.add_torrent_file",
+            "web.register_event_listener", "web.get_events",
+        }
+        if not self.legacy:
+            methods |= {"core.pause_torrents", "core.resume_torrents", "core.remove_torrents", "web.update_ui"}
+        return methods
+
+    def _set_state(self, torrent_ids: list, state: str) -> None:
+        """Move torrents to ``state``."""
+        for torrent_id in torrent_ids:
+            if torrent_id in self.torrents:
+                self.torrents[torrent_id]["state"] = state
+                self.emit("TorrentStateChangedEvent", torrent_id, state)
+
+    def _remove(self, torrent_ids: list) -> None:
+        """Remove torrents from the library."""
+        for torrent_id in torrent_ids:
+            if self.torrents.pop(torrent_id, None) is not None:
+                self.emit("TorrentRemovedEvent", torrent_id)
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        """Handle one POST to /json."""
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        body = await request.json()
+        method, params, request_id = body["method"], body.get("params", []), body.get("id")
+        self.calls[method] = self.calls.get(method, 0) + 1
+        cookies = {}
+        reply = {"id": request_id, "result": None, "error": None}
+
+        if method == "auth.login":
+            if params and params[0] == self.password:
+                self.logins += 1
+                session_id = secrets.token_hex(16)
+                self._sessions.add(session_id)
+                cookies["_session_id"] = session_id
+                reply["result"] = True
+            else:
+                reply["result"] = False
+        elif request.cookies.get("_session_id") not in self._sessions:
+            reply["error"] = {"message": "Not authenticated", "code": 1}
+        elif method not in self._methods():
+            reply["error"] = {"message": "Unknown method", "code": 2}
+        else:
+            try:
+                reply["result"] = await self._rpc(method, params, request.cookies.get("_session_id"))
+            except Exception as err:  # Surface fake bugs as RPC errors
+                reply["error"] = {"message": repr(err), "code": 3}
+
+        text = json.dumps(reply)
+        self.bytes_sent += len(text)
+        response = web.Response(text=text, content_type="application/json")
+        for name, value in cookies.items():
+            response.set_cookie(name, value, path="/json")
+        return response
+
+    # -- file downloads ------------------------------------------------
+
+    def serve_file(self, name: str, body: bytes, etag: bool = True, chunked: bool = False) -> str:
+        """Serve ``body`` at ``/files/<name>`` and return its URL.
+
+        ``etag`` answers revalidations with 304; ``chunked`` streams the
+        body without a Content-Length, so only a streaming cap can stop it.
+        """
+        tag = f'"{hashlib.sha1(body).hexdigest()}"' if etag else None
+        self.files[name] = (body, tag, chunked)
+        return f"http://{self.host}:{self.port}/files/{name}"
+
+    async def _handle_file(self, request: web.Request) -> web.StreamResponse:
+        """Handle one GET of a served file."""
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.file_requests += 1
+        served = self.files.get(request.match_info["name"])
+        if served is None:
+            return web.Response(status=404)
+        body, tag, chunked = served
+        headers = {"Content-Type": "application/x-bittorrent"}
+        if tag is not None:
+            if request.headers.get("If-None-Match") == tag:
+                self.files_not_modified += 1
+                return web.Response(status=304, headers={"ETag": tag})
+            headers["ETag"] = tag
+        if not chunked:
+            return web.Response(body=body, headers=headers)
+        response = web.StreamResponse(headers=headers)
+        response.enable_chunked_encoding()
+        await response.prepare(request)
+        try:
+            for start in range(0, len(body), 64 * 1024):
+                await response.write(body[start:start + 64 * 1024])
+            await response.write_eof()
+        except ConnectionResetError:
+            pass  # The client gave up at its byte cap
+        return response
+
+    def expire_sessions(self) -> None:
+        """Invalidate every auth cookie, as a Web UI restart would."""
+        self._sessions.clear()
+        self._listeners.clear()
+        self._events.clear()
+
+    async def start(self) -> None:
+        """Start serving on a random local port."""
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_post("/json", self._handle)
+        app.router.add_get("/files/{name}", self._handle_file)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """Stop serving, releasing held web.get_events calls first."""
+        self._closing = True
+        self._event_ready.set()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+TORRENT_BYTES = b"d4:infod4:name4:testee"  # Tiny bencoded .torrent body
+
+
+def torrent_b64() -> str:
+    """Return a tiny bencoded payload for add_torrent_file calls."""
+    return base64.b64encode(TORRENT_BYTES).decode()
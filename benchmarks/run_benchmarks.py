@@ -0,0 +1,235 @@
+"""Latency and allocation benchmarks against the fake Deluge Web UI.
+
+Run from the repository root with Home Assistant installed:
+
+    python -m benchmarks.run_benchmarks --sizes 100 1000 10000 --latency-ms 2
+
+For every library size it reports p50/p99 wall time and the peak traced
+allocation of one call for the coordinator refresh (full and delta sync),
+the switch's ``_set_speed`` and each service handler. ``add_torrent`` by
+URL downloads from files the fake serves: a new URL per call, an
+ETag-revalidated one (304), one cached without validators and one over
+the fetcher's byte cap. Remove cases take synthetic torrents added to the
+fake right before each call.
+"""
+import argparse
+import asyncio
+import itertools
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "custom_components"))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.helpers import entity_registry as er  # noqa: E402
+
+from deluge_speed_toggle.api import DelugeClient  # noqa: E402
+from deluge_speed_toggle.const import DOMAIN  # noqa: E402
+from deluge_speed_toggle.coordinator import TORRENT_KEYS, DelugeDataCoordinator  # noqa: E402
+from deluge_speed_toggle.fetch import MAX_TORRENT_BYTES, TorrentFileFetcher  # noqa: E402
+from deluge_speed_toggle.pipeline import SpeedPipeline  # noqa: E402
+from deluge_speed_toggle.speed_toggle import DelugeSpeedToggleSwitch, async_setup_services  # noqa: E402
+
+from .fake_deluge import TORRENT_BYTES, FakeDeluge, torrent_b64  # noqa: E402
+
+DEFAULT_SIZES = (100, 1_000, 10_000, 50_000)
+# Speed limits alternated per call so the pipeline never skips a write as a no-op
+SPEED_VALUES = ((500, 100), (600, 200))
+REMOVE_BATCH = 10  # Torrents per remove_torrents call
+
+
+async def measure(name: str, make_call, iterations: int, alloc_iterations: int) -> dict:
+    """Time ``make_call()`` coroutines, then trace allocations of a few more."""
+    await make_call()  # Warm-up: login, probes, first full sync
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await make_call()
+        timings.append(time.perf_counter() - start)
+
+    peaks = []
+    tracemalloc.start()
+    for _ in range(alloc_iterations):
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        await make_call()
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+
+    quantiles = statistics.quantiles(timings, n=100) if len(timings) > 1 else timings * 99
+    return {
+        "name": name,
+        "p50_ms": quantiles[49] * 1000,
+        "p99_ms": quantiles[98] * 1000,
+        "peak_kib": max(peaks) / 1024 if peaks else 0,
+    }
+
+
+def alternating(call):
+    """Return a factory calling ``call(download, upload)`` with the next ``SPEED_VALUES`` pair."""
+    values = itertools.cycle(SPEED_VALUES)
+    return lambda: call(*next(values))
+
+
+async def bench_size(
+    size: int, latency: float, iterations: int, alloc_iterations: int, legacy: bool, all_keys: bool
+) -> list:
+    """Run every benchmark against one library size."""
+    fake = FakeDeluge(torrents=size, latency=latency, legacy=legacy)
+    await fake.start()
+    config = {"host": fake.host, "port": fake.port, "password": fake.password}
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        client = DelugeClient(fake.host, fake.port, fake.password)
+        fetcher = TorrentFileFetcher()
+        coordinator = DelugeDataCoordinator(hass, config, client)
+        # No debounce: time the write itself, not the coalescing window
+        pipeline = SpeedPipeline(client, coordinator, delay=0)
+        if all_keys:
+            # As if every torrent-detail consumer were enabled
+            coordinator.async_register_keys(TORRENT_KEYS)
+        hass.data[DOMAIN] = {"bench": {
+            "config": config,
+            "client": client,
+            "coordinator": coordinator,
+            "pipeline": pipeline,
+            "fetcher": fetcher,
+        }}
+        await async_setup_services(hass)
+        switch = DelugeSpeedToggleSwitch(hass, config, client, coordinator, pipeline)
+        # toggle_download_speed finds the switch by unique_id and calls switch.turn_on/off
+        await er.async_load(hass)
+        switch.entity_id = er.async_get(hass).async_get_or_create(
+            "switch", DOMAIN, switch.unique_id
+        ).entity_id
+        switch.async_write_ha_state()
+
+        async def switch_service(call):
+            """Stand in for the switch component, routing to the benchmark switch."""
+            await getattr(switch, f"async_{call.service}")()
+
+        for switch_action in ("turn_on", "turn_off"):
+            hass.services.async_register("switch", switch_action, switch_service)
+        some_id = next(iter(fake.torrents))
+        removable = itertools.count(2_000_000)  # Synthetic torrent indexes no other case uses
+        fresh_url = fake.serve_file("fresh.torrent", TORRENT_BYTES)
+        fresh_urls = (f"{fresh_url}?n={n}" for n in itertools.count())  # One cache miss per call
+        revalidated_url = fake.serve_file("revalidated.torrent", TORRENT_BYTES)
+        cached_url = fake.serve_file("cached.torrent", TORRENT_BYTES, etag=False)
+        oversized_url = fake.serve_file(
+            "oversized.torrent", bytes(MAX_TORRENT_BYTES + 1), etag=False, chunked=True
+        )
+
+        async def full_refresh():
+            coordinator.async_request_full_sync()
+            await coordinator._fetch_deluge_data()
+
+        async def service(name, data=None):
+            await hass.services.async_call(DOMAIN, name, data or {}, blocking=True)
+
+        async def toggle_speed():
+            await service("toggle_download_speed")
+            await hass.async_block_till_done()  # switch.turn_on/off is called without blocking
+
+        def remove_one():
+            return service("remove_torrent", {"torrent_id": fake.add_synthetic_torrent(next(removable))})
+
+        def remove_batch():
+            torrent_ids = [fake.add_synthetic_torrent(next(removable)) for _ in range(REMOVE_BATCH)]
+            return service("remove_torrents", {"torrent_ids": torrent_ids})
+
+        cases = [
+            ("fetch_deluge_data (full)", full_refresh),
+            ("fetch_deluge_data (delta)", coordinator._fetch_deluge_data),
+            ("switch _set_speed", alternating(switch._set_speed)),
+            ("service set_speed", alternating(
+                lambda download, upload: service("set_speed", {"download": download, "upload": upload})
+            )),
+            ("service toggle_download_speed", toggle_speed),
+            ("service test_connection", lambda: service("test_connection")),
+            ("service test_api", lambda: service("test_api")),
+            ("service add_torrent (magnet)", lambda: service("add_torrent", {"magnet_link": "magnet:?xt=urn:btih:bench"})),
+            ("service add_torrent (data)", lambda: service("add_torrent", {"torrent_data": torrent_b64()})),
+            ("service add_torrent (url)", lambda: service("add_torrent", {"torrent_url": next(fresh_urls)})),
+            ("service add_torrent (url, 304)", lambda: service("add_torrent", {"torrent_url": revalidated_url})),
+            ("service add_torrent (url, cached)", lambda: service("add_torrent", {"torrent_url": cached_url})),
+            ("service add_torrent (url, over cap)", lambda: service("add_torrent", {"torrent_url": oversized_url})),
+            ("service pause_torrent", lambda: service("pause_torrent", {"torrent_id": some_id})),
+            ("service resume_torrent", lambda: service("resume_torrent", {"torrent_id": some_id})),
+            ("service pause_torrents (label)", lambda: service("pause_torrents", {"label": "tv"})),
+            ("service resume_torrents (label)", lambda: service("resume_torrents", {"label": "tv"})),
+            ("service remove_torrent", remove_one),
+            (f"service remove_torrents ({REMOVE_BATCH})", remove_batch),
+        ]
+
+        results = []
+        try:
+            for name, make_call in cases:
+                calls_before = sum(fake.calls.values())
+                bytes_before = fake.bytes_sent
+                result = await measure(name, make_call, iterations, alloc_iterations)
+                runs = iterations + alloc_iterations + 1
+                result["rpcs"] = (sum(fake.calls.values()) - calls_before) / runs
+                result["resp_kib"] = (fake.bytes_sent - bytes_before) / runs / 1024
+                results.append(result)
+        finally:
+            await client.async_close()
+            await fetcher.async_close()
+            await fake.stop()
+            await hass.async_stop(force=True)
+    results.append({"name": "logins", "logins": fake.logins})
+    results.append({
+        "name": "torrent files",
+        "hits": fetcher.hits,
+        "misses": fetcher.misses,
+        "requests": fake.file_requests,
+        "not_modified": fake.files_not_modified,
+    })
+    return results
+
+
+def print_results(size: int, results: list) -> None:
+    """Print one table per library size."""
+    print(f"\n== {size} torrents ==")
+    print(f"{'benchmark':36} {'p50 ms':>9} {'p99 ms':>9} {'peak KiB':>10} {'RPCs':>6} {'resp KiB':>9}")
+    for result in results:
+        if "logins" in result:
+            print(f"auth.login calls during run: {result['logins']}")
+            continue
+        if "hits" in result:
+            print(
+                f"torrent file cache: {result['hits']} hits, {result['misses']} misses; "
+                f"{result['requests']} downloads requested, {result['not_modified']} answered 304"
+            )
+            continue
+        print(
+            f"{result['name']:36} {result['p50_ms']:9.2f} {result['p99_ms']:9.2f} "
+            f"{result['peak_kib']:10.1f} {result['rpcs']:6.1f} {result['resp_kib']:9.1f}"
+        )
+
+
+async def main() -> None:
+    """Parse arguments and run the suite."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Injected latency per RPC")
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--alloc-iterations", type=int, default=3)
+    parser.add_argument("--legacy", action="store_true", help="Emulate Deluge 1.3 (no update_ui, no plural ops)")
+    parser.add_argument("--all-keys", action="store_true", help="Fetch every torrent key, not just the base projection")
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        results = await bench_size(
+            size, args.latency_ms / 1000, args.iterations, args.alloc_iterations, args.legacy, args.all_keys
+        )
+        print_results(size, results)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,110 @@
+"""Closed-loop run of the adaptive controller against the fake Deluge Web UI.
+
+Run from the repository root with Home Assistant installed:
+
+    python -m benchmarks.run_controller --budget 1000 --headroom 100 --minutes 30
+
+Simulated time advances one poll interval per step. Each step sets a
+synthetic WAN sensor to the other devices' traffic (a slow wave) plus the
+fake daemon's limited download rate with protocol overhead, refreshes the
+coordinator and lets the controller react. It prints the trajectory and
+the time spent above the budget, the mean error and the number of writes.
+"""
+import argparse
+import asyncio
+import math
+import sys
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "custom_components"))
+
+from homeassistant.const import UnitOfDataRate  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from deluge_speed_toggle.api import DelugeClient  # noqa: E402
+from deluge_speed_toggle.controller import CONF_CONTROLLER, AdaptiveController  # noqa: E402
+from deluge_speed_toggle.coordinator import DelugeDataCoordinator  # noqa: E402
+from deluge_speed_toggle.pipeline import SpeedPipeline  # noqa: E402
+
+from .fake_deluge import FakeDeluge  # noqa: E402
+
+WAN_SENSOR = "sensor.synthetic_wan_download"
+OVERHEAD = 1.05  # WAN bytes per payload byte
+
+
+def other_traffic(seconds: float, base: float) -> float:
+    """Return the other devices' download traffic in KiB/s at ``seconds``."""
+    return base * (1 + 0.6 * math.sin(seconds / 300)) + (base if 600 <= seconds % 1800 < 900 else 0)
+
+
+async def run(args) -> None:
+    """Run the loop for ``args.minutes`` of simulated time."""
+    fake = FakeDeluge(torrents=args.torrents)
+    await fake.start()
+    clock = SimpleNamespace(now=0.0)
+    settings = {
+        "download_budget": args.budget,
+        "wan_download_sensor": WAN_SENSOR,
+        "headroom": args.headroom,
+        "min_step": args.min_step,
+        "min_write_interval": args.min_write_interval,
+    }
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        client = DelugeClient(fake.host, fake.port, fake.password)
+        coordinator = DelugeDataCoordinator(hass, {"host": fake.host, "port": fake.port}, client)
+        pipeline = SpeedPipeline(client, coordinator, delay=0.01)
+        entry = SimpleNamespace(options={CONF_CONTROLLER: settings})
+        controller = AdaptiveController(hass, entry, pipeline, coordinator, clock=lambda: clock.now)
+        controller.async_start()
+
+        over = 0
+        errors = []
+        print(f"{'t s':>6} {'other':>7} {'deluge':>7} {'wan':>7} {'limit':>7}")
+        try:
+            for step in range(int(args.minutes * 60 / args.interval)):
+                clock.now = step * args.interval
+                other = other_traffic(clock.now, args.other)
+                down, _ = fake._scaled_rates()
+                wan = other + down / 1024 * OVERHEAD
+                hass.states.async_set(
+                    WAN_SENSOR, round(wan, 1), {"unit_of_measurement": UnitOfDataRate.KIBIBYTES_PER_SECOND}
+                )
+                await coordinator.async_refresh()
+                await asyncio.sleep(0.05)  # Let the pipeline flush a write
+                target = args.budget - args.headroom
+                over += wan > args.budget
+                errors.append(abs(target - wan))
+                if step % max(int(60 / args.interval), 1) == 0:
+                    limit = fake.config["max_download_speed"]
+                    print(f"{clock.now:6.0f} {other:7.0f} {down / 1024:7.0f} {wan:7.0f} {limit:7.0f}")
+        finally:
+            controller.async_stop()
+            await client.async_close()
+            await fake.stop()
+            await hass.async_stop(force=True)
+
+    print(f"\nsteps above budget: {over}/{len(errors)}")
+    print(f"mean |error| vs budget - headroom: {sum(errors) / len(errors):.1f} KiB/s")
+    print(f"set_config writes: {fake.calls.get('core.set_config', 0)} (controller: {controller.writes})")
+
+
+def main() -> None:
+    """Parse arguments and run the simulation."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget", type=int, default=1000, help="WAN download budget in KiB/s")
+    parser.add_argument("--headroom", type=int, default=100, help="KiB/s kept free")
+    parser.add_argument("--other", type=float, default=250, help="Mean traffic of other devices in KiB/s")
+    parser.add_argument("--minutes", type=float, default=30)
+    parser.add_argument("--interval", type=float, default=5, help="Simulated poll interval in seconds")
+    parser.add_argument("--min-step", type=int, default=16)
+    parser.add_argument("--min-write-interval", type=int, default=30)
+    parser.add_argument("--torrents", type=int, default=200)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
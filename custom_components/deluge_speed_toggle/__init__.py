@@ -1,49 +1,142 @@
 import logging
-from homeassistant.core import HomeAssistant
-from .const import DOMAIN
-from .speed_toggle import async_setup_services
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from .const import DOMAIN, DATA_FLEET
+from .api import DelugeClient
+from .controller import AdaptiveController
+from .coordinator import DelugeDataCoordinator
+from .events import DelugeEventStream
+from .fetch import TorrentFileFetcher
+from .fleet import DelugeFleet
+from .pipeline import SpeedPipeline
+from .policy import PolicyEngine
+from .schedule import SpeedSchedule
+from .sensor import SENSOR_TORRENT_KEYS
+from .speed_toggle import SWITCH_TORRENT_KEYS, async_setup_services, async_unload_services
 
 _LOGGER = logging.getLogger(__name__)
 
 # Platform constants for compatibility
 try:
     from homeassistant.const import Platform
-    PLATFORMS = [Platform.SWITCH, Platform.SENSOR]
+    PLATFORMS = [Platform.SWITCH, Platform.SENSOR, Platform.SELECT]
 except ImportError:
     # Older HA versions don't have Platform enum
-    PLATFORMS = ["switch", "sensor"]
+    PLATFORMS = ["switch", "sensor", "select"]
+
+# Sensor unique_id suffixes that had no host/port before multi-daemon support
+LEGACY_SENSOR_KEYS = ("download_speed_kbs", "upload_speed_kbs", "torrent_count", "active_torrents", "status")
+
+async def _async_migrate_unique_ids(hass: HomeAssistant, entry) -> None:
+    """Move sensors from the old host-less unique IDs to host/port ones."""
+    prefix = f"{DOMAIN}_{entry.data['host']}_{entry.data['port']}"
+    legacy = {f"{DOMAIN}_{key}": f"{prefix}_{key}" for key in LEGACY_SENSOR_KEYS}
+
+    @callback
+    def _migrate(entity_entry):
+        if entity_entry.domain == "sensor" and entity_entry.unique_id in legacy:
+            return {"new_unique_id": legacy[entity_entry.unique_id]}
+        return None
+
+    await er.async_migrate_entries(hass, entry.entry_id, _migrate)
+
+async def _async_release_entry(hass: HomeAssistant, entry_id: str) -> None:
+    """Stop an entry's background work, close its sessions and drop its data."""
+    data = hass.data.get(DOMAIN, {}).pop(entry_id, None)
+    if DATA_FLEET in hass.data:
+        hass.data[DATA_FLEET].async_remove_coordinator(entry_id)
+    if data is not None:
+        data["schedule"].async_stop()
+        data["policy"].async_stop()
+        data["controller"].async_stop()
+        data["events"].async_stop()
+        data["pipeline"].async_stop()
+        await data["coordinator"].async_shutdown()
+        await data["client"].async_close()
+        await data["fetcher"].async_close()
+    if DOMAIN in hass.data and not hass.data[DOMAIN]:
+        async_unload_services(hass)
+        del hass.data[DOMAIN]
+        hass.data.pop(DATA_FLEET, None)
 
 async def async_setup_entry(hass: HomeAssistant, entry):
     """Set up Deluge Speed from a config entry."""
+    platforms_loaded = False
     try:
         _LOGGER.debug("Setting up Deluge Speed integration")
-        hass.data[DOMAIN] = entry.data
+        # One pooled client per entry, shared by services, switch and sensors
+        client = DelugeClient(
+            entry.data["host"],
+            entry.data["port"],
+            entry.data["password"],
+        )
+        # Created here so the switch and sensors subscribe to the same one
+        coordinator = DelugeDataCoordinator(hass, entry.data, client)
+        # Every speed change (switch, set_speed, schedule) goes through one pipeline
+        pipeline = SpeedPipeline(client, coordinator)
+        # Keyed by entry so several daemons each keep their own client and coordinator
+        hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
+            "entry": entry,
+            "config": entry.data,
+            "client": client,
+            "coordinator": coordinator,
+            "pipeline": pipeline,
+            "schedule": SpeedSchedule(hass, entry, pipeline, coordinator),
+            "policy": PolicyEngine(hass, entry, client, coordinator),
+            "controller": AdaptiveController(hass, entry, pipeline, coordinator),
+            "events": DelugeEventStream(hass, client, coordinator),
+            # Separate, cookie-less pool for third-party .torrent URLs
+            "fetcher": TorrentFileFetcher(),
+        }
+        hass.data.setdefault(DATA_FLEET, DelugeFleet()).async_add_coordinator(
+            entry.entry_id, coordinator
+        )
+        # Entities register their torrent keys only once added, after the bootstrap;
+        # hold the platforms' keys meanwhile so torrents are listed once, with them
+        release_platform_keys = coordinator.async_register_keys(
+            (*SWITCH_TORRENT_KEYS, *SENSOR_TORRENT_KEYS)
+        )
+        hass.data[DOMAIN][entry.entry_id]["policy"].async_start()
+        # Fetch the bootstrap snapshot while the platforms load; they all await it
+        coordinator.start_bootstrap()
         await async_setup_services(hass)
-        
+
+        await _async_migrate_unique_ids(hass, entry)
+
         # Set up switch platform for HA 2025.x
         await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+        platforms_loaded = True
+        # Enabled entities now hold their own registrations
+        release_platform_keys()
+        # Reconcile with the rule active now once the bootstrap snapshot is in
+        hass.data[DOMAIN][entry.entry_id]["schedule"].async_start()
+        hass.data[DOMAIN][entry.entry_id]["controller"].async_start()
+        hass.data[DOMAIN][entry.entry_id]["events"].async_start()
         _LOGGER.info("Deluge Speed integration setup complete")
         return True
-        
+
     except Exception as err:
         _LOGGER.error("Error setting up Deluge Speed: %s", err)
+        # Leave nothing behind for the retry: no stale data, fleet entry or open session
+        if platforms_loaded:
+            await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+        await _async_release_entry(hass, entry.entry_id)
         return False
 
 async def async_unload_entry(hass: HomeAssistant, entry):
     """Unload a config entry."""
     try:
         _LOGGER.debug("Unloading Deluge Speed integration")
-        
+
         # Unload switch platform for HA 2025.x
         unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
-        
-        # Clean up stored data
-        if DOMAIN in hass.data:
-            del hass.data[DOMAIN]
-        
+
+        # Clean up stored data and close the pooled connection
+        await _async_release_entry(hass, entry.entry_id)
+
         _LOGGER.info("Deluge Speed integration unloaded")
         return unload_ok
-        
+
     except Exception as err:
         _LOGGER.error("Error unloading Deluge Speed: %s", err)
         return False
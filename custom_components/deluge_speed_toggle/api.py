@@ -0,0 +1,335 @@
+"""Persistent Deluge Web JSON-RPC client shared by the whole integration."""
+import logging
+import asyncio
+import json
+import time
+import aiohttp
+from homeassistant.exceptions import HomeAssistantError
+from .metrics import RpcMetrics
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 10  # seconds
+POOL_LIMIT = 4  # Keep-alive connections held open to the Web UI
+KEEPALIVE_TIMEOUT = 60  # seconds
+BULK_CHUNK_SIZE = 100  # Torrent ids per call when falling back to singular methods
+
+# Ways to send a write that needs a valid session, tried in this order when probing:
+# "pooled" reuses the keep-alive session and cookie; "fresh_session" logs in on a
+# throwaway session right before the call, for proxies/Web UIs that drop pooled cookies
+WRITE_STRATEGIES = ("pooled", "fresh_session")
+
+
+class DelugeApiError(HomeAssistantError):
+    """Error returned by (or while talking to) the Deluge Web UI."""
+
+
+class DelugeAuthError(DelugeApiError):
+    """Authentication against the Deluge Web UI failed."""
+
+
+def _error_message(error) -> str:
+    """Return a readable message from a JSON-RPC error payload."""
+    if isinstance(error, dict):
+        return str(error.get("message", error))
+    return str(error)
+
+
+def _is_unknown_method(err: Exception) -> bool:
+    """Return True if the daemon rejected a call because the method does not exist."""
+    return "unknown method" in str(err).lower()
+
+
+def _chunks(items: list, size: int):
+    """Yield successive ``size``-long slices of ``items``."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _is_auth_error(error) -> bool:
+    """Return True if a JSON-RPC error means the session cookie is not valid."""
+    return "not authenticated" in _error_message(error).lower()
+
+
+class DelugeClient:
+    """Long-lived Deluge Web JSON-RPC client for one config entry.
+
+    Owns a keep-alive connection pool and the ``_session_id`` auth cookie.
+    ``auth.login`` only runs on first use and when the Web UI reports
+    "Not authenticated"; every other call reuses the pooled session.
+    """
+
+    def __init__(self, host: str, port: int, password: str):
+        """Initialize the client."""
+        self.host = host
+        self.port = port
+        self._password = password
+        self._url = f"http://{host}:{port}/json"
+        self._session: aiohttp.ClientSession | None = None
+        self._authenticated = False
+        self._auth_lock = asyncio.Lock()
+        self._login_generation = 0
+        self._request_id = 0
+        self._unsupported_methods = set()
+        self._write_strategy = None  # Probed on the first write, see async_write
+        self.write_probes = 0
+        self.write_strategy_runs = dict.fromkeys(WRITE_STRATEGIES, 0)
+        self.metrics = RpcMetrics()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the pooled session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=POOL_LIMIT,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                # unsafe=True so cookies are kept for bare IP hosts
+                cookie_jar=aiohttp.CookieJar(unsafe=True),
+                timeout=aiohttp.ClientTimeout(total=DEFAULT_TIMEOUT),
+                headers={"User-Agent": "HomeAssistant-DelugeSpeedToggle/1.0"},
+            )
+            self._authenticated = False
+        return self._session
+
+    async def _post(
+        self,
+        method: str,
+        params: list,
+        timeout: float | None = None,
+        session: aiohttp.ClientSession | None = None,
+    ) -> dict:
+        """Send one JSON-RPC request and return the decoded response body.
+
+        Uses the pooled session unless another ``session`` is given.
+        Latency, response size and errors are recorded in ``metrics``.
+        """
+        session = session or self._get_session()
+        self._request_id += 1
+        kwargs = {}
+        if timeout is not None:
+            kwargs["timeout"] = aiohttp.ClientTimeout(total=timeout)
+
+        start = time.perf_counter()
+        try:
+            async with session.post(
+                self._url,
+                json={"method": method, "params": params, "id": self._request_id},
+                **kwargs,
+            ) as resp:
+                if resp.status != 200:
+                    self.metrics.record_error(method)
+                    raise DelugeApiError(f"{method} failed: HTTP {resp.status}")
+                body = await resp.read()
+        except asyncio.TimeoutError as err:
+            self.metrics.record_error(method)
+            raise DelugeApiError(f"Deluge connection timeout ({method})") from err
+        except aiohttp.ClientError as err:
+            self.metrics.record_error(method)
+            raise DelugeApiError(f"Deluge connection error: {err}") from err
+        self.metrics.record_call(method, time.perf_counter() - start, len(body))
+
+        try:
+            result = json.loads(body)
+        except ValueError as err:
+            self.metrics.record_error(method)
+            raise DelugeApiError(f"Invalid response from Deluge for {method}: {err}") from err
+        if not isinstance(result, dict):
+            self.metrics.record_error(method)
+            raise DelugeApiError(f"Invalid response from Deluge for {method}: {result}")
+        if result.get("error"):
+            self.metrics.record_error(method)
+        return result
+
+    async def async_login(self) -> None:
+        """Authenticate the pooled session with the Web UI password."""
+        result = await self._post("auth.login", [self._password])
+        if not result.get("result"):
+            self._authenticated = False
+            raise DelugeAuthError("Deluge authentication failed: Invalid password or connection")
+        self._authenticated = True
+        self._login_generation += 1
+        _LOGGER.debug("Authenticated with Deluge at %s:%s", self.host, self.port)
+
+    async def _ensure_login(self, stale_generation: int | None = None) -> None:
+        """Log in once, serialising concurrent callers on the same session.
+
+        ``stale_generation`` is the login generation a caller saw rejected;
+        if another caller already re-authenticated since then, nothing is sent.
+        """
+        async with self._auth_lock:
+            if not self._authenticated or stale_generation == self._login_generation:
+                await self.async_login()
+
+    async def async_call(self, method: str, *params, timeout: float | None = None):
+        """Call a Deluge JSON-RPC method and return its ``result``.
+
+        Re-authenticates once if the Web UI says the session is not
+        authenticated (cookie expired, Web UI restarted, ...).
+        """
+        await self._ensure_login()
+        generation = self._login_generation
+        result = await self._post(method, list(params), timeout)
+
+        if result.get("error") and _is_auth_error(result["error"]):
+            _LOGGER.debug("Deluge session expired, re-authenticating for %s", method)
+            self.metrics.record_reauth(method)
+            await self._ensure_login(stale_generation=generation)
+            result = await self._post(method, list(params), timeout)
+
+        if result.get("error"):
+            raise DelugeApiError(f"Deluge error: {_error_message(result['error'])}")
+        return result.get("result")
+
+    async def _call_fresh_session(self, method: str, params: list, timeout: float | None):
+        """Log in on a throwaway session and run one call on it."""
+        async with aiohttp.ClientSession(
+            cookie_jar=aiohttp.CookieJar(unsafe=True),
+            timeout=aiohttp.ClientTimeout(total=DEFAULT_TIMEOUT),
+        ) as session:
+            login = await self._post("auth.login", [self._password], session=session)
+            if not login.get("result"):
+                raise DelugeAuthError("Deluge authentication failed: Invalid password or connection")
+            result = await self._post(method, params, timeout, session=session)
+        if result.get("error"):
+            raise DelugeApiError(f"Deluge error: {_error_message(result['error'])}")
+        return result.get("result")
+
+    async def _write_with(self, strategy: str, method: str, params: list, timeout: float | None):
+        """Run one call with the given write strategy."""
+        self.write_strategy_runs[strategy] += 1
+        if strategy == "fresh_session":
+            return await self._call_fresh_session(method, params, timeout)
+        return await self.async_call(method, *params, timeout=timeout)
+
+    async def async_write(self, method: str, *params, timeout: float | None = None):
+        """Call a state-changing method with the write strategy that works here.
+
+        The first write probes ``WRITE_STRATEGIES`` in order and remembers
+        the first one the Web UI accepts; later writes go straight to it.
+        Only when the remembered strategy is rejected as "not authenticated"
+        are the other strategies probed again.
+        """
+        failed = None
+        if self._write_strategy is not None:
+            try:
+                return await self._write_with(self._write_strategy, method, list(params), timeout)
+            except DelugeAuthError:
+                raise
+            except DelugeApiError as err:
+                if not _is_auth_error(err):
+                    raise
+                _LOGGER.debug("Write strategy %s rejected, re-probing: %s", self._write_strategy, err)
+                failed = self._write_strategy
+                self._write_strategy = None
+
+        self.write_probes += 1
+        last_error = None
+        for strategy in WRITE_STRATEGIES:
+            if strategy == failed:
+                continue
+            try:
+                result = await self._write_with(strategy, method, list(params), timeout)
+            except DelugeAuthError:
+                raise  # Wrong password: no strategy will help
+            except DelugeApiError as err:
+                if not _is_auth_error(err):
+                    raise
+                _LOGGER.debug("Write strategy %s not accepted: %s", strategy, err)
+                last_error = err
+                continue
+            if strategy != WRITE_STRATEGIES[0]:
+                _LOGGER.info("Deluge at %s:%s needs the %s write strategy", self.host, self.port, strategy)
+            self._write_strategy = strategy
+            return result
+        raise last_error
+
+    @property
+    def login_generation(self) -> int:
+        """Return how many times the pooled session has logged in."""
+        return self._login_generation
+
+    @property
+    def write_strategy(self) -> str | None:
+        """Return the cached write strategy, or None until probed."""
+        return self._write_strategy
+
+    async def async_set_config(self, config: dict, timeout: float | None = None) -> None:
+        """Write daemon config values (``core.set_config``)."""
+        await self.async_write("core.set_config", config, timeout=timeout)
+
+    async def _async_bulk(self, plural: str, singular: str, torrent_ids: list, *extra):
+        """Run a torrent action on many hashes in as few calls as possible.
+
+        Uses the Deluge 2 plural method (one call for every hash) and falls
+        back to the singular method, chunked and pipelined, on daemons that
+        do not have it. Returns the plural method's result; the singular
+        ``core.remove_torrent`` fallback returns ``[torrent_id, error]``
+        pairs for the torrents it could not remove, like Deluge 2 does.
+        """
+        if not torrent_ids:
+            return
+        if plural not in self._unsupported_methods:
+            try:
+                return await self.async_call(plural, torrent_ids, *extra, timeout=30)
+            except DelugeApiError as err:
+                if not _is_unknown_method(err):
+                    raise
+                _LOGGER.debug("%s not supported, falling back to %s", plural, singular)
+                self._unsupported_methods.add(plural)
+
+        if singular == "core.remove_torrent":
+            # Deluge 1.3 only removes one torrent per call; one failure must not hide the rest
+            errors = []
+            for chunk in _chunks(torrent_ids, BULK_CHUNK_SIZE):
+                results = await asyncio.gather(
+                    *(self.async_call(singular, torrent_id, *extra) for torrent_id in chunk),
+                    return_exceptions=True,
+                )
+                for torrent_id, result in zip(chunk, results):
+                    if isinstance(result, DelugeAuthError):
+                        raise result
+                    if isinstance(result, DelugeApiError):
+                        errors.append([torrent_id, str(result)])
+                    elif isinstance(result, BaseException):
+                        raise result
+                    elif result is False:
+                        errors.append([torrent_id, "Deluge did not remove the torrent"])
+            return errors
+        await asyncio.gather(
+            *(self.async_call(singular, chunk, *extra) for chunk in _chunks(torrent_ids, BULK_CHUNK_SIZE))
+        )
+
+    async def async_pause_torrents(self, torrent_ids: list) -> None:
+        """Pause every torrent in ``torrent_ids``."""
+        await self._async_bulk("core.pause_torrents", "core.pause_torrent", torrent_ids)
+
+    async def async_resume_torrents(self, torrent_ids: list) -> None:
+        """Resume every torrent in ``torrent_ids``."""
+        await self._async_bulk("core.resume_torrents", "core.resume_torrent", torrent_ids)
+
+    async def async_remove_torrents(self, torrent_ids: list, remove_data: bool = False) -> dict:
+        """Remove every torrent in ``torrent_ids``, optionally with its data.
+
+        Returns {torrent_id: error} for the torrents Deluge could not remove.
+        """
+        errors = await self._async_bulk("core.remove_torrents", "core.remove_torrent", torrent_ids, remove_data)
+        return {torrent_id: str(error) for torrent_id, error in errors or ()}
+
+    async def async_set_torrent_options(self, torrent_ids: list, options: dict) -> None:
+        """Set the same per-torrent options on every torrent in ``torrent_ids``."""
+        await asyncio.gather(
+            *(
+                self.async_call("core.set_torrent_options", chunk, options, timeout=30)
+                for chunk in _chunks(torrent_ids, BULK_CHUNK_SIZE)
+            )
+        )
+
+    async def async_close(self) -> None:
+        """Close the connection pool."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._authenticated = False
+        self._write_strategy = None
@@ -11,10 +11,18 @@ from .const import (
     CONF_PRESET1_UPLOAD,
     CONF_PRESET2_DOWNLOAD,
     CONF_PRESET2_UPLOAD,
+    CONF_PRESET1_NAME,
+    CONF_PRESET2_NAME,
+    DEFAULT_PRESET1_NAME,
+    DEFAULT_PRESET2_NAME,
     DEFAULT_PRESET1_DOWNLOAD,
     DEFAULT_PRESET1_UPLOAD,
     DEFAULT_PRESET2_DOWNLOAD,
     DEFAULT_PRESET2_UPLOAD,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_MAX_SCAN_INTERVAL,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -63,12 +71,19 @@ class DelugeSpeedConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         errors = {}
 
         if user_input is not None:
+            # One entry per daemon; several daemons are set up as separate entries
+            await self.async_set_unique_id(f"{user_input[CONF_HOST]}_{user_input[CONF_PORT]}")
+            self._abort_if_unique_id_configured()
+
             # Validate connection
             if not await validate_deluge_connection(self.hass, user_input):
                 errors["base"] = "cannot_connect"
             else:
                 _LOGGER.info("Creating new Deluge Speed config entry")
-                return self.async_create_entry(title="Deluge Speed", data=user_input)
+                return self.async_create_entry(
+                    title=f"Deluge Speed ({user_input[CONF_HOST]}:{user_input[CONF_PORT]})",
+                    data=user_input,
+                )
 
         return self.async_show_form(
             step_id="user",
@@ -76,12 +91,14 @@ class DelugeSpeedConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 vol.Required(CONF_HOST, default="localhost"): str,
                 vol.Required(CONF_PORT, default=8112): int,
                 vol.Required(CONF_PASSWORD): str,
-                vol.Optional("preset_1_name", default="Limited"): str,
+                vol.Optional(CONF_PRESET1_NAME, default=DEFAULT_PRESET1_NAME): str,
                 vol.Required(CONF_PRESET1_DOWNLOAD, default=DEFAULT_PRESET1_DOWNLOAD): int,
                 vol.Required(CONF_PRESET1_UPLOAD, default=DEFAULT_PRESET1_UPLOAD): int,
-                vol.Optional("preset_2_name", default="Unlimited"): str,
+                vol.Optional(CONF_PRESET2_NAME, default=DEFAULT_PRESET2_NAME): str,
                 vol.Required(CONF_PRESET2_DOWNLOAD, default=DEFAULT_PRESET2_DOWNLOAD): int,
                 vol.Required(CONF_PRESET2_UPLOAD, default=DEFAULT_PRESET2_UPLOAD): int,
+                vol.Optional(CONF_MIN_SCAN_INTERVAL, default=DEFAULT_MIN_SCAN_INTERVAL): vol.All(int, vol.Range(min=1)),
+                vol.Optional(CONF_MAX_SCAN_INTERVAL, default=DEFAULT_MAX_SCAN_INTERVAL): vol.All(int, vol.Range(min=1)),
             }),
             errors=errors,
             description_placeholders={
@@ -1,4 +1,6 @@
 DOMAIN = "deluge_speed_toggle"
+# hass.data key of the aggregate over every configured daemon
+DATA_FLEET = f"{DOMAIN}_fleet"
 CONF_HOST = "host"
 CONF_PORT = "port"
 CONF_PASSWORD = "password"
@@ -16,3 +18,27 @@ DEFAULT_PRESET1_DOWNLOAD = 500
 DEFAULT_PRESET1_UPLOAD = 100
 DEFAULT_PRESET2_DOWNLOAD = -1  # Unlimited
 DEFAULT_PRESET2_UPLOAD = -1    # Unlimited
+
+# Adaptive polling bounds (in seconds)
+CONF_MIN_SCAN_INTERVAL = "min_scan_interval"
+CONF_MAX_SCAN_INTERVAL = "max_scan_interval"
+DEFAULT_MIN_SCAN_INTERVAL = 5
+DEFAULT_MAX_SCAN_INTERVAL = 300
+
+# Preset names from the config flow, used as the default profile names
+CONF_PRESET1_NAME = "preset_1_name"
+CONF_PRESET2_NAME = "preset_2_name"
+DEFAULT_PRESET1_NAME = "Limited"
+DEFAULT_PRESET2_NAME = "Unlimited"
+
+# Named profiles (entry.options key); each is applied in one core.set_config
+CONF_PROFILES = "profiles"
+# Profile field -> Deluge config key it sets
+PROFILE_SETTINGS = {
+    "download": "max_download_speed",  # KiB/s, -1 unlimited
+    "upload": "max_upload_speed",      # KiB/s, -1 unlimited
+    "max_connections": "max_connections_global",
+    "max_active_downloading": "max_active_downloading",
+    "max_active_seeding": "max_active_seeding",
+    "max_upload_slots": "max_upload_slots_global",
+}
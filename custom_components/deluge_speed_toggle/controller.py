@@ -0,0 +1,239 @@
+"""Closed-loop speed limits keeping Deluge inside a household WAN budget."""
+import logging
+import time
+import voluptuous as vol
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN, UnitOfDataRate
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util.unit_conversion import DataRateConverter
+
+_LOGGER = logging.getLogger(__name__)
+
+CONF_CONTROLLER = "controller"  # entry.options key holding the controller settings
+
+SMOOTHING = 0.3  # EMA weight of the newest rate sample
+INTEGRAL_GAIN = 0.2  # Trim per second, as a fraction of the error
+MIN_LIMIT = 8  # KiB/s; never throttle below this so peers and trackers keep working
+DEFAULT_MIN_STEP = 16  # KiB/s a new limit must differ by before it is written
+DEFAULT_MIN_WRITE_INTERVAL = 30  # seconds between two writes
+
+# Direction -> (coordinator rate key, Deluge config key)
+DIRECTIONS = {
+    "download": ("download_rate", "max_download_speed"),
+    "upload": ("upload_rate", "max_upload_speed"),
+}
+
+CONTROLLER_SCHEMA = vol.Schema({
+    # Household budget in KiB/s per direction and the WAN throughput sensor measuring it;
+    # a direction is controlled only with both (Deluge's own rate alone gives a fixed limit)
+    vol.Inclusive("download_budget", "download"): vol.All(vol.Coerce(int), vol.Range(min=MIN_LIMIT)),
+    vol.Inclusive("wan_download_sensor", "download"): cv.entity_id,
+    vol.Inclusive("upload_budget", "upload"): vol.All(vol.Coerce(int), vol.Range(min=MIN_LIMIT)),
+    vol.Inclusive("wan_upload_sensor", "upload"): cv.entity_id,
+    # KiB/s kept free below the budget for other devices
+    vol.Optional("headroom", default=0): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    vol.Optional("min_step", default=DEFAULT_MIN_STEP): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    vol.Optional("min_write_interval", default=DEFAULT_MIN_WRITE_INTERVAL): vol.All(
+        vol.Coerce(int), vol.Range(min=1)
+    ),
+})
+
+
+class RateLoop:
+    """Control loop for one direction, in KiB/s.
+
+    The limit is the budget minus the smoothed traffic of other devices
+    (feedforward), plus an integral trim on the error between the budget
+    and the smoothed total. The trim is frozen while Deluge uses less than
+    its limit or pinned at a bound, so it cannot wind up.
+    """
+
+    __slots__ = ("setpoint", "total", "other", "trim", "limit")
+
+    def __init__(self, setpoint: float):
+        """Initialize the loop for a total-traffic setpoint."""
+        self.setpoint = setpoint
+        self.total = None  # Smoothed total traffic
+        self.other = None  # Smoothed traffic not from Deluge
+        self.trim = 0.0
+        self.limit = None  # Last limit computed
+
+    def update(self, total: float, deluge: float, dt: float) -> float:
+        """Feed one sample and return the new limit."""
+        other = max(total - deluge, 0.0)
+        if self.total is None:
+            self.total, self.other = total, other
+        else:
+            self.total += SMOOTHING * (total - self.total)
+            self.other += SMOOTHING * (other - self.other)
+
+        error = self.setpoint - self.total
+        saturated = self.limit is not None and deluge >= 0.9 * self.limit
+        # Only integrate away from a clamp the limit already sits on
+        clamped = self.limit is not None and (
+            (self.limit >= self.setpoint and error > 0) or (self.limit <= MIN_LIMIT and error < 0)
+        )
+        if saturated and not clamped:
+            self.trim += INTEGRAL_GAIN * error * dt
+            self.trim = max(min(self.trim, self.setpoint), -self.setpoint)
+
+        limit = self.setpoint - self.other + self.trim
+        self.limit = max(MIN_LIMIT, min(limit, self.setpoint))
+        return self.limit
+
+
+class AdaptiveController:
+    """Adjust the global limits of one daemon after every coordinator refresh.
+
+    Each configured direction runs a ``RateLoop`` on a WAN sensor (budget
+    minus headroom, shared with other devices); without that external
+    signal the loop would only ever pin the budget, so such directions are
+    left alone. New limits go through the speed pipeline, only when
+    they moved by at least ``min_step`` and at most once per
+    ``min_write_interval``.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry, pipeline, coordinator, clock=time.monotonic):
+        """Initialize the controller from the entry options."""
+        self.hass = hass
+        self.entry = entry
+        self.pipeline = pipeline
+        self.coordinator = coordinator
+        self._clock = clock
+        self.settings = {}
+        self._loops = {}  # direction -> RateLoop
+        self._unsub_listener = None
+        self._last_sample = None
+        self._last_write = None
+        self._written = {}  # Deluge config key -> last limit written
+        self._task = None
+        self.writes = 0
+        self._load(entry.options.get(CONF_CONTROLLER) or {})
+
+    def _load(self, settings: dict) -> None:
+        """Build one loop per direction with a budget."""
+        self.settings = settings
+        headroom = settings.get("headroom", 0)
+        self._loops = {}
+        for direction in DIRECTIONS:
+            budget = settings.get(f"{direction}_budget")
+            if budget is None:
+                continue
+            if not settings.get(f"wan_{direction}_sensor"):
+                # Options stored before a WAN sensor was required
+                _LOGGER.warning("Adaptive controller ignores the %s budget: no WAN sensor set", direction)
+                continue
+            self._loops[direction] = RateLoop(max(budget - headroom, MIN_LIMIT))
+        self._last_sample = None
+        self._written = {}
+
+    @property
+    def enabled(self) -> bool:
+        """Return True if at least one direction is controlled."""
+        return bool(self._loops)
+
+    @callback
+    def async_start(self) -> None:
+        """Follow the coordinator while a budget is set."""
+        if self.enabled and self._unsub_listener is None:
+            self._unsub_listener = self.coordinator.async_add_listener(self._handle_coordinator_update)
+            self.coordinator.rates_followed = True
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop following the coordinator."""
+        if self._unsub_listener is not None:
+            self._unsub_listener()
+            self._unsub_listener = None
+            self.coordinator.rates_followed = False
+
+    async def async_set(self, settings: dict) -> None:
+        """Replace the settings and persist them; no budget turns the controller off."""
+        self.async_stop()
+        self._load(settings)
+        self.hass.config_entries.async_update_entry(
+            self.entry, options={**self.entry.options, CONF_CONTROLLER: settings}
+        )
+        self.async_start()
+
+    def _wan_rate(self, direction: str) -> float | None:
+        """Return the WAN sensor reading in KiB/s, or None if it has no usable value."""
+        state = self.hass.states.get(self.settings[f"wan_{direction}_sensor"])
+        if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            return None
+        try:
+            value = float(state.state)
+        except ValueError:
+            return None
+        unit = state.attributes.get("unit_of_measurement", UnitOfDataRate.KIBIBYTES_PER_SECOND)
+        try:
+            return DataRateConverter.convert(value, unit, UnitOfDataRate.KIBIBYTES_PER_SECOND)
+        except Exception:
+            _LOGGER.warning("Unsupported unit %s on %s", unit, state.entity_id)
+            return None
+
+    def limits(self) -> dict:
+        """Return the limits computed by every loop, in KiB/s."""
+        return {
+            direction: round(loop.limit) for direction, loop in self._loops.items() if loop.limit is not None
+        }
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Step every loop on a fresh sample and write if the limits moved enough."""
+        data = self.coordinator.data
+        if not data or not self.coordinator.last_update_success:
+            return
+        now = self._clock()
+        dt = now - self._last_sample if self._last_sample is not None else 0.0
+        self._last_sample = now
+
+        wanted = {}
+        for direction, loop in self._loops.items():
+            rate_key, config_key = DIRECTIONS[direction]
+            deluge = data[rate_key] / 1024
+            total = self._wan_rate(direction)
+            if total is None:
+                continue  # Hold the current limit until the sensor recovers
+            limit = round(loop.update(total, deluge, dt))
+            previous = self._written.get(config_key)
+            if previous is None or abs(limit - previous) >= self.settings.get("min_step", DEFAULT_MIN_STEP):
+                wanted[config_key] = limit
+
+        if not wanted:
+            return
+        interval = self.settings.get("min_write_interval", DEFAULT_MIN_WRITE_INTERVAL)
+        if self._last_write is not None and now - self._last_write < interval:
+            return
+        if self._task is not None and not self._task.done():
+            return
+        self._last_write = now
+        self._task = self.hass.async_create_task(self._async_write(wanted))
+
+    async def _async_write(self, wanted: dict) -> None:
+        """Send new limits through the pipeline."""
+        try:
+            await self.pipeline.async_set_config(wanted)
+        except Exception as err:
+            _LOGGER.error("Adaptive controller could not set limits %s: %s", wanted, err)
+            return
+        self._written.update(wanted)
+        self.writes += 1
+        _LOGGER.debug("Adaptive controller set %s", wanted)
+
+    def diagnostics(self) -> dict:
+        """Return loop state from memory."""
+        return {
+            "enabled": self.enabled,
+            "writes": self.writes,
+            "limits": self.limits(),
+            "loops": {
+                direction: {
+                    "setpoint": loop.setpoint,
+                    "smoothed_total": loop.total,
+                    "smoothed_other": loop.other,
+                    "trim": round(loop.trim, 2),
+                }
+                for direction, loop in self._loops.items()
+            },
+        }
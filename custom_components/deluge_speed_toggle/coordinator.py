@@ -0,0 +1,585 @@
+"""Data coordinator polling the Deluge Web UI."""
+import logging
+import asyncio
+import sys
+import time
+from collections import Counter
+from datetime import timedelta
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from .api import DelugeApiError, DelugeAuthError, _is_unknown_method
+from .metrics import track_calls
+from .models import TorrentRecord
+from .history import RateHistory
+from .const import (
+    DOMAIN,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_MAX_SCAN_INTERVAL,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+SCAN_INTERVAL = timedelta(seconds=30)  # Baseline while seeding without downloads
+BOOST_DURATION = 60  # seconds of fast polling after a preset change
+# Poll interval while idle and the event stream pushes state changes; polls then only reconcile
+RECONCILE_INTERVAL = timedelta(minutes=5)
+
+SESSION_KEYS = ["download_rate", "upload_rate", "num_peers", "dht_nodes"]
+TORRENT_KEYS = ["name", "state", "progress", "download_payload_rate", "upload_payload_rate", "eta", "ratio", "label", "time_added", "total_size", "total_done", "queue", "tracker_host", "max_download_speed", "max_upload_speed", "max_connections", "max_upload_slots", "prioritize_first_last"]
+CONFIG_KEYS = ["max_download_speed", "max_upload_speed"]
+
+# Tiered sync: active torrents every cycle (volatile keys only), dormant ones
+# only on a full sync, which runs at this slow cadence or when the state
+# counts from the filter tree disagree with the index
+FULL_SYNC_INTERVAL = timedelta(minutes=60)
+# core.get_filter_tree categories not needed for state counts
+HIDDEN_FILTER_CATEGORIES = ["label", "tracker_host", "owner"]
+VOLATILE_KEYS = ["state", "progress", "download_payload_rate", "upload_payload_rate", "eta", "ratio", "total_done", "queue"]
+
+# Key projection: state-based counts need only this; consumers register the rest
+BASE_TORRENT_KEYS = ["state"]
+# Bulk service selector -> torrent key it filters on
+SELECTOR_KEYS = {"label": "label", "state": "state", "tracker": "tracker_host", "ratio_above": "ratio"}
+
+def _state_counts(filter_tree):
+    """Return {state: count} from a ``get_filter_tree`` reply, or None."""
+    if not isinstance(filter_tree, dict) or not filter_tree.get("state"):
+        return None
+    return {state: count for state, count in filter_tree["state"]}
+
+
+def _counts_differ(tree_counts: dict, index_counts: Counter) -> bool:
+    """Return True if the daemon's per-state counts disagree with the index."""
+    if tree_counts.get("All", sum(index_counts.values())) != sum(index_counts.values()):
+        return True
+    # "All" and "Active" are pseudo-states in the tree
+    return any(
+        tree_counts.get(state, 0) != index_counts.get(state, 0)
+        for state in set(tree_counts).union(index_counts) - {"All", "Active"}
+    )
+
+
+class DelugeDataCoordinator(DataUpdateCoordinator):
+    """Class to manage fetching data from Deluge API.
+
+    Keeps an in-memory torrent index keyed by hash, polled in two tiers.
+    The active tier (torrents moving data or in a transitional state) is
+    fetched every cycle with a state filter and only volatile keys, and
+    applied to the index in place. The dormant tier (finished, paused
+    seeds) is only re-listed on a full sync: on the first refresh, every
+    ``FULL_SYNC_INTERVAL``, or when the per-state counts from the daemon's
+    filter tree no longer match the index. Torrent counts come from the
+    filter tree whenever the daemon provides it.
+
+    The poll interval adapts after every refresh: it drops to the minimum
+    while torrents are downloading or just after a preset change, and
+    doubles up to the maximum while idle or while the daemon is unreachable.
+    """
+
+    def __init__(self, hass: HomeAssistant, config: dict, client):
+        """Initialize."""
+        self.host = config["host"]
+        self.port = config["port"]
+        self.client = client
+        # None = not probed yet; True/False once we know if web.update_ui works
+        self._use_update_ui = None
+        
+        # Delta sync state
+        self._torrents = {}  # torrent hash -> TorrentRecord, in daemon order
+        self._watched_ids = set()  # hashes polled every cycle
+        self._use_filter_tree = None  # None = not probed yet
+        self._refresh_full_sync = False  # Kind of the refresh in progress, for metrics
+        self._last_full_sync = None
+        
+        # Key projection: only keys some active consumer registered are fetched
+        self._key_consumers = []
+        self.torrent_keys = list(BASE_TORRENT_KEYS)
+        self._volatile_keys = [key for key in VOLATILE_KEYS if key in BASE_TORRENT_KEYS]
+        self._keys_version = 0  # Bumped when keys are added; a full sync read with older keys is not stamped
+        
+        # Adaptive polling state
+        self.min_interval = timedelta(
+            seconds=config.get(CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL)
+        )
+        self.max_interval = max(
+            timedelta(seconds=config.get(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL)),
+            self.min_interval,
+        )
+        self._boost_until = 0.0
+        
+        # Bumped on every successful refresh or pushed change; entities cache attributes per generation
+        self.generation = 0
+        
+        # Set by the event stream while it delivers daemon events
+        self.push_active = False
+        
+        # Set by the adaptive controller while it steers the limits from the rates
+        self.rates_followed = False
+        
+        # Session rate samples for rolling-window statistics
+        self.rate_history = RateHistory()
+        
+        # Entity attribute caches by unique_id, for diagnostics
+        self.attribute_caches = {}
+        
+        # First refresh, shared by every platform at entry setup
+        self._bootstrap = None
+        
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=DOMAIN,
+            update_interval=self._clamp_interval(SCAN_INTERVAL),
+        )
+
+    def start_bootstrap(self) -> None:
+        """Start the first refresh in the background if it has not run yet."""
+        if self._bootstrap is None:
+            self._bootstrap = self.hass.async_create_task(self.async_refresh())
+
+    async def async_shutdown(self) -> None:
+        """Cancel a bootstrap refresh still running, then stop polling."""
+        if self._bootstrap is not None and not self._bootstrap.done():
+            self._bootstrap.cancel()
+        await super().async_shutdown()
+
+    async def async_bootstrap(self) -> bool:
+        """Wait for the shared first refresh and return whether it succeeded.
+
+        The switch and the sensors all await this one snapshot at setup, so
+        the daemon sees a single login and config read per entry at boot.
+        """
+        self.start_bootstrap()
+        await asyncio.shield(self._bootstrap)
+        return self.last_update_success
+
+    def speed_limits(self):
+        """Return the daemon's (download, upload) limits in KiB/s, or None before the first refresh."""
+        if not self.data:
+            return None
+        return (self.data["max_download_speed"] / 1024, self.data["max_upload_speed"] / 1024)
+
+    def _clamp_interval(self, interval: timedelta) -> timedelta:
+        """Clamp an interval to the configured min/max bounds."""
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def _backoff_interval(self) -> timedelta:
+        """Return the next exponential backoff step from the current interval."""
+        return self._clamp_interval(max(self.update_interval, SCAN_INTERVAL) * 2)
+
+    def _next_interval(self, data: dict) -> timedelta:
+        """Pick the next poll interval from freshly fetched data."""
+        if data["downloading_torrents"] or time.monotonic() < self._boost_until:
+            return self.min_interval
+        if data["download_rate"] or data["upload_rate"] or data["active_torrents"] or self.rates_followed:
+            # Events carry state changes, not rates: keep sampling traffic
+            return self._clamp_interval(SCAN_INTERVAL)
+        if self.push_active:
+            # Fully idle and state changes arrive as events: only reconcile
+            return self._clamp_interval(RECONCILE_INTERVAL)
+        # Everything idle: back off exponentially
+        return self._backoff_interval()
+
+    async def async_boost(self) -> None:
+        """Poll at the minimum interval for a while, starting right away.
+
+        Called after a preset change so the sensors catch up quickly.
+        """
+        self._boost_until = time.monotonic() + BOOST_DURATION
+        self.update_interval = self.min_interval
+        await self.async_request_refresh()
+
+    @callback
+    def async_register_keys(self, keys) -> CALLBACK_TYPE:
+        """Add torrent status keys a consumer needs; return a callback removing them.
+
+        Entities register in ``async_added_to_hass``, so disabled entities
+        never widen the projection. New keys trigger a full sync right away.
+        """
+        keys = tuple(keys)
+        self._key_consumers.append(keys)
+        self._update_torrent_keys()
+
+        @callback
+        def remove_keys() -> None:
+            self._key_consumers.remove(keys)
+            self._update_torrent_keys()
+
+        return remove_keys
+
+    def _update_torrent_keys(self) -> None:
+        """Recompute the key projection from the registered consumers."""
+        wanted = set(BASE_TORRENT_KEYS)
+        for keys in self._key_consumers:
+            wanted.update(keys)
+        added = wanted.difference(self.torrent_keys)
+        self.torrent_keys = [key for key in TORRENT_KEYS if key in wanted]
+        self._volatile_keys = [key for key in VOLATILE_KEYS if key in wanted]
+        if added:
+            self._keys_version += 1
+            _LOGGER.debug("Torrent keys now %s", self.torrent_keys)
+            # Existing records lack the new keys: re-list everything
+            self.async_request_full_sync()
+            if self.data is not None:
+                self.hass.async_create_task(self.async_request_refresh())
+
+    async def async_select_torrents(self, torrent_ids=None, label=None, state=None, tracker=None, ratio_above=None) -> list:
+        """Return hashes from the index matching every given selector.
+
+        ``torrent_ids`` limits the search to those hashes. Hashes not in the
+        index yet (added since the last refresh) are passed through as long
+        as no other selector needs their details. Selectors on keys outside
+        the current projection are resolved with one extra status call.
+        """
+        selectors = {"label": label, "state": state, "tracker": tracker, "ratio_above": ratio_above}
+        needed = [SELECTOR_KEYS[name] for name, value in selectors.items() if value is not None]
+        filtered = bool(needed)
+        if not set(needed).issubset(self.torrent_keys):
+            filter_dict = {"id": list(torrent_ids)} if torrent_ids is not None else {}
+            torrents = await self.client.async_call("core.get_torrents_status", filter_dict, needed)
+            candidates = [TorrentRecord(torrent_id, info) for torrent_id, info in (torrents or {}).items()]
+        elif torrent_ids is not None:
+            candidates = [self._torrents.get(torrent_id) or torrent_id for torrent_id in torrent_ids]
+        else:
+            candidates = self._torrents.values()
+
+        selected = []
+        for record in candidates:
+            if isinstance(record, str):
+                if not filtered:
+                    selected.append(record)
+                continue
+            if label is not None and record.label != label:
+                continue
+            if state is not None and record.state != state:
+                continue
+            if tracker is not None and tracker not in record.tracker:
+                continue
+            if ratio_above is not None and not record.ratio > ratio_above:
+                continue
+            selected.append(record.id)
+        return selected
+
+    def apply_torrent_options(self, torrent_ids, values: dict) -> None:
+        """Write per-torrent option values just set on the daemon into the index records."""
+        for torrent_id in torrent_ids:
+            record = self._torrents.get(torrent_id)
+            if record is not None:
+                for slot, value in values.items():
+                    setattr(record, slot, value)
+
+    @callback
+    def async_set_push_active(self, active: bool) -> None:
+        """Record whether the event stream is delivering state changes."""
+        if active == self.push_active:
+            return
+        self.push_active = active
+        _LOGGER.debug("Deluge event stream %s", "up" if active else "down")
+        if not active and self.data is not None:
+            # Back to regular polling now rather than after a reconciliation interval
+            self.update_interval = self._clamp_interval(SCAN_INTERVAL)
+            self.hass.async_create_task(self.async_request_refresh())
+
+    @callback
+    def async_apply_events(self, events: list) -> None:
+        """Apply ``web.get_events`` results to the index and data right away.
+
+        Config changes (speed limits) are pushed to listeners at once. Torrent
+        events update the index in place and mark the torrent as watched, so
+        the refresh requested here fetches exactly those torrents.
+        """
+        if not self.data:
+            return
+        data = None
+        refresh = False
+        for event in events:
+            if not isinstance(event, (list, tuple)) or len(event) < 2:
+                continue
+            name, args = event[0], event[1] or []
+            if name == "ConfigValueChangedEvent" and len(args) == 2:
+                key, value = args
+                if key in CONFIG_KEYS:
+                    data = data or dict(self.data)
+                    data[key] = value * 1024  # KiB to bytes, as in refreshes
+            elif name == "TorrentRemovedEvent" and args:
+                self._torrents.pop(args[0], None)
+                self._watched_ids.discard(args[0])
+                refresh = True
+            elif name == "TorrentStateChangedEvent" and len(args) == 2:
+                record = self._torrents.get(args[0])
+                if record is not None:
+                    record.state = sys.intern(args[1])
+                self._watched_ids.add(args[0])
+                refresh = True
+            elif name in ("TorrentAddedEvent", "TorrentFinishedEvent") and args:
+                # Unknown hashes in the watched set are fetched with every key
+                self._watched_ids.add(args[0])
+                refresh = True
+            elif name in ("SessionPausedEvent", "SessionResumedEvent"):
+                refresh = True
+        if data is not None:
+            self.generation += 1
+            _LOGGER.debug("Deluge pushed limits %s/%s", data["max_download_speed"], data["max_upload_speed"])
+            self.async_set_updated_data(data)
+        if refresh:
+            self.hass.async_create_task(self.async_request_refresh())
+
+    def async_request_full_sync(self) -> None:
+        """Make the next refresh re-download every torrent with all keys."""
+        self._last_full_sync = None
+
+    def diagnostics(self) -> dict:
+        """Return polling and sync state from memory, without any RPC."""
+        now = time.monotonic()
+        return {
+            "update_interval_s": self.update_interval.total_seconds() if self.update_interval else None,
+            "min_interval_s": self.min_interval.total_seconds(),
+            "max_interval_s": self.max_interval.total_seconds(),
+            "boost_remaining_s": round(max(self._boost_until - now, 0), 1),
+            "last_update_success": self.last_update_success,
+            "generation": self.generation,
+            "torrents_indexed": len(self._torrents),
+            "torrents_watched": len(self._watched_ids),
+            "seconds_since_full_sync": (
+                round(now - self._last_full_sync, 1) if self._last_full_sync is not None else None
+            ),
+            "torrent_keys": list(self.torrent_keys),
+            "uses_update_ui": self._use_update_ui,
+            "uses_filter_tree": self._use_filter_tree,
+        }
+
+    async def _async_update_data(self):
+        """Update data via library."""
+        metrics = self.client.metrics
+        start = time.perf_counter()
+        self._refresh_full_sync = False
+        # Only this refresh's own calls: event polls and writes run concurrently
+        with track_calls() as usage:
+            try:
+                data = await self._fetch_deluge_data()
+            except Exception as exception:
+                metrics.record_refresh(
+                    time.perf_counter() - start, self._refresh_full_sync, usage.calls, usage.bytes, False,
+                )
+                # Daemon unreachable: back off instead of hammering it
+                self.update_interval = self._backoff_interval()
+                raise UpdateFailed(f"Error communicating with Deluge: {exception}")
+        metrics.record_refresh(
+            time.perf_counter() - start, self._refresh_full_sync, usage.calls, usage.bytes, True,
+        )
+
+        self.generation += 1
+        self.rate_history.add(time.monotonic(), data["download_rate"], data["upload_rate"])
+        interval = self._next_interval(data)
+        if interval != self.update_interval:
+            _LOGGER.debug("Deluge poll interval now %s", interval)
+            self.update_interval = interval
+        return data
+
+    async def _async_filter_tree(self):
+        """Return ``core.get_filter_tree`` with state counts, or None if unsupported."""
+        if self._use_filter_tree is False:
+            return None
+        try:
+            tree = await self.client.async_call("core.get_filter_tree", False, HIDDEN_FILTER_CATEGORIES)
+        except DelugeApiError as err:
+            if not _is_unknown_method(err):
+                raise
+            _LOGGER.debug("core.get_filter_tree unavailable, counting from the index")
+            self._use_filter_tree = False
+            return None
+        self._use_filter_tree = True
+        return tree
+
+    async def _dispatch_reads(self, queries):
+        """Fetch session stats, torrent queries, speed limits and state counts in one batch.
+
+        ``queries`` is a list of ``(filter_dict, keys)`` pairs for
+        ``core.get_torrents_status``. Uses a single ``web.update_ui`` call
+        (which includes the filter tree) for the first query when the Web
+        UI supports it, and issues every other read concurrently. Returns
+        ``(stats, torrents, config, filter_tree)``.
+        """
+        extra = [
+            self.client.async_call("core.get_torrents_status", filter_dict, keys)
+            for filter_dict, keys in queries[1:]
+        ]
+
+        if self._use_update_ui is not False:
+            filter_dict, keys = queries[0]
+            try:
+                ui, *torrents = await asyncio.gather(
+                    self.client.async_call("web.update_ui", keys, filter_dict),
+                    *extra,
+                )
+            except DelugeAuthError:
+                raise
+            except DelugeApiError as err:
+                # Timeouts and HTTP errors at boot must not turn batching off for good
+                if self._use_update_ui or not _is_unknown_method(err):
+                    raise
+                _LOGGER.debug("web.update_ui unavailable, using concurrent reads: %s", err)
+                self._use_update_ui = False
+                extra = [
+                    self.client.async_call("core.get_torrents_status", filter_dict, keys)
+                    for filter_dict, keys in queries[1:]
+                ]
+            else:
+                self._use_update_ui = True
+                ui = ui if isinstance(ui, dict) else {}
+                if ui.get("connected") is False:
+                    # Web UI is up but has no daemon: torrents and limits would be placeholders
+                    raise DelugeApiError("Deluge Web UI is not connected to a daemon")
+                stats = ui.get("stats") or {}
+                # update_ui reports the configured limits as max_download/max_upload
+                config = {
+                    "max_download_speed": stats.get("max_download", -1),
+                    "max_upload_speed": stats.get("max_upload", -1),
+                }
+                return stats, [ui.get("torrents"), *torrents], config, ui.get("filters")
+
+        filter_dict, keys = queries[0]
+        stats, config, filter_tree, *torrents = await asyncio.gather(
+            self.client.async_call("core.get_session_status", SESSION_KEYS),
+            self.client.async_call("core.get_config_values", CONFIG_KEYS),
+            self._async_filter_tree(),
+            self.client.async_call("core.get_torrents_status", filter_dict, keys),
+            *extra,
+        )
+        return stats, torrents, config, filter_tree
+
+    async def _sync_torrents(self):
+        """Refresh the torrent index and return (session stats, config, filter tree)."""
+        now = time.monotonic()
+        full_sync = (
+            self._last_full_sync is None
+            or now - self._last_full_sync >= FULL_SYNC_INTERVAL.total_seconds()
+        )
+
+        self._refresh_full_sync = full_sync
+        if full_sync:
+            keys_version = self._keys_version
+            # filter_dict (empty = all torrents) and every key
+            stats, (torrents,), config, filter_tree = await self._dispatch_reads([({}, self.torrent_keys)])
+            torrents = torrents if isinstance(torrents, dict) else {}
+            self._torrents = {
+                record.id: record
+                for record in (
+                    TorrentRecord(torrent_id, info)
+                    for torrent_id, info in torrents.items()
+                )
+            }
+            self._watched_ids = {
+                torrent_id for torrent_id, record in self._torrents.items()
+                if record.is_watched
+            }
+            if keys_version == self._keys_version:
+                self._last_full_sync = now
+            else:
+                # Keys registered while the read was in flight: those records lack them
+                _LOGGER.debug("Torrent keys changed during the full sync, repeating it")
+            _LOGGER.debug("Full torrent sync: %d torrents", len(self._torrents))
+            return stats, config, filter_tree
+
+        # Delta cycle: everything moving data, plus what we were already watching
+        queries = [({"state": "Active"}, self._volatile_keys)]
+        watched = list(self._watched_ids)
+        if watched:
+            queries.append(({"id": watched}, self._volatile_keys))
+        stats, results, config, filter_tree = await self._dispatch_reads(queries)
+
+        updates = {}
+        for result in results:
+            if isinstance(result, dict):
+                updates.update(result)
+
+        # Watched torrents missing from the id-filtered reply were removed
+        for torrent_id in self._watched_ids.difference(updates):
+            self._torrents.pop(torrent_id, None)
+
+        new_ids = []
+        watched_ids = set()
+        for torrent_id, info in updates.items():
+            record = self._torrents.get(torrent_id)
+            if record is None:
+                new_ids.append(torrent_id)
+                continue
+            record.apply_volatile(info)
+            if record.is_watched:
+                watched_ids.add(torrent_id)
+
+        if new_ids:
+            # Torrents added since the last full sync need their static keys
+            torrents = await self.client.async_call(
+                "core.get_torrents_status", {"id": new_ids}, self.torrent_keys
+            )
+            for torrent_id, info in (torrents or {}).items():
+                record = TorrentRecord(torrent_id, info)
+                self._torrents[record.id] = record
+                if record.is_watched:
+                    watched_ids.add(record.id)
+
+        self._watched_ids = watched_ids
+        _LOGGER.debug(
+            "Delta torrent sync: %d updated, %d new, %d watched",
+            len(updates), len(new_ids), len(watched_ids),
+        )
+        return stats, config, filter_tree
+
+    async def _fetch_deluge_data(self):
+        """Fetch data from Deluge daemon using same methods as working switch."""
+        # Pooled client keeps the auth cookie, so no login per refresh
+        stats, config, filter_tree = await self._sync_torrents()
+        
+        # Debug log the raw responses
+        _LOGGER.debug("Raw stats response: %s", stats)
+        _LOGGER.debug("Raw config response: %s", config)
+        
+        torrent_list = list(self._torrents.values())
+        index_counts = Counter(torrent.state for torrent in torrent_list)
+        counts = _state_counts(filter_tree)
+        if counts is None:
+            counts = index_counts
+            total_count = len(torrent_list)
+        else:
+            total_count = counts.get("All", len(torrent_list))
+            if _counts_differ(counts, index_counts):
+                # Dormant tier drifted (added, removed or paused outside HA)
+                _LOGGER.debug("Filter tree counts differ from the index, full sync next cycle")
+                self.async_request_full_sync()
+        
+        downloading_count = counts.get("Downloading", 0)
+        seeding_count = counts.get("Seeding", 0)
+        active_count = downloading_count + seeding_count
+        
+        session_stats = stats
+        config_values = config
+        
+        # Validate the results are dictionaries
+        if not isinstance(session_stats, dict):
+            session_stats = {}
+        if not isinstance(config_values, dict):
+            config_values = {}
+        
+        result_data = {
+            "download_rate": session_stats.get("download_rate", 0),  # bytes/sec
+            "upload_rate": session_stats.get("upload_rate", 0),      # bytes/sec
+            "max_download_speed": config_values.get("max_download_speed", -1) * 1024,  # Convert KiB to bytes
+            "max_upload_speed": config_values.get("max_upload_speed", -1) * 1024,      # Convert KiB to bytes
+            "total_torrents": total_count,
+            "active_torrents": active_count,
+            "downloading_torrents": downloading_count,
+            "seeding_torrents": seeding_count,
+            "torrents": torrent_list,
+            "status": "Connected"
+        }
+        
+        # Debug logging to see what we're actually getting
+        _LOGGER.debug("Deluge API Response - Session Stats: %s", session_stats)
+        _LOGGER.debug("Deluge API Response - Torrents Count: %d", len(torrent_list))
+        _LOGGER.debug("Deluge API Response - Download Rate: %s bytes/sec", result_data["download_rate"])
+        _LOGGER.debug("Deluge API Response - Upload Rate: %s bytes/sec", result_data["upload_rate"])
+        
+        return result_data
@@ -0,0 +1,66 @@
+"""Diagnostics download for Deluge Speed Toggle."""
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD
+from homeassistant.core import HomeAssistant
+from .const import DOMAIN
+
+TO_REDACT = {CONF_PASSWORD}
+
+
+def _hit_rate(hits: int, misses: int) -> dict:
+    """Return hit/miss counts with their ratio."""
+    total = hits + misses
+    return {"hits": hits, "misses": misses, "hit_rate": round(hits / total, 3) if total else None}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict:
+    """Return diagnostics for a config entry.
+
+    Everything comes from counters and ring buffers already kept in memory;
+    no RPC is sent to the daemon.
+    """
+    data = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    diagnostics = {"config": async_redact_data(dict(entry.data), TO_REDACT)}
+    if data is None:
+        return diagnostics
+
+    client = data["client"]
+    coordinator = data["coordinator"]
+    pipeline = data["pipeline"]
+    fetcher = data["fetcher"]
+    metrics = client.metrics
+
+    caches = coordinator.attribute_caches
+    diagnostics.update({
+        "coordinator": coordinator.diagnostics(),
+        "refreshes": [record.as_dict() for record in metrics.refreshes],
+        "rpc": metrics.snapshot(),
+        "set_speed": {
+            "write_strategy": client.write_strategy,
+            "write_probes": client.write_probes,
+            "strategy_runs": dict(client.write_strategy_runs),
+            "pipeline_writes": pipeline.writes,
+            "pipeline_skipped": pipeline.skipped,
+            "pipeline_coalesced": pipeline.coalesced,
+        },
+        "torrent_policies": {
+            "policies": len(data["policy"].as_list()),
+            "calls": data["policy"].calls,
+            "torrents_updated": data["policy"].torrents_updated,
+        },
+        "adaptive_controller": data["controller"].diagnostics(),
+        "event_stream": data["events"].diagnostics(),
+        "caches": {
+            "entity_attributes": _hit_rate(
+                sum(cache.hits for cache in caches.values()),
+                sum(cache.misses for cache in caches.values()),
+            ),
+            "entity_attributes_by_entity": {
+                unique_id: _hit_rate(cache.hits, cache.misses)
+                for unique_id, cache in caches.items()
+            },
+            "torrent_files": _hit_rate(fetcher.hits, fetcher.misses),
+        },
+    })
+    return diagnostics
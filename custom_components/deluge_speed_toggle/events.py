@@ -0,0 +1,115 @@
+"""Push updates from the Deluge Web UI event queue."""
+import asyncio
+import logging
+import time
+from homeassistant.core import HomeAssistant, callback
+from .api import DelugeApiError, DelugeAuthError, _is_unknown_method
+
+_LOGGER = logging.getLogger(__name__)
+
+# Daemon events applied to the coordinator as they arrive
+EVENTS = (
+    "TorrentAddedEvent",
+    "TorrentRemovedEvent",
+    "TorrentFinishedEvent",
+    "TorrentStateChangedEvent",
+    "ConfigValueChangedEvent",
+    "SessionPausedEvent",
+    "SessionResumedEvent",
+)
+# Deluge's Web UI holds an idle web.get_events for up to 300 s (3000 x 0.1 s), then answers None
+SERVER_HOLD = 300
+LONG_POLL_TIMEOUT = SERVER_HOLD + 30  # seconds a web.get_events call may stay open
+MIN_POLL_PERIOD = 1.0  # seconds between empty replies from Web UIs that do not hold the call
+MAX_RETRY_DELAY = 300  # seconds; retries back off exponentially up to this
+
+
+class DelugeEventStream:
+    """Long-poll ``web.get_events`` for one daemon and feed the coordinator.
+
+    Listeners are registered per Web UI session, so they are registered
+    again whenever the client logs in anew. While the stream is up the
+    coordinator knows state changes arrive as events and, once nothing is
+    moving, drops to a slow reconciliation poll; on errors the stream backs off and polling
+    carries on as before. Web UIs without the event API turn the stream
+    off for the lifetime of the entry.
+    """
+
+    def __init__(self, hass: HomeAssistant, client, coordinator):
+        """Initialize the stream."""
+        self.hass = hass
+        self.client = client
+        self.coordinator = coordinator
+        self._task = None
+        self._registered_generation = None  # Login generation the listeners belong to
+        self.supported = None  # None = not probed yet
+        self.events_received = 0
+        self.errors = 0
+
+    @callback
+    def async_start(self) -> None:
+        """Start the long-poll loop in the background."""
+        if self._task is None:
+            self._task = self.hass.async_create_background_task(
+                self._async_run(), f"deluge_events_{self.client.host}_{self.client.port}"
+            )
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel the loop on unload."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _async_register(self) -> None:
+        """Subscribe the current Web UI session to every event in ``EVENTS``."""
+        await asyncio.gather(
+            *(self.client.async_call("web.register_event_listener", event) for event in EVENTS)
+        )
+        self._registered_generation = self.client.login_generation
+        _LOGGER.debug("Registered Deluge event listeners on %s:%s", self.client.host, self.client.port)
+
+    async def _async_run(self) -> None:
+        """Register, then long-poll until cancelled or unsupported."""
+        await self.coordinator.async_bootstrap()
+        delay = 1
+        while True:
+            try:
+                if self._registered_generation != self.client.login_generation:
+                    await self._async_register()
+                start = time.monotonic()
+                events = await self.client.async_call("web.get_events", timeout=LONG_POLL_TIMEOUT)
+            except DelugeAuthError as err:
+                _LOGGER.debug("Deluge event stream cannot log in: %s", err)
+            except DelugeApiError as err:
+                if _is_unknown_method(err):
+                    _LOGGER.info("Deluge Web UI has no event API, staying on polling: %s", err)
+                    self.supported = False
+                    self.coordinator.async_set_push_active(False)
+                    return
+                _LOGGER.debug("Deluge event stream error, retrying in %s s: %s", delay, err)
+            else:
+                delay = 1
+                self.supported = True
+                self.coordinator.async_set_push_active(True)
+                if events:
+                    self.events_received += len(events)
+                    self.coordinator.async_apply_events(events)
+                # None or [] is an idle hold that expired: poll again, push stays up
+                elif time.monotonic() - start < MIN_POLL_PERIOD:
+                    await asyncio.sleep(MIN_POLL_PERIOD - (time.monotonic() - start))
+                continue
+
+            self.errors += 1
+            self.coordinator.async_set_push_active(False)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RETRY_DELAY)
+
+    def diagnostics(self) -> dict:
+        """Return stream state from memory."""
+        return {
+            "supported": self.supported,
+            "push_active": self.coordinator.push_active,
+            "events_received": self.events_received,
+            "errors": self.errors,
+        }
@@ -0,0 +1,144 @@
+"""Streaming, size-capped download of .torrent files for add_torrent."""
+import logging
+import asyncio
+import base64
+import time
+from collections import OrderedDict
+import aiohttp
+from homeassistant.exceptions import HomeAssistantError
+
+_LOGGER = logging.getLogger(__name__)
+
+MAX_TORRENT_BYTES = 10 * 1024 * 1024  # Refuse .torrent files above 10 MiB
+CHUNK_SIZE = 64 * 1024
+FETCH_TIMEOUT = 30  # seconds
+CACHE_BYTES = 32 * 1024 * 1024  # Encoded .torrent bodies kept by URL, in total
+CACHE_TTL = 600  # seconds an entry without ETag/Last-Modified stays fresh
+
+
+class TorrentFetchError(HomeAssistantError):
+    """Downloading a .torrent file failed."""
+
+
+class _CacheEntry:
+    """Encoded .torrent body plus the validators it was served with."""
+
+    __slots__ = ("data", "etag", "last_modified", "fetched")
+
+    def __init__(self, data: str, etag: str | None, last_modified: str | None):
+        self.data = data
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched = time.monotonic()
+
+
+class TorrentFileFetcher:
+    """Fetch third-party .torrent URLs as base64 for ``core.add_torrent_file``.
+
+    Uses its own pooled session without a cookie jar, so the Deluge auth
+    cookie never leaks to arbitrary hosts. Bodies are streamed with a hard
+    byte cap and base64-encoded chunk by chunk. Results are cached by URL
+    up to ``cache_bytes`` of encoded data, least recently used out first,
+    and revalidated with ETag/Last-Modified on repeated adds.
+    """
+
+    def __init__(self, max_bytes: int = MAX_TORRENT_BYTES, cache_bytes: int = CACHE_BYTES):
+        """Initialize the fetcher."""
+        self.max_bytes = max_bytes
+        self.cache_bytes = cache_bytes
+        self._session: aiohttp.ClientSession | None = None
+        self._cache = OrderedDict()  # url -> _CacheEntry, oldest first
+        self._cached_bytes = 0  # Sum of len(entry.data) over the cache
+        self.hits = 0
+        self.misses = 0
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the pooled session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                cookie_jar=aiohttp.DummyCookieJar(),
+                timeout=aiohttp.ClientTimeout(total=FETCH_TIMEOUT),
+            )
+        return self._session
+
+    async def async_fetch_b64(self, url: str) -> str:
+        """Return the base64-encoded body of the .torrent file at ``url``."""
+        entry = self._cache.get(url)
+        headers = {}
+        if entry is not None:
+            if not (entry.etag or entry.last_modified):
+                if time.monotonic() - entry.fetched < CACHE_TTL:
+                    return self._hit(url, entry)
+            else:
+                if entry.etag:
+                    headers["If-None-Match"] = entry.etag
+                if entry.last_modified:
+                    headers["If-Modified-Since"] = entry.last_modified
+
+        try:
+            async with self._get_session().get(url, headers=headers) as resp:
+                if resp.status == 304 and entry is not None:
+                    entry.fetched = time.monotonic()
+                    return self._hit(url, entry)
+                if resp.status != 200:
+                    raise TorrentFetchError(f"Torrent download failed: HTTP {resp.status}")
+                if resp.content_length is not None and resp.content_length > self.max_bytes:
+                    raise TorrentFetchError(
+                        f"Torrent file too large: {resp.content_length} bytes (limit {self.max_bytes})"
+                    )
+                data = await self._read_b64(resp)
+                etag = resp.headers.get("ETag")
+                last_modified = resp.headers.get("Last-Modified")
+        except asyncio.TimeoutError as err:
+            raise TorrentFetchError(f"Torrent download timeout: {url}") from err
+        except aiohttp.ClientError as err:
+            raise TorrentFetchError(f"Torrent download error: {err}") from err
+
+        self.misses += 1
+        self._store(url, _CacheEntry(data, etag, last_modified))
+        return data
+
+    def _store(self, url: str, entry: _CacheEntry) -> None:
+        """Cache ``entry`` as most recent, evicting the oldest bodies over the byte budget."""
+        old = self._cache.pop(url, None)
+        if old is not None:
+            self._cached_bytes -= len(old.data)
+        if len(entry.data) > self.cache_bytes:
+            return
+        self._cache[url] = entry
+        self._cached_bytes += len(entry.data)
+        while self._cached_bytes > self.cache_bytes:
+            _, evicted = self._cache.popitem(last=False)
+            self._cached_bytes -= len(evicted.data)
+
+    def _hit(self, url: str, entry: _CacheEntry) -> str:
+        """Record a cache hit and return the cached body."""
+        self.hits += 1
+        self._cache.move_to_end(url)
+        _LOGGER.debug("Using cached torrent file for %s", url)
+        return entry.data
+
+    async def _read_b64(self, resp: aiohttp.ClientResponse) -> str:
+        """Stream the body, enforcing the byte cap, and base64-encode it."""
+        parts = []
+        pending = b""
+        received = 0
+        async for chunk in resp.content.iter_chunked(CHUNK_SIZE):
+            received += len(chunk)
+            if received > self.max_bytes:
+                raise TorrentFetchError(f"Torrent file exceeds {self.max_bytes} bytes")
+            pending += chunk
+            # Encode whole 3-byte groups now, carry the rest to the next chunk
+            cut = len(pending) - len(pending) % 3
+            parts.append(base64.b64encode(pending[:cut]).decode())
+            pending = pending[cut:]
+        parts.append(base64.b64encode(pending).decode())
+        return "".join(parts)
+
+    async def async_close(self) -> None:
+        """Close the session and drop cached files."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._cache.clear()
+        self._cached_bytes = 0
@@ -0,0 +1,107 @@
+"""Aggregate view over every configured Deluge daemon."""
+import logging
+from homeassistant.core import CALLBACK_TYPE, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+# Coordinator data keys summed across daemons
+FLEET_KEYS = (
+    "download_rate",
+    "upload_rate",
+    "total_torrents",
+    "active_torrents",
+    "downloading_torrents",
+    "seeding_torrents",
+)
+
+
+class DelugeFleet:
+    """Totals across the coordinators of every loaded config entry.
+
+    Recomputed in one pass over the per-entry snapshots whenever any
+    coordinator updates; each pass only sums a few precomputed numbers
+    per daemon, so it keeps up with the fastest poll interval.
+    """
+
+    def __init__(self):
+        """Initialize an empty fleet."""
+        self._coordinators = {}  # entry_id -> coordinator
+        self._unsubscribe = {}  # entry_id -> coordinator listener remover
+        self._listeners = []
+        self._sensor_platforms = {}  # entry_id -> callback adding the fleet sensors to its sensor platform
+        self.owner = None  # entry_id whose sensor platform created the fleet sensors
+        self.data = dict.fromkeys(FLEET_KEYS, 0)
+        self.data["daemons"] = 0
+        self.data["daemons_connected"] = 0
+
+    def __len__(self) -> int:
+        """Return the number of daemons in the fleet."""
+        return len(self._coordinators)
+
+    @callback
+    def async_add_coordinator(self, entry_id: str, coordinator) -> None:
+        """Track the coordinator of a newly loaded entry."""
+        self._coordinators[entry_id] = coordinator
+        self._unsubscribe[entry_id] = coordinator.async_add_listener(self._async_recompute)
+        self._async_recompute()
+
+    @callback
+    def async_remove_coordinator(self, entry_id: str) -> None:
+        """Stop tracking an unloaded entry."""
+        self._coordinators.pop(entry_id, None)
+        self._sensor_platforms.pop(entry_id, None)
+        if entry_id == self.owner:
+            self.owner = None
+        unsubscribe = self._unsubscribe.pop(entry_id, None)
+        if unsubscribe is not None:
+            unsubscribe()
+        self._async_recompute()
+        # The owner's sensor platform took the fleet sensors with it: hand them on
+        self._async_assign_owner()
+
+    @callback
+    def async_add_sensor_platform(self, entry_id: str, add_fleet_sensors) -> None:
+        """Record the callback adding the fleet sensors to an entry's loaded sensor platform."""
+        self._sensor_platforms[entry_id] = add_fleet_sensors
+        self._async_assign_owner()
+
+    @callback
+    def _async_assign_owner(self) -> None:
+        """Let the oldest sensor platform create the fleet sensors once a second daemon is in."""
+        if self.owner is not None or len(self) < 2 or not self._sensor_platforms:
+            return
+        self.owner, add_fleet_sensors = next(iter(self._sensor_platforms.items()))
+        _LOGGER.debug("Entry %s now provides the fleet sensors", self.owner)
+        add_fleet_sensors()
+
+    @callback
+    def async_add_listener(self, update_callback) -> CALLBACK_TYPE:
+        """Call ``update_callback`` after every recompute; return a remover."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def _async_recompute(self) -> None:
+        """Sum every daemon's latest snapshot and notify listeners if totals changed."""
+        totals = dict.fromkeys(FLEET_KEYS, 0)
+        connected = 0
+        for coordinator in self._coordinators.values():
+            data = coordinator.data
+            if not data or not coordinator.last_update_success:
+                continue
+            connected += 1
+            for key in FLEET_KEYS:
+                totals[key] += data[key]
+        totals["daemons"] = len(self._coordinators)
+        totals["daemons_connected"] = connected
+
+        if totals == self.data:
+            return
+        self.data = totals
+        for update_callback in list(self._listeners):
+            update_callback()
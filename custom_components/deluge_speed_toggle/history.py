@@ -0,0 +1,155 @@
+"""Fixed-size transfer-rate history with rolling-window statistics."""
+import math
+from array import array
+from collections import deque
+
+HISTORY_CAPACITY = 4096  # Samples kept; 1 h even at a 1 s poll interval
+WINDOWS = {"5m": 300, "1h": 3600}  # Window name -> length in seconds
+BUCKETS_PER_OCTAVE = 8  # Percentile resolution: about 9 % of the value
+MAX_BUCKET = 48 * BUCKETS_PER_OCTAVE  # Rates up to 2**48 bytes/s
+MAX_SAMPLE_WEIGHT = 300.0  # seconds one sample may stand for (the slowest poll; longer gaps are outages)
+FIRST_SAMPLE_WEIGHT = 1.0  # seconds credited to a sample with no predecessor
+
+
+def _bucket(rate: float) -> int:
+    """Return the histogram bucket of a rate in bytes/s (0 for idle)."""
+    if rate < 1:
+        return 0
+    return min(int(math.log2(rate) * BUCKETS_PER_OCTAVE) + 1, MAX_BUCKET)
+
+
+def _bucket_value(bucket: int) -> float:
+    """Return the upper bound in bytes/s of a histogram bucket."""
+    if bucket == 0:
+        return 0.0
+    return 2 ** (bucket / BUCKETS_PER_OCTAVE)
+
+
+class _Series:
+    """Rolling time-weighted sum, max and histogram of one rate over one window."""
+
+    __slots__ = ("total", "maxima", "histogram")
+
+    def __init__(self):
+        self.total = 0.0  # Sum of value * weight
+        self.maxima = deque()  # (seq, value), values decreasing: front is the max
+        self.histogram = [0.0] * (MAX_BUCKET + 1)  # Seconds spent in each bucket
+
+    def push(self, seq: int, value: float, weight: float) -> None:
+        """Add the newest sample, standing for ``weight`` seconds."""
+        self.total += value * weight
+        self.histogram[_bucket(value)] += weight
+        maxima = self.maxima
+        while maxima and maxima[-1][1] <= value:
+            maxima.pop()
+        maxima.append((seq, value))
+
+    def evict(self, seq: int, value: float, weight: float) -> None:
+        """Remove the oldest sample."""
+        self.total -= value * weight
+        self.histogram[_bucket(value)] -= weight
+        if self.maxima and self.maxima[0][0] == seq:
+            self.maxima.popleft()
+
+    def percentile(self, duration: float, fraction: float) -> float:
+        """Return the rate exceeded during ``1 - fraction`` of ``duration`` seconds.
+
+        Buckets report their upper bound, so the result is clamped to the
+        window maximum it can never exceed.
+        """
+        wanted = fraction * duration * (1 - 1e-9)  # Tolerate float drift from evictions
+        seen = 0.0
+        for bucket, seconds in enumerate(self.histogram):
+            seen += seconds
+            if seen >= wanted:
+                return min(_bucket_value(bucket), self.maxima[0][1])
+        return self.maxima[0][1]
+
+
+class _Window:
+    """Running statistics over the samples of the last ``seconds``."""
+
+    __slots__ = ("seconds", "start", "duration", "download", "upload")
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.start = 0  # Sequence number of the oldest sample inside the window
+        self.duration = 0.0  # Sum of the weights of the samples inside the window
+        self.download = _Series()
+        self.upload = _Series()
+
+
+class RateHistory:
+    """Ring buffer of (timestamp, download, upload) samples for one daemon.
+
+    Samples live in preallocated ``array('d')`` columns. Each window keeps
+    a running sum, a monotonic max queue and a log-bucket histogram, so
+    adding a sample costs amortised O(1) and mean/max/p95 are read without
+    scanning the samples. The poll interval varies from seconds to
+    minutes, so mean and p95 weight every sample by the time since the
+    previous one rather than counting samples.
+    """
+
+    def __init__(self, capacity: int = HISTORY_CAPACITY, windows: dict = WINDOWS):
+        """Initialize an empty history."""
+        self.capacity = capacity
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._download = array("d", bytes(8 * capacity))
+        self._upload = array("d", bytes(8 * capacity))
+        self._weights = array("d", bytes(8 * capacity))
+        self._next = 0  # Sequence number of the next sample
+        self._windows = {name: _Window(seconds) for name, seconds in windows.items()}
+
+    def __len__(self) -> int:
+        """Return the number of samples held."""
+        return min(self._next, self.capacity)
+
+    def add(self, timestamp: float, download: float, upload: float) -> None:
+        """Append a sample and slide every window forward."""
+        seq = self._next
+        if seq:
+            previous = self._timestamps[(seq - 1) % self.capacity]
+            weight = min(max(timestamp - previous, 0.0), MAX_SAMPLE_WEIGHT)
+        else:
+            weight = FIRST_SAMPLE_WEIGHT
+        # The sample about to be overwritten must leave every window first
+        oldest_kept = seq + 1 - self.capacity
+        for window in self._windows.values():
+            cutoff = timestamp - window.seconds
+            while window.start < seq and (
+                window.start < oldest_kept
+                or self._timestamps[window.start % self.capacity] < cutoff
+            ):
+                old = window.start % self.capacity
+                window.download.evict(window.start, self._download[old], self._weights[old])
+                window.upload.evict(window.start, self._upload[old], self._weights[old])
+                window.duration -= self._weights[old]
+                window.start += 1
+
+        slot = seq % self.capacity
+        self._timestamps[slot] = timestamp
+        self._download[slot] = download
+        self._upload[slot] = upload
+        self._weights[slot] = weight
+        self._next = seq + 1
+        for window in self._windows.values():
+            window.download.push(seq, download, weight)
+            window.upload.push(seq, upload, weight)
+            window.duration += weight
+
+    def stats(self, name: str) -> dict | None:
+        """Return mean/max/p95 of download and upload over window ``name``."""
+        window = self._windows[name]
+        count = self._next - window.start
+        if count <= 0 or window.duration <= 0:
+            return None
+        duration = window.duration
+        return {
+            "samples": count,
+            "download_mean": window.download.total / duration,
+            "download_max": window.download.maxima[0][1],
+            "download_p95": window.download.percentile(duration, 0.95),
+            "upload_mean": window.upload.total / duration,
+            "upload_max": window.upload.maxima[0][1],
+            "upload_p95": window.upload.percentile(duration, 0.95),
+        }
@@ -0,0 +1,198 @@
+"""In-memory RPC and refresh metrics for one Deluge daemon."""
+import bisect
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Latency histogram bucket upper bounds in milliseconds; the last bucket is open-ended
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+REFRESH_HISTORY = 50  # Coordinator refreshes kept for timing breakdowns
+
+# Usage counter of the unit of work (a coordinator refresh) the running code belongs to
+_CURRENT_USAGE = ContextVar("deluge_rpc_usage", default=None)
+
+
+class MethodStats:
+    """Counters and latency histogram for one JSON-RPC method."""
+
+    __slots__ = (
+        "calls",
+        "errors",
+        "reauths",
+        "bytes",
+        "total_ms",
+        "max_ms",
+        "last_ms",
+        "last_bytes",
+        "buckets",
+    )
+
+    def __init__(self):
+        """Initialize empty counters."""
+        self.calls = 0
+        self.errors = 0
+        self.reauths = 0
+        self.bytes = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_ms = 0.0
+        self.last_bytes = 0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def observe(self, elapsed_ms: float, size: int) -> None:
+        """Record one round trip."""
+        self.calls += 1
+        self.bytes += size
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.last_ms = elapsed_ms
+        self.last_bytes = size
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return the bucket bound under which ``fraction`` of calls completed."""
+        if not self.calls:
+            return None
+        wanted = fraction * self.calls
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= wanted:
+                return LATENCY_BUCKETS_MS[index] if index < len(LATENCY_BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def as_dict(self) -> dict:
+        """Return a JSON-friendly summary."""
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "reauths": self.reauths,
+            "bytes": self.bytes,
+            "mean_ms": round(self.total_ms / self.calls, 2) if self.calls else None,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "max_ms": round(self.max_ms, 2),
+            "histogram_ms": dict(
+                zip([*map(str, LATENCY_BUCKETS_MS), "inf"], self.buckets)
+            ),
+        }
+
+
+class RefreshRecord:
+    """Timing of one coordinator refresh."""
+
+    __slots__ = ("timestamp", "duration_ms", "full_sync", "rpcs", "bytes", "success")
+
+    def __init__(self, duration_ms: float, full_sync: bool, rpcs: int, size: int, success: bool):
+        """Initialize the record."""
+        self.timestamp = time.time()
+        self.duration_ms = duration_ms
+        self.full_sync = full_sync
+        self.rpcs = rpcs
+        self.bytes = size
+        self.success = success
+
+    def as_dict(self) -> dict:
+        """Return a JSON-friendly view."""
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+
+class CallUsage:
+    """Round trips and response bytes of the calls made by one unit of work."""
+
+    __slots__ = ("calls", "bytes", "open")
+
+    def __init__(self):
+        """Initialize empty counters."""
+        self.calls = 0
+        self.bytes = 0
+        self.open = True  # Tasks spawned inside may outlive the unit; stop charging them then
+
+
+@contextmanager
+def track_calls():
+    """Charge every call completed in this context, and tasks it starts, to a ``CallUsage``.
+
+    Calls from other tasks running meanwhile (event long-polls, pipeline
+    writes, services) carry their own context and are not counted.
+    """
+    usage = CallUsage()
+    token = _CURRENT_USAGE.set(usage)
+    try:
+        yield usage
+    finally:
+        usage.open = False
+        _CURRENT_USAGE.reset(token)
+
+
+class RpcMetrics:
+    """Per-method RPC statistics plus a ring buffer of coordinator refreshes."""
+
+    def __init__(self):
+        """Initialize empty metrics."""
+        self.methods = {}  # method -> MethodStats
+        self.refreshes = deque(maxlen=REFRESH_HISTORY)
+        self.total_calls = 0
+        self.total_errors = 0
+        self.total_reauths = 0
+        self.total_bytes = 0
+
+    def _stats(self, method: str) -> MethodStats:
+        """Return the stats of ``method``, creating them on first use."""
+        stats = self.methods.get(method)
+        if stats is None:
+            stats = self.methods[method] = MethodStats()
+        return stats
+
+    def record_call(self, method: str, elapsed: float, size: int) -> None:
+        """Record a completed round trip of ``elapsed`` seconds and ``size`` bytes."""
+        self._stats(method).observe(elapsed * 1000, size)
+        self.total_calls += 1
+        self.total_bytes += size
+        usage = _CURRENT_USAGE.get()
+        if usage is not None and usage.open:
+            usage.calls += 1
+            usage.bytes += size
+
+    def record_error(self, method: str) -> None:
+        """Record a failed call (transport error or JSON-RPC error)."""
+        self._stats(method).errors += 1
+        self.total_errors += 1
+
+    def record_reauth(self, method: str) -> None:
+        """Record a re-login triggered by ``method``."""
+        self._stats(method).reauths += 1
+        self.total_reauths += 1
+
+    def record_refresh(self, duration: float, full_sync: bool, rpcs: int, size: int, success: bool) -> None:
+        """Record one coordinator refresh of ``duration`` seconds."""
+        self.refreshes.append(RefreshRecord(duration * 1000, full_sync, rpcs, size, success))
+
+    @property
+    def last_refresh(self) -> RefreshRecord | None:
+        """Return the most recent refresh, if any."""
+        return self.refreshes[-1] if self.refreshes else None
+
+    def refresh_summary(self) -> dict:
+        """Return mean/max refresh timings split by full and delta syncs."""
+        summary = {}
+        for name, full in (("full", True), ("delta", False)):
+            durations = [record.duration_ms for record in self.refreshes if record.full_sync is full]
+            summary[name] = {
+                "count": len(durations),
+                "mean_ms": round(sum(durations) / len(durations), 2) if durations else None,
+                "max_ms": round(max(durations), 2) if durations else None,
+            }
+        return summary
+
+    def snapshot(self) -> dict:
+        """Return every metric as a JSON-friendly dict."""
+        return {
+            "total_calls": self.total_calls,
+            "total_errors": self.total_errors,
+            "total_reauths": self.total_reauths,
+            "total_bytes": self.total_bytes,
+            "methods": {method: stats.as_dict() for method, stats in self.methods.items()},
+            "refreshes": self.refresh_summary(),
+        }
@@ -0,0 +1,145 @@
+"""Compact in-memory records for coordinator data."""
+import sys
+
+# Deluge watches these states closely; they change without moving payload
+WATCHED_STATES = {"Downloading", "Checking", "Allocating", "Moving", "Queued"}
+
+# Deluge torrent status key -> TorrentRecord slot it fills
+KEY_SLOTS = {
+    "name": "name",
+    "state": "state",
+    "progress": "progress",
+    "download_payload_rate": "download_rate",
+    "upload_payload_rate": "upload_rate",
+    "eta": "eta",
+    "ratio": "ratio",
+    "label": "label",
+    "total_size": "size",
+    "total_done": "size_done",
+    "queue": "queue_position",
+    "time_added": "time_added",
+    "tracker_host": "tracker",
+    "max_download_speed": "max_download_speed",
+    "max_upload_speed": "max_upload_speed",
+    "max_connections": "max_connections",
+    "max_upload_slots": "max_upload_slots",
+    "prioritize_first_last": "prioritize_first_last",
+}
+
+
+class TorrentRecord:
+    """One torrent in the coordinator index.
+
+    Uses ``__slots__`` instead of a per-torrent dict, and interns the hash
+    and the repeated strings (state, label) so thousands of records share
+    them. Call ``as_dict`` only where a consumer needs a dict view.
+    """
+
+    __slots__ = (
+        "id",
+        "name",
+        "state",
+        "progress",
+        "download_rate",
+        "upload_rate",
+        "eta",
+        "ratio",
+        "label",
+        "size",
+        "size_done",
+        "queue_position",
+        "time_added",
+        "tracker",
+        # Per-torrent options, only filled while a bandwidth policy needs them
+        "max_download_speed",
+        "max_upload_speed",
+        "max_connections",
+        "max_upload_slots",
+        "prioritize_first_last",
+    )
+
+    def __init__(self, torrent_id: str, torrent_info: dict):
+        """Build a record from a reply with the full key set."""
+        self.id = sys.intern(torrent_id)
+        self.name = torrent_info.get("name", "Unknown")
+        self.state = sys.intern(torrent_info.get("state", "Unknown"))
+        self.progress = round(torrent_info.get("progress", 0), 1)
+        self.download_rate = torrent_info.get("download_payload_rate", 0)
+        self.upload_rate = torrent_info.get("upload_payload_rate", 0)
+        self.eta = torrent_info.get("eta", 0)
+        self.ratio = round(torrent_info.get("ratio", 0), 2)
+        self.label = sys.intern(torrent_info.get("label", "No Label"))
+        self.size = torrent_info.get("total_size", 0)
+        self.size_done = torrent_info.get("total_done", 0)
+        self.queue_position = torrent_info.get("queue", -1)
+        self.time_added = torrent_info.get("time_added", 0)
+        self.tracker = sys.intern(torrent_info.get("tracker_host", ""))
+        self.max_download_speed = torrent_info.get("max_download_speed", -1)
+        self.max_upload_speed = torrent_info.get("max_upload_speed", -1)
+        self.max_connections = torrent_info.get("max_connections", -1)
+        self.max_upload_slots = torrent_info.get("max_upload_slots", -1)
+        self.prioritize_first_last = torrent_info.get("prioritize_first_last", False)
+
+    def apply_volatile(self, torrent_info: dict) -> None:
+        """Update the record in place from a volatile-keys reply."""
+        if "state" in torrent_info:
+            self.state = sys.intern(torrent_info["state"])
+        self.progress = round(torrent_info.get("progress", self.progress), 1)
+        self.download_rate = torrent_info.get("download_payload_rate", 0)
+        self.upload_rate = torrent_info.get("upload_payload_rate", 0)
+        self.eta = torrent_info.get("eta", self.eta)
+        self.ratio = round(torrent_info.get("ratio", self.ratio), 2)
+        self.size_done = torrent_info.get("total_done", self.size_done)
+        self.queue_position = torrent_info.get("queue", self.queue_position)
+
+    @property
+    def is_watched(self) -> bool:
+        """Return True if the torrent should be polled on every delta cycle."""
+        return (
+            self.state in WATCHED_STATES
+            or self.download_rate > 0
+            or self.upload_rate > 0
+        )
+
+    def as_dict(self, slots=None) -> dict:
+        """Return a dict view with the historical torrent keys, or only ``slots``."""
+        return {slot: getattr(self, slot) for slot in (slots or self.__slots__)}
+
+    def __repr__(self) -> str:
+        """Return a short debug representation."""
+        return f"<TorrentRecord {self.id[:8]} {self.state} {self.progress}%>"
+
+
+_UNSET = object()
+
+
+class VersionedCache:
+    """Single-value cache stamped with the version it was built for.
+
+    Entities use it to build attribute payloads once per coordinator
+    generation; reads with the same stamp return the cached value.
+    """
+
+    __slots__ = ("_version", "_value", "hits", "misses")
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self._version = _UNSET
+        self._value = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, version, build):
+        """Return the cached value for ``version``, calling ``build()`` on a miss."""
+        if version == self._version:
+            self.hits += 1
+            return self._value
+        self.misses += 1
+        self._value = build()
+        self._version = version
+        return self._value
+
+    def clear(self) -> None:
+        """Drop the cached value."""
+        self._version = _UNSET
+        self._value = None
@@ -0,0 +1,127 @@
+"""Coalescing, idempotent pipeline in front of ``core.set_config`` writes."""
+import logging
+import asyncio
+from homeassistant.exceptions import HomeAssistantError
+
+_LOGGER = logging.getLogger(__name__)
+
+DEBOUNCE_DELAY = 0.3  # seconds a burst of speed requests is collected before writing
+SPEED_KEYS = ("max_download_speed", "max_upload_speed")
+
+
+class SpeedPipeline:
+    """Serialise global config changes (speed limits, profiles) for one Deluge daemon.
+
+    Requests arriving within ``DEBOUNCE_DELAY`` of each other are merged
+    into one write, later values winning per key, and every caller in the
+    burst gets the values that were finally applied. A write is skipped
+    when it only sets speed limits the daemon already has, judged from the
+    last write or from coordinator data fetched after it; other keys are
+    not polled, so requests touching them are always written.
+    """
+
+    def __init__(self, client, coordinator, delay: float = DEBOUNCE_DELAY):
+        """Initialize the pipeline."""
+        self.client = client
+        self.coordinator = coordinator
+        self.delay = delay
+        self._desired = {}  # core.set_config values of the open burst
+        self._pending = None  # Future shared by every caller of the open burst
+        self._flush_handle = None  # Debounce timer closing the open burst
+        self._flush_tasks = set()  # Writes in flight or queued on the write lock
+        self._stopped = False
+        self._write_lock = asyncio.Lock()
+        self._written = None  # (limits, coordinator generation) of the last write
+        self.writes = 0
+        self.skipped = 0
+        self.coalesced = 0
+
+    def known_limits(self):
+        """Return the daemon's (download, upload) limits in KiB/s, or None if unknown."""
+        if self._written is not None:
+            limits, generation = self._written
+            # Trust our own write until the coordinator has polled after it
+            if not self.coordinator.data or self.coordinator.generation <= generation:
+                return limits
+        return self.coordinator.speed_limits()
+
+    async def async_set_speed(self, download: int, upload: int) -> dict:
+        """Request global limits in KiB/s and return the limits finally applied."""
+        applied = await self.async_set_config(
+            {"max_download_speed": download, "max_upload_speed": upload}
+        )
+        return {key: applied[key] for key in SPEED_KEYS}
+
+    async def async_set_config(self, values: dict) -> dict:
+        """Request ``core.set_config`` values and return every value the burst applied."""
+        if self._stopped:
+            raise HomeAssistantError("Deluge entry is unloaded")
+        if self._pending is None:
+            self._desired = dict(values)
+            loop = asyncio.get_running_loop()
+            self._pending = loop.create_future()
+            self._flush_handle = loop.call_later(self.delay, self._start_flush)
+        else:
+            self._desired.update(values)
+            self.coalesced += 1
+        # Shielded so one cancelled caller does not cancel the whole burst
+        return await asyncio.shield(self._pending)
+
+    def _start_flush(self) -> None:
+        """Close the current burst and write its final request."""
+        pending, self._pending = self._pending, None
+        self._flush_handle = None
+        task = asyncio.ensure_future(self._flush(pending, self._desired))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    def async_stop(self) -> None:
+        """Drop the open burst and cancel a write in flight on unload."""
+        self._stopped = True
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._pending is not None:
+            self._pending.set_exception(HomeAssistantError("Deluge entry unloaded before the write"))
+            self._pending = None
+        for task in self._flush_tasks:
+            task.cancel()
+
+    def _already_applied(self, desired: dict) -> bool:
+        """Return True if ``desired`` only sets speed limits the daemon already has."""
+        if not set(desired) <= set(SPEED_KEYS):
+            return False
+        limits = self.known_limits()
+        if limits is None:
+            return False
+        return all(desired[key] == value for key, value in zip(SPEED_KEYS, limits) if key in desired)
+
+    def _limits_after(self, desired: dict):
+        """Return the (download, upload) limits once ``desired`` is written, or None if unknown."""
+        known = self.known_limits() or (None, None)
+        limits = tuple(desired.get(key, value) for key, value in zip(SPEED_KEYS, known))
+        return None if None in limits else limits
+
+    async def _flush(self, pending: asyncio.Future, desired: dict) -> None:
+        """Write ``desired`` unless the daemon already has it, resolving ``pending``."""
+        applied = dict(desired)
+        try:
+            async with self._write_lock:
+                if self._already_applied(desired):
+                    self.skipped += 1
+                    _LOGGER.debug("Deluge already has %s, skipping write", applied)
+                else:
+                    limits = self._limits_after(desired)
+                    await self.client.async_set_config(applied, timeout=30)
+                    self.writes += 1
+                    if limits is not None:
+                        self._written = (limits, self.coordinator.generation)
+                    _LOGGER.debug("Wrote Deluge config %s", applied)
+        except asyncio.CancelledError:
+            # Unloaded mid-write: release the callers of this burst
+            pending.set_exception(HomeAssistantError("Deluge entry unloaded before the write"))
+            raise
+        except Exception as err:
+            pending.set_exception(err)
+            return
+        pending.set_result(applied)
@@ -0,0 +1,172 @@
+"""Per-torrent bandwidth policies reconciled after every coordinator refresh."""
+import logging
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+
+_LOGGER = logging.getLogger(__name__)
+
+CONF_POLICIES = "policies"  # entry.options key holding the ordered policy list
+
+# core.set_torrent_options key -> TorrentRecord slot (torrent status key) holding its value
+POLICY_OPTIONS = {
+    "max_download_speed": "max_download_speed",  # KiB/s, -1 unlimited
+    "max_upload_speed": "max_upload_speed",      # KiB/s, -1 unlimited
+    "max_connections": "max_connections",
+    "max_upload_slots": "max_upload_slots",
+    "prioritize_first_last_pieces": "prioritize_first_last",
+}
+# Status keys the engine needs in the coordinator's projection while policies exist
+POLICY_TORRENT_KEYS = ("label", "state", "tracker_host", *POLICY_OPTIONS.values())
+
+POLICY_SCHEMA = vol.All(
+    vol.Schema({
+        # Selectors; a policy without any matches every torrent (a default)
+        vol.Optional("label"): cv.string,
+        vol.Optional("state"): cv.string,
+        vol.Optional("tracker"): cv.string,
+        vol.Optional("max_download_speed"): vol.All(vol.Coerce(int), vol.Range(min=-1)),
+        vol.Optional("max_upload_speed"): vol.All(vol.Coerce(int), vol.Range(min=-1)),
+        vol.Optional("max_connections"): vol.All(vol.Coerce(int), vol.Range(min=-1)),
+        vol.Optional("max_upload_slots"): vol.All(vol.Coerce(int), vol.Range(min=-1)),
+        vol.Optional("prioritize_first_last_pieces"): cv.boolean,
+    }),
+    cv.has_at_least_one_key(*POLICY_OPTIONS),
+)
+POLICIES_SCHEMA = vol.All(cv.ensure_list, [POLICY_SCHEMA])
+
+
+class TorrentPolicy:
+    """One selector and the torrent options it enforces."""
+
+    __slots__ = ("label", "state", "tracker", "options", "raw")
+
+    def __init__(self, policy: dict):
+        """Split a stored policy into selectors and options."""
+        self.raw = policy
+        self.label = policy.get("label")
+        self.state = policy.get("state")
+        self.tracker = policy.get("tracker")
+        self.options = {key: policy[key] for key in POLICY_OPTIONS if key in policy}
+
+    def matches(self, record) -> bool:
+        """Return True if the torrent record matches every selector."""
+        return (
+            (self.label is None or record.label == self.label)
+            and (self.state is None or record.state == self.state)
+            and (self.tracker is None or self.tracker in record.tracker)
+        )
+
+
+class PolicyEngine:
+    """Keep per-torrent options of one daemon in line with ordered policies.
+
+    After every coordinator refresh the index is walked once; the first
+    matching policy gives a torrent's wanted options, and only options
+    that differ from the record are kept. Torrents needing the same
+    changes are grouped, so each distinct change is one batched
+    ``core.set_torrent_options`` call, and applied values are written back
+    into the records so unchanged torrents are never rewritten. Torrents
+    matching no policy are left alone.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry, client, coordinator):
+        """Initialize the engine from the entry options."""
+        self.hass = hass
+        self.entry = entry
+        self.client = client
+        self.coordinator = coordinator
+        self._policies = []
+        self._unsub_listener = None
+        self._unsub_keys = None
+        self._task = None
+        self._dirty = False  # A refresh arrived while a reconcile was running
+        self._start_generation = None  # Records from this generation may lack the policy keys
+        self.torrents_updated = 0
+        self.calls = 0
+        self._load(entry.options.get(CONF_POLICIES) or [])
+
+    def _load(self, policies: list) -> None:
+        """Parse the policies."""
+        self._policies = [TorrentPolicy(policy) for policy in policies]
+
+    def as_list(self) -> list:
+        """Return the policies as stored in the entry options."""
+        return [policy.raw for policy in self._policies]
+
+    @callback
+    def async_start(self) -> None:
+        """Follow the coordinator while there are policies."""
+        if not self._policies or self._unsub_listener is not None:
+            return
+        # Widen the projection so records carry labels, trackers and current options
+        self._start_generation = self.coordinator.generation
+        self._unsub_keys = self.coordinator.async_register_keys(POLICY_TORRENT_KEYS)
+        self._unsub_listener = self.coordinator.async_add_listener(self._handle_coordinator_update)
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop following the coordinator."""
+        for unsubscribe in (self._unsub_listener, self._unsub_keys):
+            if unsubscribe is not None:
+                unsubscribe()
+        self._unsub_listener = None
+        self._unsub_keys = None
+
+    async def async_set(self, policies: list) -> None:
+        """Replace the policies, persist them and reconcile on the next refresh."""
+        self.async_stop()
+        self._load(policies)
+        self.hass.config_entries.async_update_entry(
+            self.entry, options={**self.entry.options, CONF_POLICIES: self.as_list()}
+        )
+        self.async_start()
+
+    def pending_changes(self) -> dict:
+        """Return {frozen option changes: [torrent ids]} needed to match the policies."""
+        changes = {}
+        for record in self.coordinator.data["torrents"]:
+            policy = next((policy for policy in self._policies if policy.matches(record)), None)
+            if policy is None:
+                continue
+            differing = tuple(
+                (key, value) for key, value in policy.options.items()
+                if getattr(record, POLICY_OPTIONS[key]) != value
+            )
+            if differing:
+                changes.setdefault(differing, []).append(record.id)
+        return changes
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Reconcile after a successful refresh, one run at a time."""
+        if not self.coordinator.data or not self.coordinator.last_update_success:
+            return
+        # Wait for the full sync that fetches the newly registered keys
+        if self.coordinator.generation <= self._start_generation:
+            return
+        if self._task is not None and not self._task.done():
+            self._dirty = True
+            return
+        self._task = self.hass.async_create_task(self._async_reconcile())
+
+    async def _async_reconcile(self) -> None:
+        """Apply every pending change in batched calls."""
+        self._dirty = False
+        changes = self.pending_changes()
+        for differing, torrent_ids in changes.items():
+            options = dict(differing)
+            try:
+                await self.client.async_set_torrent_options(torrent_ids, options)
+            except Exception as err:
+                _LOGGER.error("Could not apply torrent policy %s to %d torrents: %s", options, len(torrent_ids), err)
+                continue
+            self.calls += 1
+            self.torrents_updated += len(torrent_ids)
+            # Record the applied values so the next cycle sees no difference
+            self.coordinator.apply_torrent_options(torrent_ids, {
+                POLICY_OPTIONS[key]: value for key, value in options.items()
+            })
+            _LOGGER.debug("Applied torrent policy %s to %d torrents", options, len(torrent_ids))
+        if self._dirty:
+            self._task = self.hass.async_create_task(self._async_reconcile())
@@ -0,0 +1,74 @@
+"""Named bandwidth profiles applied as one ``core.set_config`` write."""
+import voluptuous as vol
+from homeassistant.helpers import config_validation as cv
+from .const import (
+    CONF_PRESET1_DOWNLOAD,
+    CONF_PRESET1_NAME,
+    CONF_PRESET1_UPLOAD,
+    CONF_PRESET2_DOWNLOAD,
+    CONF_PRESET2_NAME,
+    CONF_PRESET2_UPLOAD,
+    CONF_PROFILES,
+    DEFAULT_PRESET1_DOWNLOAD,
+    DEFAULT_PRESET1_NAME,
+    DEFAULT_PRESET1_UPLOAD,
+    DEFAULT_PRESET2_DOWNLOAD,
+    DEFAULT_PRESET2_NAME,
+    DEFAULT_PRESET2_UPLOAD,
+    PROFILE_SETTINGS,
+)
+
+
+def _unique_names(profiles: list) -> list:
+    """Reject profile lists with duplicate names."""
+    names = [profile["name"] for profile in profiles]
+    if len(set(names)) != len(names):
+        raise vol.Invalid("Profile names must be unique")
+    return profiles
+
+
+PROFILE_SCHEMA = vol.All(
+    vol.Schema({
+        vol.Required("name"): cv.string,
+        # -1 means unlimited for every setting
+        **{vol.Optional(field): vol.All(vol.Coerce(int), vol.Range(min=-1)) for field in PROFILE_SETTINGS},
+    }),
+    cv.has_at_least_one_key(*PROFILE_SETTINGS),
+)
+PROFILES_SCHEMA = vol.All([PROFILE_SCHEMA], vol.Length(min=1), _unique_names)
+
+
+def entry_profiles(entry) -> list:
+    """Return the profiles of an entry, defaulting to its two presets."""
+    profiles = entry.options.get(CONF_PROFILES)
+    if profiles:
+        return profiles
+    config = entry.data
+    return [
+        {
+            "name": config.get(CONF_PRESET1_NAME, DEFAULT_PRESET1_NAME),
+            "download": config.get(CONF_PRESET1_DOWNLOAD, DEFAULT_PRESET1_DOWNLOAD),
+            "upload": config.get(CONF_PRESET1_UPLOAD, DEFAULT_PRESET1_UPLOAD),
+        },
+        {
+            "name": config.get(CONF_PRESET2_NAME, DEFAULT_PRESET2_NAME),
+            "download": config.get(CONF_PRESET2_DOWNLOAD, DEFAULT_PRESET2_DOWNLOAD),
+            "upload": config.get(CONF_PRESET2_UPLOAD, DEFAULT_PRESET2_UPLOAD),
+        },
+    ]
+
+
+def profile_config(profile: dict) -> dict:
+    """Return the ``core.set_config`` values of a profile."""
+    return {key: profile[field] for field, key in PROFILE_SETTINGS.items() if field in profile}
+
+
+def profile_for_limits(profiles: list, limits) -> dict | None:
+    """Return the first profile whose speed limits are ``limits`` (KiB/s), or None."""
+    if limits is None:
+        return None
+    download, upload = limits
+    for profile in profiles:
+        if profile.get("download") == download and profile.get("upload") == upload:
+            return profile
+    return None
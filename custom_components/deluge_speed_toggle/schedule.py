@@ -0,0 +1,235 @@
+"""Weekly bandwidth schedule driven by one precomputed transition timer."""
+import logging
+from datetime import datetime, time as dt_time, timedelta
+import voluptuous as vol
+from homeassistant.const import WEEKDAYS
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.util import dt as dt_util
+from .const import (
+    CONF_PRESET1_DOWNLOAD,
+    CONF_PRESET1_UPLOAD,
+    CONF_PRESET2_DOWNLOAD,
+    CONF_PRESET2_UPLOAD,
+    DEFAULT_PRESET1_DOWNLOAD,
+    DEFAULT_PRESET1_UPLOAD,
+    DEFAULT_PRESET2_DOWNLOAD,
+    DEFAULT_PRESET2_UPLOAD,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+CONF_SCHEDULE = "schedule"  # entry.options key holding {"rules": [...], "default": {...}}
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+
+def _time_string(value) -> str:
+    """Validate a time of day and store it as HH:MM."""
+    return cv.time(value).strftime("%H:%M")
+
+
+# A target is a preset (1 or 2, resolved when applied) or explicit limits in KiB/s
+TARGET_SCHEMA = vol.Any(
+    vol.Schema({vol.Required("preset"): vol.In([1, 2])}),
+    vol.Schema({vol.Required("download"): int, vol.Required("upload"): int}),
+)
+RULE_SCHEMA = vol.All(
+    vol.Schema({
+        vol.Required("days"): vol.All(cv.ensure_list, [vol.In(WEEKDAYS)]),
+        vol.Required("start"): _time_string,
+        vol.Required("end"): _time_string,
+        vol.Optional("preset"): vol.In([1, 2]),
+        vol.Optional("download"): int,
+        vol.Optional("upload"): int,
+    }),
+    vol.Any(
+        vol.Schema({vol.Required("preset"): object}, extra=vol.ALLOW_EXTRA),
+        vol.Schema({vol.Required("download"): object, vol.Required("upload"): object}, extra=vol.ALLOW_EXTRA),
+        msg="Each rule needs a preset or download and upload limits",
+    ),
+)
+SCHEDULE_SCHEMA = vol.Schema({
+    vol.Required("rules"): [RULE_SCHEMA],
+    vol.Optional("default"): TARGET_SCHEMA,
+})
+
+
+def _minutes(value: str) -> int:
+    """Return the minute of the day of an HH:MM string."""
+    hours, minutes = value.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+class ScheduleRule:
+    """One weekly time window and the limits it applies."""
+
+    __slots__ = ("spans", "target", "raw")
+
+    def __init__(self, rule: dict):
+        """Precompute the rule's spans as minute-of-week intervals."""
+        self.raw = rule
+        self.target = {key: rule[key] for key in ("preset", "download", "upload") if key in rule}
+        start = _minutes(rule["start"])
+        end = _minutes(rule["end"])
+        length = (end - start) % MINUTES_PER_DAY or MINUTES_PER_DAY  # end <= start crosses midnight
+        self.spans = [
+            (WEEKDAYS.index(day) * MINUTES_PER_DAY + start, length) for day in rule["days"]
+        ]
+
+    def covers(self, minute_of_week: int) -> bool:
+        """Return True if the rule is active at ``minute_of_week``."""
+        return any(
+            (minute_of_week - span_start) % MINUTES_PER_WEEK < length
+            for span_start, length in self.spans
+        )
+
+
+class SpeedSchedule:
+    """Apply weekly rules through the speed pipeline of one entry.
+
+    Rule boundaries are precomputed as sorted minute-of-week offsets; only
+    one ``async_track_point_in_time`` timer is armed, for the next
+    boundary. Each transition (and startup) applies the rule active at
+    that moment; the pipeline skips the write if the daemon already has
+    those limits. The first matching rule wins; outside every rule the
+    optional ``default`` target applies.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry, pipeline, coordinator):
+        """Initialize the schedule from the entry options."""
+        self.hass = hass
+        self.entry = entry
+        self.pipeline = pipeline
+        self.coordinator = coordinator
+        self._rules = []
+        self._default = None
+        self._boundaries = []  # Sorted minute-of-week offsets where the active rule may change
+        self._unsub_timer = None
+        self._task = None  # Startup or transition run in flight
+        self._stopped = False
+        self.next_transition = None
+        self.active_target = None
+        self._load(entry.options.get(CONF_SCHEDULE) or {"rules": []})
+
+    def _load(self, schedule: dict) -> None:
+        """Parse rules and precompute the weekly boundaries."""
+        self._rules = [ScheduleRule(rule) for rule in schedule.get("rules", [])]
+        self._default = schedule.get("default")
+        boundaries = set()
+        for rule in self._rules:
+            for span_start, length in rule.spans:
+                boundaries.add(span_start)
+                boundaries.add((span_start + length) % MINUTES_PER_WEEK)
+        self._boundaries = sorted(boundaries)
+
+    def as_dict(self) -> dict:
+        """Return the schedule as stored in the entry options."""
+        schedule = {"rules": [rule.raw for rule in self._rules]}
+        if self._default is not None:
+            schedule["default"] = self._default
+        return schedule
+
+    def _target_at(self, now: datetime):
+        """Return the target active at ``now``, or None."""
+        minute_of_week = now.weekday() * MINUTES_PER_DAY + now.hour * 60 + now.minute
+        for rule in self._rules:
+            if rule.covers(minute_of_week):
+                return rule.target
+        return self._default
+
+    def _next_boundary(self, now: datetime) -> datetime | None:
+        """Return the first boundary strictly after ``now``."""
+        if not self._boundaries:
+            return None
+        minute_of_week = now.weekday() * MINUTES_PER_DAY + now.hour * 60 + now.minute
+        offset = next(
+            (boundary for boundary in self._boundaries if boundary > minute_of_week),
+            self._boundaries[0] + MINUTES_PER_WEEK,
+        )
+        # Build the wall-clock time in the local zone so DST shifts stay on the hour
+        day = now.date() + timedelta(days=offset // MINUTES_PER_DAY - now.weekday())
+        minute = offset % MINUTES_PER_DAY
+        return datetime.combine(
+            day, dt_time(minute // 60, minute % 60), tzinfo=now.tzinfo
+        )
+
+    def _limits(self, target: dict) -> tuple:
+        """Resolve a target to (download, upload) limits in KiB/s."""
+        if "preset" not in target:
+            return target["download"], target["upload"]
+        config = self.entry.data
+        if target["preset"] == 1:
+            return (
+                config.get(CONF_PRESET1_DOWNLOAD, DEFAULT_PRESET1_DOWNLOAD),
+                config.get(CONF_PRESET1_UPLOAD, DEFAULT_PRESET1_UPLOAD),
+            )
+        return (
+            config.get(CONF_PRESET2_DOWNLOAD, DEFAULT_PRESET2_DOWNLOAD),
+            config.get(CONF_PRESET2_UPLOAD, DEFAULT_PRESET2_UPLOAD),
+        )
+
+    @callback
+    def async_start(self) -> None:
+        """Reconcile the daemon with the current rule in the background, then arm the timer."""
+        self._stopped = False
+        self._task = self.hass.async_create_task(self._async_start())
+
+    async def _async_start(self) -> None:
+        """Wait for the bootstrap snapshot so the pipeline knows the current limits, then apply."""
+        await self.coordinator.async_bootstrap()
+        await self._async_apply_and_arm()
+
+    async def async_set(self, schedule: dict) -> None:
+        """Replace the rules, persist them and re-evaluate right away."""
+        self._load(schedule)
+        self.hass.config_entries.async_update_entry(
+            self.entry, options={**self.entry.options, CONF_SCHEDULE: self.as_dict()}
+        )
+        await self._async_apply_and_arm()
+
+    async def _async_apply_and_arm(self) -> None:
+        """Apply the target active now and arm the next transition."""
+        self._cancel_timer()
+        now = dt_util.now()
+        target = self._target_at(now)
+        self.active_target = target
+        if target is not None:
+            download, upload = self._limits(target)
+            try:
+                await self.pipeline.async_set_speed(download, upload)
+                _LOGGER.info("Schedule applied %s (Download=%s, Upload=%s)", target, download, upload)
+                await self.coordinator.async_boost()
+            except Exception as err:
+                _LOGGER.error("Schedule could not apply %s: %s", target, err)
+        if self._stopped:
+            # Unloaded while writing: a timer armed now would outlive the entry
+            return
+        self.next_transition = self._next_boundary(now)
+        if self.next_transition is not None:
+            self._unsub_timer = async_track_point_in_time(
+                self.hass, self._handle_transition, self.next_transition
+            )
+            _LOGGER.debug("Next schedule transition at %s", self.next_transition)
+
+    @callback
+    def _handle_transition(self, _now: datetime) -> None:
+        """Run the transition the timer was armed for."""
+        self._unsub_timer = None
+        self._task = self.hass.async_create_task(self._async_apply_and_arm())
+
+    def _cancel_timer(self) -> None:
+        """Disarm the pending transition timer."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop the schedule on unload, cancelling a run in flight."""
+        self._stopped = True
+        self._cancel_timer()
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
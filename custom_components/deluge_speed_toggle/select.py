@@ -0,0 +1,103 @@
+"""Profile select for Deluge Speed Toggle integration."""
+import logging
+from homeassistant.components.select import SelectEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from .api import DelugeApiError
+from .const import DOMAIN
+from .profiles import entry_profiles, profile_config, profile_for_limits
+
+_LOGGER = logging.getLogger(__name__)
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback):
+    """Set up the profile select from a config entry."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities([DelugeProfileSelect(entry, data["coordinator"], data["pipeline"])])
+    _LOGGER.info("Deluge profile select added")
+
+class DelugeProfileSelect(SelectEntity):
+    """Select between the named profiles of one Deluge daemon.
+
+    Selecting a profile sends every setting it bundles (speed limits,
+    connection and slot limits) in one ``core.set_config`` write through
+    the speed pipeline. Only speed limits are polled, so a profile is
+    shown as current while the daemon's limits match it; limits set
+    elsewhere select the first profile with those limits, if any.
+    """
+
+    _attr_icon = "mdi:speedometer"
+
+    def __init__(self, entry: ConfigEntry, coordinator, pipeline):
+        """Initialize the select."""
+        self.entry = entry
+        self.coordinator = coordinator
+        self.pipeline = pipeline
+        self._attr_name = "Deluge Profile"
+        self._attr_unique_id = f"{DOMAIN}_{coordinator.host}_{coordinator.port}_profile"
+        self._attr_should_poll = False
+        self._current = None  # Name of the profile last applied or matched
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, f"{coordinator.host}_{coordinator.port}")},
+            "name": "Deluge Server",
+            "manufacturer": "Deluge",
+            "model": "Torrent Client",
+            "sw_version": "1.1",
+        }
+
+    async def async_added_to_hass(self):
+        """Follow the coordinator once the bootstrap snapshot is in."""
+        self.async_on_remove(
+            self.coordinator.async_add_listener(self._handle_coordinator_update)
+        )
+        await self.coordinator.async_bootstrap()
+        self._handle_coordinator_update()
+
+    @property
+    def options(self) -> list:
+        """Return the profile names."""
+        return [profile["name"] for profile in entry_profiles(self.entry)]
+
+    @property
+    def current_option(self) -> str | None:
+        """Return the active profile, or None if the daemon matches none."""
+        return self._current
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return self.coordinator.last_update_success
+
+    def _profile(self, name: str) -> dict | None:
+        """Return the profile called ``name``."""
+        return next((profile for profile in entry_profiles(self.entry) if profile["name"] == name), None)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Re-match the daemon's speed limits against the profiles."""
+        limits = self.coordinator.speed_limits()
+        if limits is not None:
+            current = self._profile(self._current) if self._current else None
+            # Keep the applied profile while the limits it sets hold; another may share them
+            if current is None or any(
+                current.get(field, value) != value for field, value in zip(("download", "upload"), limits)
+            ):
+                matched = profile_for_limits(entry_profiles(self.entry), limits)
+                self._current = matched["name"] if matched else None
+        self.async_write_ha_state()
+
+    async def async_select_option(self, option: str) -> None:
+        """Apply every setting of a profile in one write."""
+        profile = self._profile(option)
+        if profile is None:
+            raise HomeAssistantError(f"Unknown Deluge profile: {option}")
+        values = profile_config(profile)
+        _LOGGER.info("Applying Deluge profile %s: %s", option, values)
+        try:
+            await self.pipeline.async_set_config(values)
+        except DelugeApiError as err:
+            raise HomeAssistantError(f"Could not apply Deluge profile {option}: {err}") from err
+        self._current = option
+        self.async_write_ha_state()
+        await self.coordinator.async_boost()
@@ -1,33 +1,28 @@
 """Deluge monitoring sensors for real-time stats."""
 import logging
-import asyncio
-import aiohttp
-from datetime import timedelta
-from homeassistant.components.sensor import SensorEntity, SensorDeviceClass
-from homeassistant.const import UnitOfDataRate, PERCENTAGE
+from homeassistant.components.sensor import SensorEntity, SensorDeviceClass, SensorStateClass
+from homeassistant.const import UnitOfDataRate, UnitOfTime, PERCENTAGE, EntityCategory
 from homeassistant.const import UnitOfInformation
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from .const import DOMAIN
+from .coordinator import DelugeDataCoordinator
+from .models import VersionedCache
+from .history import WINDOWS
+from .const import DOMAIN, DATA_FLEET
 
 _LOGGER = logging.getLogger(__name__)
 
-SCAN_INTERVAL = timedelta(seconds=30)  # Update every 30 seconds
-
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback):
     """Set up Deluge sensors from config entry."""
-    config = entry.data
-    
-    # Create data coordinator for efficient updates
-    coordinator = DelugeDataCoordinator(hass, config)
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
     
-    # Try initial refresh but don't fail if Deluge is unavailable
-    try:
-        await coordinator.async_config_entry_first_refresh()
-    except Exception as err:
-        _LOGGER.warning("Initial Deluge connection failed, sensors will retry: %s", err)
+    # Await the bootstrap refresh shared with the switch; don't fail if Deluge is unavailable
+    if not await coordinator.async_bootstrap():
+        _LOGGER.warning(
+            "Initial Deluge connection failed, sensors will retry: %s",
+            coordinator.last_exception,
+        )
     
     # Create sensor entities
     sensors = [
@@ -36,203 +31,39 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
         DelugeTorrentCountSensor(coordinator),
         DelugeActiveTorrentsSensor(coordinator),
         DelugeStatusSensor(coordinator),
+        DelugeRefreshDurationSensor(coordinator),
+        DelugeRpcCallsSensor(coordinator),
+        DelugeRpcErrorsSensor(coordinator),
     ]
     
     async_add_entities(sensors, update_before_add=False)
-    _LOGGER.info("Deluge monitoring sensors added")
-
-class DelugeDataCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching data from Deluge API."""
-
-    def __init__(self, hass: HomeAssistant, config: dict):
-        """Initialize."""
-        self.host = config["host"]
-        self.port = config["port"]
-        self.password = config["password"]
-        
-        super().__init__(
-            hass,
-            _LOGGER,
-            name=DOMAIN,
-            update_interval=SCAN_INTERVAL,
+    
+    # Fleet totals once a second daemon is configured; the fleet picks one
+    # entry's platform for them and moves them on when that entry unloads
+    fleet = hass.data[DATA_FLEET]
+
+    @callback
+    def add_fleet_sensors() -> None:
+        async_add_entities(
+            [DelugeFleetSensor(fleet, *description) for description in FLEET_SENSORS]
         )
 
-    async def _async_update_data(self):
-        """Update data via library."""
-        try:
-            return await self._fetch_deluge_data()
-        except Exception as exception:
-            raise UpdateFailed(f"Error communicating with Deluge: {exception}")
-
-    async def _fetch_deluge_data(self):
-        """Fetch data from Deluge daemon using same methods as working switch."""
-        timeout = aiohttp.ClientTimeout(total=10)
-        
-        # Create session with cookie jar to maintain authentication
-        connector = aiohttp.TCPConnector()
-        cookie_jar = aiohttp.CookieJar(unsafe=True)
-        
-        async with aiohttp.ClientSession(
-            connector=connector,
-            cookie_jar=cookie_jar,
-            timeout=timeout
-        ) as session:
-            
-            # Step 1: Authenticate (same as switch)
-            auth_response = await session.post(
-                f"http://{self.host}:{self.port}/json",
-                json={"method": "auth.login", "params": [self.password], "id": 1}
-            )
-            
-            if auth_response.status != 200:
-                raise Exception(f"Authentication HTTP error: {auth_response.status}")
-                
-            auth_result = await auth_response.json()
-            if not auth_result.get("result"):
-                raise Exception(f"Authentication failed: {auth_result}")
-                
-            _LOGGER.debug("Sensor authentication successful")
-            
-            # Step 2: Get session stats with required keys parameter
-            stats_response = await session.post(
-                f"http://{self.host}:{self.port}/json",
-                json={
-                    "method": "core.get_session_status", 
-                    "params": [["download_rate", "upload_rate", "num_peers", "dht_nodes"]], 
-                    "id": 2
-                }
-            )
-            
-            # Step 3: Get torrent list with required filter_dict and keys parameters
-            torrents_response = await session.post(
-                f"http://{self.host}:{self.port}/json",
-                json={
-                    "method": "core.get_torrents_status", 
-                    "params": [
-                        {},  # filter_dict (empty = all torrents)
-                        ["name", "state", "progress", "download_payload_rate", "upload_payload_rate", "eta", "ratio", "label", "time_added", "total_size", "total_done", "queue"]  # keys
-                    ], 
-                    "id": 3
-                }
-            )
-            
-            # Step 4: Get config with authenticated session  
-            config_response = await session.post(
-                f"http://{self.host}:{self.port}/json",
-                json={"method": "core.get_config", "params": [], "id": 4}
-            )
-            
-            if stats_response.status != 200:
-                raise Exception(f"Stats request failed: HTTP {stats_response.status}")
-            if torrents_response.status != 200:
-                raise Exception(f"Torrents request failed: HTTP {torrents_response.status}")
-            if config_response.status != 200:
-                raise Exception(f"Config request failed: HTTP {config_response.status}")
-                
-            stats = await stats_response.json()
-            torrents = await torrents_response.json()
-            config = await config_response.json()
-            
-            # Debug log the raw responses
-            _LOGGER.debug("Raw stats response: %s", stats)
-            _LOGGER.debug("Raw torrents response: %s", torrents)
-            _LOGGER.debug("Raw config response: %s", config)
-            
-            # Validate API responses
-            if not stats or not isinstance(stats, dict):
-                raise Exception(f"Invalid stats response from Deluge: {stats}")
-            if not torrents or not isinstance(torrents, dict):
-                raise Exception(f"Invalid torrents response from Deluge: {torrents}")
-            if not config or not isinstance(config, dict):
-                raise Exception(f"Invalid config response from Deluge: {config}")
-            
-            # Check for API errors
-            if stats.get("error"):
-                raise Exception(f"Deluge stats API error: {stats.get('error')}")
-            if torrents.get("error"):
-                raise Exception(f"Deluge torrents API error: {torrents.get('error')}")
-            if config.get("error"):
-                raise Exception(f"Deluge config API error: {config.get('error')}")
-            
-            # Process torrent data
-            torrent_data = torrents.get("result", {})
-            if not isinstance(torrent_data, dict):
-                torrent_data = {}
-                
-            torrent_list = []
-            active_count = 0
-            downloading_count = 0
-            seeding_count = 0
-            
-            for torrent_id, torrent_info in torrent_data.items():
-                state = torrent_info.get("state", "Unknown")
-                progress = torrent_info.get("progress", 0)
-                
-                # Format file size
-                total_size = torrent_info.get("total_size", 0)
-                total_done = torrent_info.get("total_done", 0)
-                
-                torrent_list.append({
-                    "id": torrent_id,
-                    "name": torrent_info.get("name", "Unknown"),
-                    "state": state,
-                    "progress": round(progress, 1),
-                    "download_rate": torrent_info.get("download_payload_rate", 0),
-                    "upload_rate": torrent_info.get("upload_payload_rate", 0),
-                    "eta": torrent_info.get("eta", 0),
-                    "ratio": round(torrent_info.get("ratio", 0), 2),
-                    "label": torrent_info.get("label", "No Label"),
-                    "size": total_size,
-                    "size_done": total_done,
-                    "queue_position": torrent_info.get("queue", -1),
-                    "time_added": torrent_info.get("time_added", 0)
-                })
-                
-                # Count by state
-                if state in ["Downloading", "Seeding"]:
-                    active_count += 1
-                if state == "Downloading":
-                    downloading_count += 1
-                elif state == "Seeding":
-                    seeding_count += 1
-            
-            session_stats = stats.get("result", {})
-            config_values = config.get("result", {})
-            
-            # Validate the results are dictionaries
-            if not isinstance(session_stats, dict):
-                session_stats = {}
-            if not isinstance(config_values, dict):
-                config_values = {}
-            
-            result_data = {
-                "download_rate": session_stats.get("download_rate", 0),  # bytes/sec
-                "upload_rate": session_stats.get("upload_rate", 0),      # bytes/sec
-                "max_download_speed": config_values.get("max_download_speed", -1) * 1024,  # Convert KiB to bytes
-                "max_upload_speed": config_values.get("max_upload_speed", -1) * 1024,      # Convert KiB to bytes
-                "total_torrents": len(torrent_list),
-                "active_torrents": active_count,
-                "downloading_torrents": downloading_count,
-                "seeding_torrents": seeding_count,
-                "torrents": torrent_list,
-                "status": "Connected"
-            }
-            
-            # Debug logging to see what we're actually getting
-            _LOGGER.debug("Deluge API Response - Session Stats: %s", session_stats)
-            _LOGGER.debug("Deluge API Response - Torrents Count: %d", len(torrent_list))
-            _LOGGER.debug("Deluge API Response - Download Rate: %s bytes/sec", result_data["download_rate"])
-            _LOGGER.debug("Deluge API Response - Upload Rate: %s bytes/sec", result_data["upload_rate"])
-            
-            return result_data
+    fleet.async_add_sensor_platform(entry.entry_id, add_fleet_sensors)
+    _LOGGER.info("Deluge monitoring sensors added")
 
 class DelugeBaseSensor(SensorEntity):
     """Base class for Deluge sensors."""
 
+    # Torrent status keys this sensor reads beyond the coordinator's base set
+    torrent_keys = ()
+
     def __init__(self, coordinator: DelugeDataCoordinator):
         """Initialize the sensor."""
         self.coordinator = coordinator
         self._attr_should_poll = False
+        self._attributes_cache = VersionedCache()
+        # Unique IDs carry host/port so several daemons don't collide
+        self._unique_prefix = f"{DOMAIN}_{coordinator.host}_{coordinator.port}"
         
         # Add device info to group sensors with the switch
         self._attr_device_info = {
@@ -248,6 +79,10 @@ class DelugeBaseSensor(SensorEntity):
         self.async_on_remove(
             self.coordinator.async_add_listener(self.async_write_ha_state)
         )
+        if self.torrent_keys:
+            self.async_on_remove(self.coordinator.async_register_keys(self.torrent_keys))
+        self.coordinator.attribute_caches[self.unique_id] = self._attributes_cache
+        self.async_on_remove(lambda: self.coordinator.attribute_caches.pop(self.unique_id, None))
 
     async def async_update(self):
         """Update the entity."""
@@ -258,13 +93,37 @@ class DelugeBaseSensor(SensorEntity):
         """Return if entity is available."""
         return self.coordinator.last_update_success
 
+    @property
+    def extra_state_attributes(self):
+        """Return attributes, built once per coordinator generation."""
+        if not self.coordinator.data:
+            return {}
+        return self._attributes_cache.get(
+            self.coordinator.generation, self._build_attributes
+        )
+
+    def _build_attributes(self) -> dict:
+        """Build the attribute payload from coordinator data."""
+        return {}
+
+def _rolling_attributes(coordinator, direction: str) -> dict:
+    """Return rolling mean/max/p95 in kB/s of ``direction`` for every history window."""
+    attributes = {}
+    for window in WINDOWS:
+        stats = coordinator.rate_history.stats(window)
+        if stats is None:
+            continue
+        for stat in ("mean", "max", "p95"):
+            attributes[f"{stat}_{window}"] = round(stats[f"{direction}_{stat}"] / 1024, 2)
+    return attributes
+
 class DelugeDownloadSpeedSensor(DelugeBaseSensor):
     """Deluge download speed sensor."""
 
     def __init__(self, coordinator):
         super().__init__(coordinator)
         self._attr_name = "Deluge Download Speed"
-        self._attr_unique_id = f"{DOMAIN}_download_speed_kbs"
+        self._attr_unique_id = f"{self._unique_prefix}_download_speed_kbs"
         self._attr_device_class = SensorDeviceClass.DATA_RATE  
         self._attr_native_unit_of_measurement = "kB/s"
         self._attr_icon = "mdi:download"
@@ -275,17 +134,15 @@ class DelugeDownloadSpeedSensor(DelugeBaseSensor):
         bytes_per_sec = self.coordinator.data.get("download_rate", 0) if self.coordinator.data else 0
         return round(bytes_per_sec / 1024, 2) if bytes_per_sec > 0 else 0
 
-    @property
-    def extra_state_attributes(self):
+    def _build_attributes(self):
         """Return additional attributes."""
-        if not self.coordinator.data:
-            return {}
-        
         max_speed = self.coordinator.data.get("max_download_speed", -1)
         return {
             "max_speed_bytes_per_sec": max_speed,
             "max_speed_limited": max_speed != -1,
-            "speed_limit_kb_s": f"{max_speed // 1024} KB/s" if max_speed > 0 else "Unlimited"
+            "speed_limit_kb_s": f"{max_speed // 1024} KB/s" if max_speed > 0 else "Unlimited",
+            # Rolling stats in kB/s, e.g. mean_5m, max_1h, p95_1h
+            **_rolling_attributes(self.coordinator, "download"),
         }
 
 class DelugeUploadSpeedSensor(DelugeBaseSensor):
@@ -294,7 +151,7 @@ class DelugeUploadSpeedSensor(DelugeBaseSensor):
     def __init__(self, coordinator):
         super().__init__(coordinator)
         self._attr_name = "Deluge Upload Speed"
-        self._attr_unique_id = f"{DOMAIN}_upload_speed_kbs"
+        self._attr_unique_id = f"{self._unique_prefix}_upload_speed_kbs"
         self._attr_device_class = SensorDeviceClass.DATA_RATE
         self._attr_native_unit_of_measurement = "kB/s"
         self._attr_icon = "mdi:upload"
@@ -305,17 +162,15 @@ class DelugeUploadSpeedSensor(DelugeBaseSensor):
         bytes_per_sec = self.coordinator.data.get("upload_rate", 0) if self.coordinator.data else 0
         return round(bytes_per_sec / 1024, 2) if bytes_per_sec > 0 else 0
 
-    @property
-    def extra_state_attributes(self):
+    def _build_attributes(self):
         """Return additional attributes."""
-        if not self.coordinator.data:
-            return {}
-        
         max_speed = self.coordinator.data.get("max_upload_speed", -1)
         return {
             "max_speed_bytes_per_sec": max_speed,
             "max_speed_limited": max_speed != -1,
-            "speed_limit_kb_s": f"{max_speed // 1024} KB/s" if max_speed > 0 else "Unlimited"
+            "speed_limit_kb_s": f"{max_speed // 1024} KB/s" if max_speed > 0 else "Unlimited",
+            # Rolling stats in kB/s, e.g. mean_5m, max_1h, p95_1h
+            **_rolling_attributes(self.coordinator, "upload"),
         }
 
 class DelugeTorrentCountSensor(DelugeBaseSensor):
@@ -324,7 +179,7 @@ class DelugeTorrentCountSensor(DelugeBaseSensor):
     def __init__(self, coordinator):
         super().__init__(coordinator)
         self._attr_name = "Deluge Torrent Count"
-        self._attr_unique_id = f"{DOMAIN}_torrent_count"
+        self._attr_unique_id = f"{self._unique_prefix}_torrent_count"
         self._attr_icon = "mdi:file-download-outline"
 
     @property
@@ -332,12 +187,8 @@ class DelugeTorrentCountSensor(DelugeBaseSensor):
         """Return the total torrent count."""
         return self.coordinator.data.get("total_torrents", 0) if self.coordinator.data else 0
 
-    @property
-    def extra_state_attributes(self):
+    def _build_attributes(self):
         """Return torrent breakdown."""
-        if not self.coordinator.data:
-            return {}
-        
         return {
             "active_torrents": self.coordinator.data.get("active_torrents", 0),
             "downloading": self.coordinator.data.get("downloading_torrents", 0),
@@ -347,10 +198,15 @@ class DelugeTorrentCountSensor(DelugeBaseSensor):
 class DelugeActiveTorrentsSensor(DelugeBaseSensor):
     """Deluge active torrents sensor with detailed info."""
 
+    torrent_keys = (
+        "name", "state", "progress", "download_payload_rate", "upload_payload_rate",
+        "label", "ratio", "total_size", "eta",
+    )
+
     def __init__(self, coordinator):
         super().__init__(coordinator)
         self._attr_name = "Deluge Active Torrents"
-        self._attr_unique_id = f"{DOMAIN}_active_torrents"
+        self._attr_unique_id = f"{self._unique_prefix}_active_torrents"
         self._attr_icon = "mdi:download-multiple"
 
     @property
@@ -358,44 +214,43 @@ class DelugeActiveTorrentsSensor(DelugeBaseSensor):
         """Return the active torrent count."""
         return self.coordinator.data.get("active_torrents", 0) if self.coordinator.data else 0
 
-    @property
-    def extra_state_attributes(self):
+    def _build_attributes(self):
         """Return detailed torrent information."""
-        if not self.coordinator.data:
-            return {}
-        
         torrents = self.coordinator.data.get("torrents", [])
         torrent_details = {}
         
         for i, torrent in enumerate(torrents[:15]):  # Show more torrents
             # Format file size
-            size_mb = torrent['size'] / (1024 * 1024) if torrent['size'] > 0 else 0
+            size_mb = torrent.size / (1024 * 1024) if torrent.size > 0 else 0
             size_str = f"{size_mb:.1f} MB" if size_mb < 1024 else f"{size_mb/1024:.1f} GB"
             
             torrent_details[f"torrent_{i+1}"] = {
-                "name": torrent["name"][:60],  # Longer names
-                "state": torrent["state"],
-                "progress": torrent['progress'],
-                "progress_text": f"{torrent['progress']}%",
-                "download_speed": torrent['download_rate'] // 1024,
-                "upload_speed": torrent['upload_rate'] // 1024,
-                "download_speed_text": f"{torrent['download_rate'] // 1024} KB/s" if torrent['download_rate'] > 0 else "0 KB/s",
-                "upload_speed_text": f"{torrent['upload_rate'] // 1024} KB/s" if torrent['upload_rate'] > 0 else "0 KB/s",
-                "label": torrent.get("label", "No Label"),
-                "ratio": torrent["ratio"],
+                "name": torrent.name[:60],  # Longer names
+                "state": torrent.state,
+                "progress": torrent.progress,
+                "progress_text": f"{torrent.progress}%",
+                "download_speed": torrent.download_rate // 1024,
+                "upload_speed": torrent.upload_rate // 1024,
+                "download_speed_text": f"{torrent.download_rate // 1024} KB/s" if torrent.download_rate > 0 else "0 KB/s",
+                "upload_speed_text": f"{torrent.upload_rate // 1024} KB/s" if torrent.upload_rate > 0 else "0 KB/s",
+                "label": torrent.label,
+                "ratio": torrent.ratio,
                 "size": size_str,
-                "eta": torrent["eta"] if torrent["eta"] > 0 else None
+                "eta": torrent.eta if torrent.eta > 0 else None
             }
         
         return torrent_details
 
+# Torrent keys of every sensor, registered before the bootstrap refresh
+SENSOR_TORRENT_KEYS = DelugeActiveTorrentsSensor.torrent_keys
+
 class DelugeStatusSensor(DelugeBaseSensor):
     """Deluge connection status sensor."""
 
     def __init__(self, coordinator):
         super().__init__(coordinator)
         self._attr_name = "Deluge Status"
-        self._attr_unique_id = f"{DOMAIN}_status"
+        self._attr_unique_id = f"{self._unique_prefix}_status"
         self._attr_icon = "mdi:server-network"
 
     @property
@@ -415,4 +270,158 @@ class DelugeStatusSensor(DelugeBaseSensor):
             "host": self.coordinator.host,
             "port": self.coordinator.port,
             "last_update": self.coordinator.last_update_success
-        }
\ No newline at end of file
+        }
+
+class DelugeRefreshDurationSensor(DelugeBaseSensor):
+    """Duration of the last coordinator refresh, with full/delta breakdown."""
+
+    _unrecorded_attributes = frozenset({"full", "delta"})
+
+    def __init__(self, coordinator):
+        super().__init__(coordinator)
+        self._attr_name = "Deluge Refresh Duration"
+        self._attr_unique_id = f"{self._unique_prefix}_refresh_duration"
+        self._attr_device_class = SensorDeviceClass.DURATION
+        self._attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_icon = "mdi:timer-outline"
+
+    @property
+    def native_value(self):
+        """Return the last refresh duration in ms."""
+        record = self.coordinator.client.metrics.last_refresh
+        return round(record.duration_ms, 1) if record else None
+
+    def _build_attributes(self):
+        """Return the last refresh details and mean/max per sync kind."""
+        metrics = self.coordinator.client.metrics
+        record = metrics.last_refresh
+        attributes = metrics.refresh_summary()
+        if record:
+            attributes.update({
+                "full_sync": record.full_sync,
+                "rpcs": record.rpcs,
+                "response_bytes": record.bytes,
+            })
+        return attributes
+
+class DelugeRpcCallsSensor(DelugeBaseSensor):
+    """Total JSON-RPC calls, with per-method latency and size statistics."""
+
+    _unrecorded_attributes = frozenset({"methods"})
+
+    def __init__(self, coordinator):
+        super().__init__(coordinator)
+        self._attr_name = "Deluge RPC Calls"
+        self._attr_unique_id = f"{self._unique_prefix}_rpc_calls"
+        self._attr_state_class = SensorStateClass.TOTAL_INCREASING
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_icon = "mdi:swap-horizontal"
+
+    @property
+    def native_value(self):
+        """Return the number of RPCs sent since setup."""
+        return self.coordinator.client.metrics.total_calls
+
+    def _build_attributes(self):
+        """Return per-method counters and latency percentiles."""
+        metrics = self.coordinator.client.metrics
+        methods = {}
+        for method, stats in metrics.methods.items():
+            summary = stats.as_dict()
+            del summary["histogram_ms"]
+            methods[method] = summary
+        return {"response_bytes": metrics.total_bytes, "methods": methods}
+
+class DelugeRpcErrorsSensor(DelugeBaseSensor):
+    """Total failed JSON-RPC calls."""
+
+    def __init__(self, coordinator):
+        super().__init__(coordinator)
+        self._attr_name = "Deluge RPC Errors"
+        self._attr_unique_id = f"{self._unique_prefix}_rpc_errors"
+        self._attr_state_class = SensorStateClass.TOTAL_INCREASING
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_icon = "mdi:alert-circle-outline"
+
+    @property
+    def available(self):
+        """Stay available while the daemon is down; that is when errors count up."""
+        return True
+
+    @property
+    def native_value(self):
+        """Return the number of failed RPCs since setup."""
+        return self.coordinator.client.metrics.total_errors
+
+    @property
+    def extra_state_attributes(self):
+        """Return attributes, rebuilt when the counters move; refreshes stall during outages."""
+        metrics = self.coordinator.client.metrics
+        return self._attributes_cache.get(
+            (metrics.total_errors, metrics.total_reauths), self._build_attributes
+        )
+
+    def _build_attributes(self):
+        """Return error and re-auth counts per method."""
+        return {
+            method: {"errors": stats.errors, "reauths": stats.reauths}
+            for method, stats in self.coordinator.client.metrics.methods.items()
+            if stats.errors or stats.reauths
+        }
+
+# key, name, unit, icon; rates are converted from bytes/s to kB/s like the per-daemon sensors
+FLEET_SENSORS = (
+    ("download_rate", "Deluge Fleet Download Speed", "kB/s", "mdi:download"),
+    ("upload_rate", "Deluge Fleet Upload Speed", "kB/s", "mdi:upload"),
+    ("total_torrents", "Deluge Fleet Torrent Count", None, "mdi:file-download-outline"),
+    ("active_torrents", "Deluge Fleet Active Torrents", None, "mdi:download-multiple"),
+    ("downloading_torrents", "Deluge Fleet Downloading Torrents", None, "mdi:download"),
+    ("seeding_torrents", "Deluge Fleet Seeding Torrents", None, "mdi:upload"),
+)
+
+class DelugeFleetSensor(SensorEntity):
+    """Total of one value across every configured Deluge daemon."""
+
+    def __init__(self, fleet, key: str, name: str, unit: str | None, icon: str):
+        """Initialize the sensor."""
+        self.fleet = fleet
+        self._key = key
+        self._attr_should_poll = False
+        self._attr_name = name
+        self._attr_unique_id = f"{DOMAIN}_fleet_{key}"
+        self._attr_native_unit_of_measurement = unit
+        self._attr_icon = icon
+        if unit == "kB/s":
+            self._attr_device_class = SensorDeviceClass.DATA_RATE
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, "fleet")},
+            "name": "Deluge Fleet",
+            "manufacturer": "Deluge",
+            "model": "Aggregate",
+        }
+
+    async def async_added_to_hass(self):
+        """Follow fleet recomputes."""
+        self.async_on_remove(self.fleet.async_add_listener(self.async_write_ha_state))
+
+    @property
+    def available(self):
+        """Return True while at least one daemon reports data."""
+        return self.fleet.data["daemons_connected"] > 0
+
+    @property
+    def native_value(self):
+        """Return the fleet total."""
+        value = self.fleet.data[self._key]
+        if self._attr_native_unit_of_measurement == "kB/s":
+            return round(value / 1024, 2) if value > 0 else 0
+        return value
+
+    @property
+    def extra_state_attributes(self):
+        """Return how many daemons the total covers."""
+        return {
+            "daemons": self.fleet.data["daemons"],
+            "daemons_connected": self.fleet.data["daemons_connected"],
+        }
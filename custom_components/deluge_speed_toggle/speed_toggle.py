@@ -1,13 +1,20 @@
 import logging
-import asyncio
-import aiohttp
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
 from homeassistant.components.switch import SwitchEntity, SwitchDeviceClass
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from .api import DelugeApiError, DelugeAuthError
+from .fetch import TorrentFetchError
+from .models import VersionedCache
+from .controller import CONTROLLER_SCHEMA
+from .policy import POLICIES_SCHEMA
+from .profiles import PROFILES_SCHEMA
+from .schedule import SCHEDULE_SCHEMA
 from .const import (
     DOMAIN,
+    CONF_PROFILES,
     CONF_PRESET1_DOWNLOAD,
     CONF_PRESET1_UPLOAD,
     CONF_PRESET2_DOWNLOAD,
@@ -20,29 +27,101 @@ from .const import (
 
 _LOGGER = logging.getLogger(__name__)
 
+# Torrent status keys behind the switch's torrent_list, and the record fields shown
+SWITCH_TORRENT_KEYS = ("name", "state", "progress", "download_payload_rate", "upload_payload_rate")
+SWITCH_TORRENT_FIELDS = ("id", "name", "state", "progress", "download_rate", "upload_rate")
+
+SERVICES = (
+    "set_speed",
+    "toggle_download_speed",
+    "test_connection",
+    "test_api",
+    "add_torrent",
+    "remove_torrent",
+    "pause_torrent",
+    "resume_torrent",
+    "pause_torrents",
+    "resume_torrents",
+    "remove_torrents",
+    "set_schedule",
+    "set_profiles",
+    "set_policies",
+    "set_controller",
+)
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback):
     """Set up switch platform from a config entry."""
     _LOGGER.debug("Setting up Deluge Speed switch entity")
     config = entry.data
-    switch = DelugeSpeedToggleSwitch(hass, config)
+    data = hass.data[DOMAIN][entry.entry_id]
+    switch = DelugeSpeedToggleSwitch(
+        hass,
+        config,
+        data["client"],
+        data["coordinator"],
+        data["pipeline"],
+    )
     async_add_entities([switch])
     _LOGGER.info("Deluge Speed switch entity added")
 
+async def _async_boost_polling(data: dict) -> None:
+    """Ask the entry's coordinator to poll fast after a speed change."""
+    await data["coordinator"].async_boost()
+
+def _entry_data(hass: HomeAssistant, call: ServiceCall) -> dict:
+    """Return the hass.data of the Deluge entry a service call targets.
+
+    The target is ``entry_id`` or ``device_id``; it may be omitted while
+    only one Deluge daemon is configured.
+    """
+    entries = hass.data.get(DOMAIN, {})
+    entry_id = call.data.get("entry_id")
+    device_id = call.data.get("device_id")
+    if device_id:
+        device = dr.async_get(hass).async_get(device_id)
+        config_entry_ids = device.config_entries if device else ()
+        entry_id = next((candidate for candidate in config_entry_ids if candidate in entries), None)
+        if entry_id is None:
+            raise HomeAssistantError(f"Device {device_id} is not a Deluge daemon")
+    if entry_id:
+        if entry_id not in entries:
+            raise HomeAssistantError(f"Deluge entry {entry_id} is not loaded")
+        return entries[entry_id]
+    if len(entries) == 1:
+        return next(iter(entries.values()))
+    if not entries:
+        raise HomeAssistantError("No Deluge daemon is configured")
+    raise HomeAssistantError("Several Deluge daemons are configured; pass entry_id or device_id")
+
+def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove the domain services once the last entry is unloaded."""
+    for service in SERVICES:
+        hass.services.async_remove(DOMAIN, service)
+
 async def async_setup_services(hass: HomeAssistant):
+    """Register the domain services once; every call picks its target entry."""
     import voluptuous as vol
     from homeassistant.helpers import config_validation as cv
     
+    if hass.services.has_service(DOMAIN, "set_speed"):
+        return
+    
+    # Every service accepts a target entry or device
+    TARGET_FIELDS = {
+        vol.Optional("entry_id"): cv.string,
+        vol.Optional("device_id"): cv.string,
+    }
+    
     # Service schema for set_speed
     SET_SPEED_SCHEMA = vol.Schema({
+        **TARGET_FIELDS,
         vol.Required("download"): int,
         vol.Required("upload"): int,
     })
 
-    async def handle_set_speed(call: ServiceCall):
-        config = hass.data[DOMAIN]
-        host = config["host"]
-        port = config["port"]
-        password = config["password"]
+    async def handle_set_speed(call: ServiceCall) -> ServiceResponse:
+        data = _entry_data(hass, call)
+        pipeline = data["pipeline"]
 
         download = call.data["download"]
         upload = call.data["upload"]
@@ -53,106 +132,45 @@ async def async_setup_services(hass: HomeAssistant):
                 download,
                 upload,
             )
-            
-            async with aiohttp.ClientSession(cookie_jar=aiohttp.CookieJar()) as session:
-                # Authenticate
-                try:
-                    async with session.post(
-                        f"http://{host}:{port}/json",
-                        json={"method": "auth.login", "params": [password], "id": 1},
-                        timeout=aiohttp.ClientTimeout(total=10),
-                    ) as resp:
-                        if resp.status != 200:
-                            _LOGGER.error(
-                                "Deluge authentication failed with status %s", resp.status
-                            )
-                            raise HomeAssistantError(
-                                f"Deluge authentication failed: HTTP {resp.status}"
-                            )
-                        
-                        result = await resp.json()
-                        if not result.get("result"):
-                            _LOGGER.error(
-                                "Deluge authentication failed: Invalid response - %s",
-                                result,
-                            )
-                            raise HomeAssistantError(
-                                "Deluge authentication failed: Invalid password or connection"
-                            )
-                        _LOGGER.debug("Successfully authenticated with Deluge")
-                
-                except asyncio.TimeoutError:
-                    _LOGGER.error("Deluge authentication timeout")
-                    raise HomeAssistantError("Deluge connection timeout")
-                except aiohttp.ClientError as err:
-                    _LOGGER.error("Deluge connection error: %s", err)
-                    raise HomeAssistantError(f"Deluge connection error: {err}")
-
-                # Set speed
-                try:
-                    async with session.post(
-                        f"http://{host}:{port}/json",
-                        json={
-                            "method": "core.set_config",
-                            "params": [
-                                {
-                                    "max_download_speed": download,
-                                    "max_upload_speed": upload,
-                                }
-                            ],
-                            "id": 2,
-                        },
-                        timeout=aiohttp.ClientTimeout(total=10),
-                    ) as resp:
-                        if resp.status != 200:
-                            _LOGGER.error(
-                                "Failed to set speeds: HTTP %s", resp.status
-                            )
-                            raise HomeAssistantError(
-                                f"Failed to set speeds: HTTP {resp.status}"
-                            )
-                        
-                        result = await resp.json()
-                        if result.get("error"):
-                            _LOGGER.error(
-                                "Deluge set_config error: %s", result.get("error")
-                            )
-                            raise HomeAssistantError(
-                                f"Deluge error: {result.get('error')}"
-                            )
-                        _LOGGER.info(
-                            "Successfully set Deluge speeds - Download: %s, Upload: %s",
-                            download,
-                            upload,
-                        )
-                
-                except asyncio.TimeoutError:
-                    _LOGGER.error("Deluge speed set timeout")
-                    raise HomeAssistantError("Deluge connection timeout")
-                except aiohttp.ClientError as err:
-                    _LOGGER.error("Deluge error when setting speeds: %s", err)
-                    raise HomeAssistantError(f"Deluge error: {err}")
+            # Coalesced with other requests in the same burst; no-op writes are skipped
+            applied = await pipeline.async_set_speed(download, upload)
+            _LOGGER.info(
+                "Successfully set Deluge speeds - Download: %s, Upload: %s",
+                applied["max_download_speed"],
+                applied["max_upload_speed"],
+            )
+            await _async_boost_polling(data)
+            return applied
 
-        except HomeAssistantError:
+        except HomeAssistantError as err:
+            _LOGGER.error("Failed to set Deluge speeds: %s", err)
             raise
         except Exception as err:
             _LOGGER.error("Unexpected error setting Deluge speeds: %s", err)
             raise HomeAssistantError(f"Unexpected error: {err}")
 
     # Register services
-    hass.services.async_register(DOMAIN, "set_speed", handle_set_speed, schema=SET_SPEED_SCHEMA)
+    hass.services.async_register(
+        DOMAIN,
+        "set_speed",
+        handle_set_speed,
+        schema=SET_SPEED_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
     _LOGGER.debug("Registered deluge_speed_toggle.set_speed service")
     
     # Register toggle service 
     async def handle_toggle_speed(call: ServiceCall):
         """Handle toggle_download_speed service call."""
         # Find the switch entity and toggle it
-        # Find the switch entity dynamically since unique_id now includes host/port
-        config = hass.data[DOMAIN]
+        # Look the entity up by unique_id, which includes host/port
+        config = _entry_data(hass, call)["config"]
         host = config.get("host", "localhost")
         port = config.get("port", 8112)
-        switch_entity_id = f"switch.{DOMAIN}_{host}_{port}_switch"
-        switch_state = hass.states.get(switch_entity_id)
+        switch_entity_id = er.async_get(hass).async_get_entity_id(
+            "switch", DOMAIN, f"{DOMAIN}_{host}_{port}_switch"
+        )
+        switch_state = hass.states.get(switch_entity_id) if switch_entity_id else None
         
         if switch_state is None:
             _LOGGER.error("Deluge speed toggle switch not found")
@@ -169,28 +187,15 @@ async def async_setup_services(hass: HomeAssistant):
     # Add diagnostic service
     async def handle_test_connection(call: ServiceCall):
         """Test connection to Deluge."""
-        config = hass.data[DOMAIN]
-        host = config["host"]
-        port = config["port"]
-        password = config["password"]
+        client = _entry_data(hass, call)["client"]
         
         try:
-            _LOGGER.info("Testing Deluge connection to %s:%s", host, port)
-            async with aiohttp.ClientSession(cookie_jar=aiohttp.CookieJar()) as session:
-                async with session.post(
-                    f"http://{host}:{port}/json",
-                    json={"method": "auth.login", "params": [password], "id": 1},
-                    timeout=aiohttp.ClientTimeout(total=10),
-                ) as resp:
-                    if resp.status != 200:
-                        _LOGGER.error("Connection test failed: HTTP %s", resp.status)
-                        return
-                    
-                    result = await resp.json()
-                    if result.get("result"):
-                        _LOGGER.info("✅ Deluge connection test SUCCESSFUL")
-                    else:
-                        _LOGGER.error("❌ Deluge authentication failed")
+            _LOGGER.info("Testing Deluge connection to %s:%s", client.host, client.port)
+            # Explicit login so the test really checks the password
+            await client.async_login()
+            _LOGGER.info("✅ Deluge connection test SUCCESSFUL")
+        except DelugeAuthError:
+            _LOGGER.error("❌ Deluge authentication failed")
         except Exception as err:
             _LOGGER.error("❌ Deluge connection test FAILED: %s", err)
     
@@ -200,66 +205,50 @@ async def async_setup_services(hass: HomeAssistant):
     # Add API diagnostic service
     async def handle_test_api(call: ServiceCall):
         """Test various Deluge API methods to see what works."""
-        config = hass.data[DOMAIN]
-        host = config["host"]
-        port = config["port"]
-        password = config["password"]
+        client = _entry_data(hass, call)["client"]
         
         try:
             _LOGGER.info("Testing Deluge API methods...")
-            connector = aiohttp.TCPConnector()
-            cookie_jar = aiohttp.CookieJar(unsafe=True)
             
-            async with aiohttp.ClientSession(
-                connector=connector, 
-                cookie_jar=cookie_jar,
-                timeout=aiohttp.ClientTimeout(total=10)
-            ) as session:
-                
-                # Authenticate first
-                auth_response = await session.post(
-                    f"http://{host}:{port}/json",
-                    json={"method": "auth.login", "params": [password], "id": 1}
-                )
+            # Authenticate first
+            try:
+                await client.async_login()
+            except DelugeAuthError as err:
+                _LOGGER.error("❌ API Test: Authentication failed - %s", err)
+                return
                 
-                auth_result = await auth_response.json()
-                if not auth_result.get("result"):
-                    _LOGGER.error("❌ API Test: Authentication failed - %s", auth_result)
-                    return
+            _LOGGER.info("✅ API Test: Authentication successful")
+            
+            # Test different API methods with authenticated session and correct parameters
+            test_calls = [
+                {"method": "daemon.get_method_list", "params": []},
+                {"method": "core.get_session_status", "params": [["download_rate", "upload_rate"]]}, 
+                {"method": "core.get_torrents_status", "params": [{}, ["name", "state", "progress"]]},
+                {"method": "core.get_config", "params": []}
+            ]
+            
+            for test_call in test_calls:
+                method = test_call["method"]
+                try:
+                    result = await client.async_call(method, *test_call["params"])
+                    stats = client.metrics.methods[method]
+                    _LOGGER.info(
+                        "✅ API Test: %s works - returned %d bytes in %.1f ms",
+                        method, stats.last_bytes, stats.last_ms,
+                    )
+                    if method == "daemon.get_method_list":
+                        methods = result or []
+                        _LOGGER.info("📋 Available methods: %s", methods[:10])  # Show first 10
+                    elif method == "core.get_session_status":
+                        session_data = result or {}
+                        _LOGGER.info("📊 Session stats: download=%s, upload=%s", 
+                                   session_data.get("download_rate", 0),
+                                   session_data.get("upload_rate", 0))
+                except DelugeApiError as err:
+                    _LOGGER.warning("⚠️  API Test: %s returned error: %s", method, err)
+                except Exception as err:
+                    _LOGGER.error("❌ API Test: %s failed: %s", method, err)
                     
-                _LOGGER.info("✅ API Test: Authentication successful")
-                
-                # Test different API methods with authenticated session and correct parameters
-                test_calls = [
-                    {"method": "daemon.get_method_list", "params": []},
-                    {"method": "core.get_session_status", "params": [["download_rate", "upload_rate"]]}, 
-                    {"method": "core.get_torrents_status", "params": [{}, ["name", "state", "progress"]]},
-                    {"method": "core.get_config", "params": []}
-                ]
-                
-                for test_call in test_calls:
-                    method = test_call["method"]
-                    try:
-                        response = await session.post(
-                            f"http://{host}:{port}/json",
-                            json={"method": method, "params": test_call["params"], "id": 2}
-                        )
-                        result = await response.json()
-                        if result.get("error"):
-                            _LOGGER.warning("⚠️  API Test: %s returned error: %s", method, result.get("error"))
-                        else:
-                            _LOGGER.info("✅ API Test: %s works - returned %d bytes", method, len(str(result)))
-                            if method == "daemon.get_method_list":
-                                methods = result.get("result", [])
-                                _LOGGER.info("📋 Available methods: %s", methods[:10])  # Show first 10
-                            elif method == "core.get_session_status":
-                                session_data = result.get("result", {})
-                                _LOGGER.info("📊 Session stats: download=%s, upload=%s", 
-                                           session_data.get("download_rate", 0),
-                                           session_data.get("upload_rate", 0))
-                    except Exception as err:
-                        _LOGGER.error("❌ API Test: %s failed: %s", method, err)
-                        
         except Exception as err:
             _LOGGER.error("❌ API Test failed: %s", err)
     
@@ -269,10 +258,8 @@ async def async_setup_services(hass: HomeAssistant):
     # Add torrent management services
     async def handle_add_torrent(call: ServiceCall):
         """Add torrent to Deluge from magnet link or torrent file."""
-        config = hass.data[DOMAIN]
-        host = config["host"]
-        port = config["port"]
-        password = config["password"]
+        data = _entry_data(hass, call)
+        client = data["client"]
         
         magnet_link = call.data.get("magnet_link")
         torrent_url = call.data.get("torrent_url")
@@ -283,97 +270,45 @@ async def async_setup_services(hass: HomeAssistant):
             _LOGGER.error("No torrent source provided (magnet_link, torrent_url, or torrent_data required)")
             return
         
+        options = {}
+        if download_location:
+            options["download_location"] = download_location
+        
         try:
-            connector = aiohttp.TCPConnector()
-            cookie_jar = aiohttp.CookieJar(unsafe=True)
-            
-            async with aiohttp.ClientSession(
-                connector=connector,
-                cookie_jar=cookie_jar,
-                timeout=aiohttp.ClientTimeout(total=30)
-            ) as session:
-                
-                # Authenticate
-                auth_response = await session.post(
-                    f"http://{host}:{port}/json",
-                    json={"method": "auth.login", "params": [password], "id": 1}
+            # Add torrent based on source type
+            if magnet_link:
+                # Add magnet link
+                result = await client.async_call(
+                    "core.add_torrent_magnet", magnet_link, options, timeout=30
                 )
                 
-                auth_result = await auth_response.json()
-                if not auth_result.get("result"):
-                    _LOGGER.error("Authentication failed for add_torrent: %s", auth_result)
-                    return
+            elif torrent_url:
+                # Download (streamed, size-capped, cached) and add torrent from URL
+                torrent_b64 = await data["fetcher"].async_fetch_b64(torrent_url)
                 
-                # Add torrent based on source type
-                if magnet_link:
-                    # Add magnet link
-                    options = {}
-                    if download_location:
-                        options["download_location"] = download_location
-                    
-                    response = await session.post(
-                        f"http://{host}:{port}/json",
-                        json={
-                            "method": "core.add_torrent_magnet",
-                            "params": [magnet_link, options],
-                            "id": 2
-                        }
-                    )
-                    result = await response.json()
-                    
-                elif torrent_url:
-                    # Download and add torrent from URL
-                    import base64
-                    torrent_response = await session.get(torrent_url)
-                    torrent_bytes = await torrent_response.read()
-                    torrent_b64 = base64.b64encode(torrent_bytes).decode()
-                    
-                    options = {}
-                    if download_location:
-                        options["download_location"] = download_location
-                    
-                    response = await session.post(
-                        f"http://{host}:{port}/json",
-                        json={
-                            "method": "core.add_torrent_file",
-                            "params": [None, torrent_b64, options],
-                            "id": 2
-                        }
-                    )
-                    result = await response.json()
-                    
-                elif torrent_data:
-                    # Add torrent from base64 data
-                    options = {}
-                    if download_location:
-                        options["download_location"] = download_location
-                    
-                    response = await session.post(
-                        f"http://{host}:{port}/json",
-                        json={
-                            "method": "core.add_torrent_file", 
-                            "params": [None, torrent_data, options],
-                            "id": 2
-                        }
-                    )
-                    result = await response.json()
+                result = await client.async_call(
+                    "core.add_torrent_file", None, torrent_b64, options, timeout=30
+                )
                 
-                if result.get("error"):
-                    _LOGGER.error("Failed to add torrent: %s", result.get("error"))
-                elif result.get("result"):
-                    _LOGGER.info("Successfully added torrent: %s", result.get("result"))
-                else:
-                    _LOGGER.warning("Torrent add result unclear: %s", result)
-                    
+            elif torrent_data:
+                # Add torrent from base64 data
+                result = await client.async_call(
+                    "core.add_torrent_file", None, torrent_data, options, timeout=30
+                )
+            
+            if result:
+                _LOGGER.info("Successfully added torrent: %s", result)
+            else:
+                _LOGGER.warning("Torrent add result unclear: %s", result)
+                
+        except (DelugeApiError, TorrentFetchError) as err:
+            _LOGGER.error("Failed to add torrent: %s", err)
         except Exception as err:
             _LOGGER.error("Error adding torrent: %s", err)
     
     async def handle_remove_torrent(call: ServiceCall):
         """Remove torrent from Deluge."""
-        config = hass.data[DOMAIN]
-        host = config["host"]
-        port = config["port"]
-        password = config["password"]
+        client = _entry_data(hass, call)["client"]
         
         torrent_id = call.data.get("torrent_id")
         remove_data = call.data.get("remove_data", False)
@@ -383,53 +318,21 @@ async def async_setup_services(hass: HomeAssistant):
             return
         
         try:
-            connector = aiohttp.TCPConnector()
-            cookie_jar = aiohttp.CookieJar(unsafe=True)
+            result = await client.async_call("core.remove_torrent", torrent_id, remove_data)
             
-            async with aiohttp.ClientSession(
-                connector=connector,
-                cookie_jar=cookie_jar, 
-                timeout=aiohttp.ClientTimeout(total=10)
-            ) as session:
-                
-                # Authenticate
-                auth_response = await session.post(
-                    f"http://{host}:{port}/json",
-                    json={"method": "auth.login", "params": [password], "id": 1}
-                )
-                
-                auth_result = await auth_response.json()
-                if not auth_result.get("result"):
-                    _LOGGER.error("Authentication failed for remove_torrent: %s", auth_result)
-                    return
-                
-                # Remove torrent
-                response = await session.post(
-                    f"http://{host}:{port}/json",
-                    json={
-                        "method": "core.remove_torrent",
-                        "params": [torrent_id, remove_data],
-                        "id": 2
-                    }
-                )
-                result = await response.json()
+            if result:
+                _LOGGER.info("Successfully removed torrent %s (remove_data=%s)", torrent_id, remove_data)
+            else:
+                _LOGGER.warning("Torrent remove result unclear: %s", result)
                 
-                if result.get("error"):
-                    _LOGGER.error("Failed to remove torrent: %s", result.get("error"))
-                elif result.get("result"):
-                    _LOGGER.info("Successfully removed torrent %s (remove_data=%s)", torrent_id, remove_data)
-                else:
-                    _LOGGER.warning("Torrent remove result unclear: %s", result)
-                    
+        except DelugeApiError as err:
+            _LOGGER.error("Failed to remove torrent: %s", err)
         except Exception as err:
             _LOGGER.error("Error removing torrent: %s", err)
     
     async def handle_pause_torrent(call: ServiceCall):
         """Pause torrent in Deluge."""
-        config = hass.data[DOMAIN]
-        host = config["host"]
-        port = config["port"] 
-        password = config["password"]
+        client = _entry_data(hass, call)["client"]
         
         torrent_id = call.data.get("torrent_id")
         
@@ -438,53 +341,18 @@ async def async_setup_services(hass: HomeAssistant):
             return
         
         try:
-            connector = aiohttp.TCPConnector()
-            cookie_jar = aiohttp.CookieJar(unsafe=True)
-            
-            async with aiohttp.ClientSession(
-                connector=connector,
-                cookie_jar=cookie_jar,
-                timeout=aiohttp.ClientTimeout(total=10)
-            ) as session:
-                
-                # Authenticate
-                auth_response = await session.post(
-                    f"http://{host}:{port}/json",
-                    json={"method": "auth.login", "params": [password], "id": 1}
-                )
-                
-                auth_result = await auth_response.json()
-                if not auth_result.get("result"):
-                    _LOGGER.error("Authentication failed for pause_torrent: %s", auth_result)
-                    return
-                
-                # Pause torrent
-                response = await session.post(
-                    f"http://{host}:{port}/json",
-                    json={
-                        "method": "core.pause_torrent",
-                        "params": [[torrent_id]],  # Expects list of torrent IDs
-                        "id": 2
-                    }
-                )
-                result = await response.json()
+            # Expects list of torrent IDs
+            await client.async_call("core.pause_torrent", [torrent_id])
+            _LOGGER.info("Successfully paused torrent %s", torrent_id)
                 
-                if result.get("error"):
-                    _LOGGER.error("Failed to pause torrent: %s", result.get("error"))
-                elif result.get("result") is not None:
-                    _LOGGER.info("Successfully paused torrent %s", torrent_id)
-                else:
-                    _LOGGER.warning("Torrent pause result unclear: %s", result)
-                    
+        except DelugeApiError as err:
+            _LOGGER.error("Failed to pause torrent: %s", err)
         except Exception as err:
             _LOGGER.error("Error pausing torrent: %s", err)
     
     async def handle_resume_torrent(call: ServiceCall):
         """Resume paused torrent in Deluge."""
-        config = hass.data[DOMAIN]
-        host = config["host"]
-        port = config["port"]
-        password = config["password"]
+        client = _entry_data(hass, call)["client"]
         
         torrent_id = call.data.get("torrent_id")
         
@@ -493,70 +361,200 @@ async def async_setup_services(hass: HomeAssistant):
             return
         
         try:
-            connector = aiohttp.TCPConnector()
-            cookie_jar = aiohttp.CookieJar(unsafe=True)
-            
-            async with aiohttp.ClientSession(
-                connector=connector,
-                cookie_jar=cookie_jar,
-                timeout=aiohttp.ClientTimeout(total=10)
-            ) as session:
-                
-                # Authenticate 
-                auth_response = await session.post(
-                    f"http://{host}:{port}/json",
-                    json={"method": "auth.login", "params": [password], "id": 1}
-                )
-                
-                auth_result = await auth_response.json()
-                if not auth_result.get("result"):
-                    _LOGGER.error("Authentication failed for resume_torrent: %s", auth_result)
-                    return
-                
-                # Resume torrent
-                response = await session.post(
-                    f"http://{host}:{port}/json",
-                    json={
-                        "method": "core.resume_torrent",
-                        "params": [[torrent_id]],  # Expects list of torrent IDs
-                        "id": 2
-                    }
-                )
-                result = await response.json()
+            # Expects list of torrent IDs
+            await client.async_call("core.resume_torrent", [torrent_id])
+            _LOGGER.info("Successfully resumed torrent %s", torrent_id)
                 
-                if result.get("error"):
-                    _LOGGER.error("Failed to resume torrent: %s", result.get("error"))
-                elif result.get("result") is not None:
-                    _LOGGER.info("Successfully resumed torrent %s", torrent_id)
-                else:
-                    _LOGGER.warning("Torrent resume result unclear: %s", result)
-                    
+        except DelugeApiError as err:
+            _LOGGER.error("Failed to resume torrent: %s", err)
         except Exception as err:
             _LOGGER.error("Error resuming torrent: %s", err)
     
+    # Bulk variants: many hashes or a selector, resolved against coordinator data
+    BULK_SCHEMA = vol.Schema({
+        **TARGET_FIELDS,
+        vol.Optional("torrent_ids"): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional("label"): cv.string,
+        vol.Optional("state"): cv.string,
+        vol.Optional("tracker"): cv.string,
+        vol.Optional("ratio_above"): vol.Coerce(float),
+        vol.Optional("remove_data", default=False): cv.boolean,
+    })
+    
+    async def _select_torrents(data: dict, call: ServiceCall, service: str):
+        """Resolve the torrent_ids/selector fields of a bulk service call."""
+        selectors = {
+            key: call.data[key]
+            for key in ("torrent_ids", "label", "state", "tracker", "ratio_above")
+            if key in call.data
+        }
+        if not selectors:
+            _LOGGER.error("%s needs torrent_ids or a selector (label, state, tracker, ratio_above)", service)
+            return None
+        torrent_ids = await data["coordinator"].async_select_torrents(**selectors)
+        if not torrent_ids:
+            _LOGGER.info("%s: no torrents match %s", service, selectors)
+        return torrent_ids
+    
+    async def handle_pause_torrents(call: ServiceCall):
+        """Pause every torrent matching the given hashes or selector."""
+        data = _entry_data(hass, call)
+        torrent_ids = await _select_torrents(data, call, "pause_torrents")
+        if not torrent_ids:
+            return
+        try:
+            await data["client"].async_pause_torrents(torrent_ids)
+            _LOGGER.info("Successfully paused %d torrents", len(torrent_ids))
+            await _async_boost_polling(data)
+        except DelugeApiError as err:
+            _LOGGER.error("Failed to pause torrents: %s", err)
+        except Exception as err:
+            _LOGGER.error("Error pausing torrents: %s", err)
+    
+    async def handle_resume_torrents(call: ServiceCall):
+        """Resume every torrent matching the given hashes or selector."""
+        data = _entry_data(hass, call)
+        torrent_ids = await _select_torrents(data, call, "resume_torrents")
+        if not torrent_ids:
+            return
+        try:
+            await data["client"].async_resume_torrents(torrent_ids)
+            _LOGGER.info("Successfully resumed %d torrents", len(torrent_ids))
+            await _async_boost_polling(data)
+        except DelugeApiError as err:
+            _LOGGER.error("Failed to resume torrents: %s", err)
+        except Exception as err:
+            _LOGGER.error("Error resuming torrents: %s", err)
+    
+    async def handle_remove_torrents(call: ServiceCall):
+        """Remove every torrent matching the given hashes or selector."""
+        data = _entry_data(hass, call)
+        torrent_ids = await _select_torrents(data, call, "remove_torrents")
+        if not torrent_ids:
+            return
+        remove_data = call.data["remove_data"]
+        try:
+            # Deluge reports torrents it could not remove instead of failing the call
+            failed = await data["client"].async_remove_torrents(torrent_ids, remove_data)
+            for torrent_id, error in failed.items():
+                _LOGGER.error("Failed to remove torrent %s: %s", torrent_id, error)
+            removed = len(torrent_ids) - len(failed)
+            if removed:
+                _LOGGER.info("Successfully removed %d torrents (remove_data=%s)", removed, remove_data)
+                await _async_boost_polling(data)
+            if failed:
+                _LOGGER.error("Could not remove %d of %d torrents", len(failed), len(torrent_ids))
+        except DelugeApiError as err:
+            _LOGGER.error("Failed to remove torrents: %s", err)
+        except Exception as err:
+            _LOGGER.error("Error removing torrents: %s", err)
+    
     # Register all torrent management services
     hass.services.async_register(DOMAIN, "add_torrent", handle_add_torrent)
     hass.services.async_register(DOMAIN, "remove_torrent", handle_remove_torrent)
     hass.services.async_register(DOMAIN, "pause_torrent", handle_pause_torrent)
     hass.services.async_register(DOMAIN, "resume_torrent", handle_resume_torrent)
+    hass.services.async_register(DOMAIN, "pause_torrents", handle_pause_torrents, schema=BULK_SCHEMA)
+    hass.services.async_register(DOMAIN, "resume_torrents", handle_resume_torrents, schema=BULK_SCHEMA)
+    hass.services.async_register(DOMAIN, "remove_torrents", handle_remove_torrents, schema=BULK_SCHEMA)
     
-    _LOGGER.debug("Registered torrent management services: add_torrent, remove_torrent, pause_torrent, resume_torrent")
+    _LOGGER.debug("Registered torrent management services: add_torrent, remove_torrent, pause_torrent, resume_torrent, pause_torrents, resume_torrents, remove_torrents")
+    
+    # Weekly bandwidth schedule, stored in the entry options
+    async def handle_set_schedule(call: ServiceCall) -> ServiceResponse:
+        """Replace the weekly schedule of a daemon and apply the current rule."""
+        schedule = _entry_data(hass, call)["schedule"]
+        rules = {key: call.data[key] for key in ("rules", "default") if key in call.data}
+        await schedule.async_set(rules)
+        return {
+            "active": schedule.active_target,
+            "next_transition": schedule.next_transition.isoformat() if schedule.next_transition else None,
+        }
+    
+    hass.services.async_register(
+        DOMAIN,
+        "set_schedule",
+        handle_set_schedule,
+        schema=SCHEDULE_SCHEMA.extend(TARGET_FIELDS),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    _LOGGER.debug("Registered deluge_speed_toggle.set_schedule service")
+    
+    # Named profiles behind the profile select, stored in the entry options
+    async def handle_set_profiles(call: ServiceCall) -> None:
+        """Replace the profiles offered by a daemon's profile select."""
+        data = _entry_data(hass, call)
+        entry = data["entry"]
+        hass.config_entries.async_update_entry(
+            entry, options={**entry.options, CONF_PROFILES: call.data["profiles"]}
+        )
+        # Push the new options and re-match the current profile
+        data["coordinator"].async_update_listeners()
+        _LOGGER.info("Stored %d Deluge profiles", len(call.data["profiles"]))
+    
+    hass.services.async_register(
+        DOMAIN,
+        "set_profiles",
+        handle_set_profiles,
+        schema=vol.Schema({**TARGET_FIELDS, vol.Required("profiles"): PROFILES_SCHEMA}),
+    )
+    _LOGGER.debug("Registered deluge_speed_toggle.set_profiles service")
+    
+    # Per-torrent bandwidth policies, stored in the entry options
+    async def handle_set_policies(call: ServiceCall) -> None:
+        """Replace the per-torrent policies of a daemon."""
+        data = _entry_data(hass, call)
+        await data["policy"].async_set(call.data["policies"])
+        # Reconcile against fresh records right away
+        await _async_boost_polling(data)
+        _LOGGER.info("Stored %d Deluge torrent policies", len(call.data["policies"]))
+    
+    hass.services.async_register(
+        DOMAIN,
+        "set_policies",
+        handle_set_policies,
+        schema=vol.Schema({**TARGET_FIELDS, vol.Required("policies"): POLICIES_SCHEMA}),
+    )
+    _LOGGER.debug("Registered deluge_speed_toggle.set_policies service")
+    
+    # Closed-loop limits against a WAN budget, stored in the entry options
+    async def handle_set_controller(call: ServiceCall) -> ServiceResponse:
+        """Configure (or, without budgets, turn off) the adaptive controller of a daemon."""
+        controller = _entry_data(hass, call)["controller"]
+        settings = {key: value for key, value in call.data.items() if key not in ("entry_id", "device_id")}
+        await controller.async_set(settings)
+        _LOGGER.info("Adaptive controller %s", "enabled" if controller.enabled else "disabled")
+        return {"enabled": controller.enabled}
+    
+    hass.services.async_register(
+        DOMAIN,
+        "set_controller",
+        handle_set_controller,
+        schema=CONTROLLER_SCHEMA.extend(TARGET_FIELDS),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    _LOGGER.debug("Registered deluge_speed_toggle.set_controller service")
 
 class DelugeSpeedToggleSwitch(SwitchEntity):
     """Switch to toggle between two presets of Deluge download/upload speeds."""
 
-    def __init__(self, hass: HomeAssistant, config: dict):
+    def __init__(self, hass: HomeAssistant, config: dict, client, coordinator, pipeline):
         """Initialize the switch."""
         self.hass = hass
         self.config = config
+        self.client = client
+        self.coordinator = coordinator
+        self.pipeline = pipeline
         self._attr_name = "Deluge Speed Toggle"
         host = config.get("host", "localhost")
         port = config.get("port", 8112)
         self._attr_unique_id = f"{DOMAIN}_{host}_{port}_switch"
         self._attr_device_class = SwitchDeviceClass.SWITCH
         self._is_on = False
-        self._attr_should_poll = True  # Enable polling to refresh attributes with sensor data
+        self._attr_should_poll = False  # Pushed by the coordinator instead
         self._available = True
+        self._attributes_cache = VersionedCache()
+        self._shown_data = None  # Fingerprint of the coordinator data last written
         
         # Add device info for better integration
         self._attr_device_info = {
@@ -572,6 +570,12 @@ class DelugeSpeedToggleSwitch(SwitchEntity):
     async def async_added_to_hass(self):
         """When entity is added to hass."""
         _LOGGER.info("Deluge Speed Toggle switch added to Home Assistant with ID: %s", self.unique_id)
+        self.async_on_remove(
+            self.coordinator.async_add_listener(self._handle_coordinator_update)
+        )
+        self.async_on_remove(self.coordinator.async_register_keys(SWITCH_TORRENT_KEYS))
+        self.coordinator.attribute_caches[self.unique_id] = self._attributes_cache
+        self.async_on_remove(lambda: self.coordinator.attribute_caches.pop(self.unique_id, None))
         # Restore previous state if available
         try:
             if (last_state := await self.async_get_last_state_with_restored_native_value()) is not None:
@@ -581,47 +585,20 @@ class DelugeSpeedToggleSwitch(SwitchEntity):
             # Fallback for different HA versions
             _LOGGER.debug("State restoration not available, will detect from Deluge")
         
-        # Test connection and detect current state on startup
-        try:
-            await self._test_connection()
+        # Detect current state from the bootstrap snapshot shared with the sensors
+        if await self.coordinator.async_bootstrap():
             _LOGGER.info("Initial Deluge connection test successful")
-            
             # Detect current Deluge speed settings to sync switch state
-            await self._detect_current_state()
-            
-        except Exception as err:
-            _LOGGER.warning("Initial Deluge connection/state detection failed: %s", err)
+            self._detect_current_state()
+        else:
+            _LOGGER.warning(
+                "Initial Deluge connection/state detection failed: %s",
+                self.coordinator.last_exception,
+            )
             self._available = False
 
-    async def _test_connection(self) -> bool:
-        """Test connection to Deluge without changing any settings."""
-        host = self.config.get("host", "localhost")
-        port = self.config.get("port", 8112)
-        password = self.config.get("password")
-        
-        _LOGGER.debug("Testing connection to Deluge at %s:%s", host, port)
-        
-        async with aiohttp.ClientSession(cookie_jar=aiohttp.CookieJar()) as session:
-            async with session.post(
-                f"http://{host}:{port}/json",
-                json={"method": "auth.login", "params": [password], "id": 1},
-                timeout=aiohttp.ClientTimeout(total=10),
-            ) as resp:
-                if resp.status != 200:
-                    raise HomeAssistantError(f"HTTP {resp.status}")
-                
-                result = await resp.json()
-                if not result.get("result"):
-                    raise HomeAssistantError("Authentication failed")
-                
-                return True
-
-    async def _detect_current_state(self):
+    def _detect_current_state(self):
         """Detect current Deluge speed settings and set switch state accordingly."""
-        host = self.config.get("host", "localhost")
-        port = self.config.get("port", 8112)
-        password = self.config.get("password")
-        
         preset1_download = self.config.get(CONF_PRESET1_DOWNLOAD, DEFAULT_PRESET1_DOWNLOAD)
         preset1_upload = self.config.get(CONF_PRESET1_UPLOAD, DEFAULT_PRESET1_UPLOAD)
         preset2_download = self.config.get(CONF_PRESET2_DOWNLOAD, DEFAULT_PRESET2_DOWNLOAD)
@@ -630,73 +607,52 @@ class DelugeSpeedToggleSwitch(SwitchEntity):
         _LOGGER.debug("Detecting current Deluge speed configuration...")
         
         try:
-            connector = aiohttp.TCPConnector()
-            cookie_jar = aiohttp.CookieJar(unsafe=True)
+            limits = self.coordinator.speed_limits()
+            if limits is None:
+                _LOGGER.warning("No Deluge config fetched yet to detect current state")
+                return
+            current_download, current_upload = limits
+            
+            _LOGGER.debug("Current Deluge config - Download: %s, Upload: %s", current_download, current_upload)
+            _LOGGER.debug("Preset 1 (Limited) - Download: %s, Upload: %s", preset1_download, preset1_upload)
+            _LOGGER.debug("Preset 2 (Unlimited) - Download: %s, Upload: %s", preset2_download, preset2_upload)
+            
+            # Determine which preset matches current settings
+            # On startup, do not adapt or update the config. Just log and set state to unknown/off.
+            self._is_on = self._state_for_limits(current_download, current_upload)
+            if self._is_on is None:
+                _LOGGER.info("Detected custom limited speeds in Deluge (Download: %s, Upload: %s) - Switch state unknown, will not adapt preset on startup", 
+                           current_download, current_upload)
+            else:
+                _LOGGER.info("Detected Deluge speeds - Switch %s", "ON" if self._is_on else "OFF")
+            # Update Home Assistant state
+            self.async_write_ha_state()
             
-            async with aiohttp.ClientSession(
-                connector=connector,
-                cookie_jar=cookie_jar,
-                timeout=aiohttp.ClientTimeout(total=10)
-            ) as session:
-                
-                # Authenticate
-                auth_response = await session.post(
-                    f"http://{host}:{port}/json",
-                    json={"method": "auth.login", "params": [password], "id": 1}
-                )
-                
-                auth_result = await auth_response.json()
-                if not auth_result.get("result"):
-                    _LOGGER.warning("Could not authenticate to detect current state")
-                    return
-                
-                # Get current config
-                config_response = await session.post(
-                    f"http://{host}:{port}/json",
-                    json={"method": "core.get_config", "params": [], "id": 2}
-                )
-                
-                config_result = await config_response.json()
-                if config_result.get("error"):
-                    _LOGGER.warning("Could not get config to detect current state: %s", config_result.get("error"))
-                    return
-                
-                # Convert to regular dict to avoid mappingproxy issues
-                current_config = dict(config_result.get("result", {}))
-                current_download = current_config.get("max_download_speed", -1)
-                current_upload = current_config.get("max_upload_speed", -1)
-                
-                _LOGGER.debug("Current Deluge config - Download: %s, Upload: %s", current_download, current_upload)
-                _LOGGER.debug("Preset 1 (Limited) - Download: %s, Upload: %s", preset1_download, preset1_upload)
-                _LOGGER.debug("Preset 2 (Unlimited) - Download: %s, Upload: %s", preset2_download, preset2_upload)
-                
-                # Determine which preset matches current settings
-                preset1_match = (current_download == preset1_download and current_upload == preset1_upload)
-                preset2_match = (current_download == preset2_download and current_upload == preset2_upload)
-                
-                if preset1_match:
-                    self._is_on = True
-                    _LOGGER.info("Detected Deluge is using Preset 1 (Limited) - Switch ON")
-                elif preset2_match:
-                    self._is_on = False
-                    _LOGGER.info("Detected Deluge is using Preset 2 (Unlimited) - Switch OFF")
-                else:
-                    # Current settings don't match either preset
-                    # On startup, do not adapt or update the config. Just log and set state to unknown/off.
-                    speeds_are_limited = (current_download != -1 or current_upload != -1)
-                    if speeds_are_limited:
-                        self._is_on = None  # Unknown state
-                        _LOGGER.info("Detected custom limited speeds in Deluge (Download: %s, Upload: %s) - Switch state unknown, will not adapt preset on startup", 
-                                   current_download, current_upload)
-                    else:
-                        self._is_on = False
-                        _LOGGER.info("Detected unlimited speeds - Switch OFF")
-                # Update Home Assistant state
-                self.async_write_ha_state()
-                
         except Exception as err:
             _LOGGER.warning("Could not detect current Deluge state: %s", err)
 
+    def _state_for_limits(self, download, upload):
+        """Return the switch state matching the given limits in KiB/s.
+
+        True for preset 1, False for preset 2 or no limits at all, and None
+        for custom limits that match neither preset.
+        """
+        preset1 = (
+            self.config.get(CONF_PRESET1_DOWNLOAD, DEFAULT_PRESET1_DOWNLOAD),
+            self.config.get(CONF_PRESET1_UPLOAD, DEFAULT_PRESET1_UPLOAD),
+        )
+        preset2 = (
+            self.config.get(CONF_PRESET2_DOWNLOAD, DEFAULT_PRESET2_DOWNLOAD),
+            self.config.get(CONF_PRESET2_UPLOAD, DEFAULT_PRESET2_UPLOAD),
+        )
+        if (download, upload) == preset1:
+            return True
+        if (download, upload) == preset2:
+            return False
+        if download != -1 or upload != -1:
+            return None
+        return False
+
     async def _save_adapted_preset(self, download_speed: int, upload_speed: int):
         """Save adapted preset speeds to config entry for persistence."""
         try:
@@ -740,9 +696,11 @@ class DelugeSpeedToggleSwitch(SwitchEntity):
         )
         
         try:
-            await self._set_speed(preset1_download, preset1_upload)
-            # Only set state to on if speed setting succeeded
-            self._is_on = True
+            applied = await self._set_speed(preset1_download, preset1_upload)
+            # Only set state once the write succeeded, from what a burst finally applied
+            self._is_on = self._state_for_limits(
+                applied["max_download_speed"], applied["max_upload_speed"]
+            )
             self._available = True
             self.async_write_ha_state()
             _LOGGER.info("Successfully switched to Preset 1 (Limited)")
@@ -772,9 +730,11 @@ class DelugeSpeedToggleSwitch(SwitchEntity):
         )
         
         try:
-            await self._set_speed(preset2_download, preset2_upload)
-            # Only set state to off if speed setting succeeded
-            self._is_on = False
+            applied = await self._set_speed(preset2_download, preset2_upload)
+            # Only set state once the write succeeded, from what a burst finally applied
+            self._is_on = self._state_for_limits(
+                applied["max_download_speed"], applied["max_upload_speed"]
+            )
             self._available = True
             self.async_write_ha_state()
             _LOGGER.info("Successfully switched to Preset 2 (Unlimited)")
@@ -789,285 +749,72 @@ class DelugeSpeedToggleSwitch(SwitchEntity):
             self._available = False
             self.async_write_ha_state()
 
-    async def _set_speed(self, download: int, upload: int) -> None:
-        """Set both download and upload speeds."""
-        host = self.config.get("host", "localhost")
-        port = self.config.get("port", 8112)
-        password = self.config.get("password")
-
-        if not password:
+    async def _set_speed(self, download: int, upload: int) -> dict:
+        """Set both download and upload speeds and return the limits applied."""
+        if not self.config.get("password"):
             _LOGGER.error("Deluge password not configured")
             raise HomeAssistantError("Deluge password not configured")
 
-        # New approach: Try to exactly mimic what curl does
+        # Coalesced with other requests in the same burst; no-op writes are skipped
         try:
-            _LOGGER.debug("Connecting to Deluge at %s:%s using curl-like approach", host, port)
-            
-            speed_config = {
-                "max_download_speed": download,
-                "max_upload_speed": upload,
-            }
-            
-            # Method 1: Use the simplest approach that mirrors curl exactly
-            timeout = aiohttp.ClientTimeout(total=30)  # Longer timeout like curl
-            headers = {
-                'Content-Type': 'application/json',
-                'User-Agent': 'HomeAssistant-DelugeSpeedToggle/1.0'
-            }
-            
-            # Try with explicit cookie jar and headers like curl
-            jar = aiohttp.CookieJar(unsafe=True)  # Allow all cookies
-            async with aiohttp.ClientSession(cookie_jar=jar, headers=headers, timeout=timeout) as session:
-                
-                # Step 1: Authenticate (exactly like curl)
-                auth_payload = {
-                    "method": "auth.login",
-                    "params": [password], 
-                    "id": 1
-                }
-                _LOGGER.debug("Auth payload: %s", {**auth_payload, "params": ["***"]})
-                
-                async with session.post(f"http://{host}:{port}/json", json=auth_payload) as auth_resp:
-                    auth_text = await auth_resp.text()
-                    _LOGGER.debug("Auth response status: %s, text: %s", auth_resp.status, auth_text)
-                    
-                    if auth_resp.status != 200:
-                        raise HomeAssistantError(f"Auth HTTP error: {auth_resp.status}")
-                    
-                    try:
-                        auth_result = await auth_resp.json()
-                    except:
-                        auth_result = {"result": False, "error": f"Invalid JSON: {auth_text}"}
-                    
-                    if not auth_result.get("result"):
-                        raise HomeAssistantError(f"Auth failed: {auth_result}")
-                    
-                    _LOGGER.debug("Authentication successful, cookies: %s", [str(c) for c in session.cookie_jar])
-                
-                # Step 2: Set config using authenticated session
-                config_payload = {
-                    "method": "core.set_config",
-                    "params": [speed_config],
-                    "id": 2
-                }
-                _LOGGER.debug("Config payload: %s", config_payload)
-                
-                async with session.post(f"http://{host}:{port}/json", json=config_payload) as config_resp:
-                    config_text = await config_resp.text()
-                    _LOGGER.debug("Config response status: %s, text: %s", config_resp.status, config_text)
-                    
-                    if config_resp.status != 200:
-                        raise HomeAssistantError(f"Config HTTP error: {config_resp.status}")
-                    
-                    try:
-                        config_result = await config_resp.json()
-                    except:
-                        config_result = {"error": f"Invalid JSON: {config_text}"}
-                    
-                    _LOGGER.debug("Config result: %s", config_result)
-                    
-                    if config_result.get("error"):
-                        error_info = config_result.get("error")
-                        if isinstance(error_info, dict):
-                            error_msg = error_info.get("message", str(error_info))
-                        else:
-                            error_msg = str(error_info)
-                        
-                        _LOGGER.error("Deluge returned error: %s", error_msg)
-                        
-                        # If authentication error, this might be a Deluge version/config issue
-                        if "not authenticated" in error_msg.lower():
-                            # Try one final approach - maybe Deluge needs different auth handling
-                            return await self._try_alternative_auth(host, port, password, speed_config)
-                        
-                        raise HomeAssistantError(f"Deluge error: {error_msg}")
-                    
-                    # Check for success - Deluge returns result: null for successful set_config
-                    if config_result.get("error") is None:
-                        _LOGGER.info("✅ Successfully set Deluge speeds: %s", speed_config)
-                        return
-                    else:
-                        _LOGGER.warning("Unexpected response format: %s", config_result)
-                        raise HomeAssistantError("Unexpected response from Deluge")
-
-        except HomeAssistantError:
+            _LOGGER.debug("Setting Deluge speeds on %s:%s", self.client.host, self.client.port)
+            applied = await self.pipeline.async_set_speed(download, upload)
+        except DelugeAuthError as err:
+            _LOGGER.error("Deluge rejected the password: %s", err)
             raise
-        except Exception as err:
-            _LOGGER.error("Curl-like approach failed: %s", err)
-            raise HomeAssistantError(f"All connection methods failed: {err}")
-
-    async def _set_speed_single_request(self, host: str, port: int, password: str, speed_config: dict) -> None:
-        """Alternative method: Single session with proper timing."""
-        try:
-            _LOGGER.debug("Using single session with timing approach")
-            
-            # Use single session but with proper request timing
-            connector = aiohttp.TCPConnector(keepalive_timeout=30, enable_cleanup_closed=True)
-            async with aiohttp.ClientSession(connector=connector) as session:
-                # Step 1: Authenticate
-                _LOGGER.debug("Authenticating for single session method")
-                async with session.post(
-                    f"http://{host}:{port}/json",
-                    json={"method": "auth.login", "params": [password], "id": 1},
-                    timeout=aiohttp.ClientTimeout(total=15),
-                ) as auth_resp:
-                    if auth_resp.status != 200:
-                        raise HomeAssistantError(f"Auth failed: HTTP {auth_resp.status}")
-                    
-                    auth_result = await auth_resp.json()
-                    _LOGGER.debug("Single session auth result: %s", auth_result)
-                    
-                    if not auth_result.get("result"):
-                        raise HomeAssistantError("Authentication failed in single session method")
-                
-                # Small delay to ensure session is established
-                await asyncio.sleep(0.2)
-                
-                # Step 2: Set config using authenticated session
-                _LOGGER.debug("Setting config in authenticated session")
-                async with session.post(
-                    f"http://{host}:{port}/json",
-                    json={
-                        "method": "core.set_config",
-                        "params": [speed_config],
-                        "id": 2,
-                    },
-                    timeout=aiohttp.ClientTimeout(total=15),
-                ) as config_resp:
-                    if config_resp.status != 200:
-                        raise HomeAssistantError(f"Config failed: HTTP {config_resp.status}")
-                    
-                    config_result = await config_resp.json()
-                    _LOGGER.debug("Single session config result: %s", config_result)
-                    
-                    if config_result.get("error"):
-                        error_info = config_result.get("error")
-                        error_msg = error_info.get("message") if isinstance(error_info, dict) else str(error_info)
-                        
-                        # If still getting auth errors, try one more time with fresh approach
-                        if "not authenticated" in error_msg.lower():
-                            _LOGGER.warning("Still getting auth errors, trying completely fresh session")
-                            return await self._set_speed_fresh_session(host, port, password, speed_config)
-                        
-                        raise HomeAssistantError(f"Speed setting failed: {error_msg}")
-                    
-                    _LOGGER.info("Successfully set speeds using single session method")
-        
-        except HomeAssistantError:
-            raise
-        except Exception as err:
-            _LOGGER.error("Single session method failed: %s", err)
-            raise HomeAssistantError(f"Could not set Deluge speeds: {err}")
-
-    async def _set_speed_fresh_session(self, host: str, port: int, password: str, speed_config: dict) -> None:
-        """Final fallback: Completely separate sessions."""
-        _LOGGER.debug("Using completely fresh sessions approach (last resort)")
-        
-        # Method: Each API call gets its own session (most compatible but inefficient)
-        for attempt in range(2):  # Try twice
-            try:
-                # Fresh session just for config setting
-                async with aiohttp.ClientSession() as session:
-                    # Authenticate
-                    async with session.post(
-                        f"http://{host}:{port}/json",
-                        json={"method": "auth.login", "params": [password], "id": 1},
-                        timeout=aiohttp.ClientTimeout(total=10),
-                    ) as auth_resp:
-                        auth_result = await auth_resp.json()
-                        if not auth_result.get("result"):
-                            raise HomeAssistantError("Fresh session auth failed")
-                    
-                    # Tiny delay
-                    await asyncio.sleep(0.05)
-                    
-                    # Set config immediately
-                    async with session.post(
-                        f"http://{host}:{port}/json",
-                        json={
-                            "method": "core.set_config",
-                            "params": [speed_config],
-                            "id": 2,
-                        },
-                        timeout=aiohttp.ClientTimeout(total=10),
-                    ) as config_resp:
-                        config_result = await config_resp.json()
-                        if config_result.get("error"):
-                            error_msg = config_result.get("error").get("message", "Unknown error")
-                            if "not authenticated" in error_msg.lower() and attempt == 0:
-                                _LOGGER.warning("Attempt %d failed, retrying...", attempt + 1)
-                                await asyncio.sleep(0.5)  # Wait longer before retry
-                                continue
-                            raise HomeAssistantError(f"Fresh session config failed: {error_msg}")
-                        
-                        _LOGGER.info("Successfully set speeds using fresh sessions method")
-                        return  # Success!
-                        
-            except HomeAssistantError:
-                if attempt == 1:  # Last attempt
-                    raise
-                _LOGGER.warning("Fresh session attempt %d failed, retrying...", attempt + 1)
-                await asyncio.sleep(1.0)
-            except Exception as err:
-                if attempt == 1:
-                    raise HomeAssistantError(f"Fresh session method failed: {err}")
-                _LOGGER.warning("Fresh session attempt %d error: %s, retrying...", attempt + 1, err)
-                await asyncio.sleep(1.0)
-
-    async def _try_alternative_auth(self, host: str, port: int, password: str, speed_config: dict) -> None:
-        """Try alternative authentication methods that some Deluge setups might need."""
-        _LOGGER.debug("Trying alternative authentication approach")
-        
-        # Some Deluge versions might need different auth approach
-        try:
-            # Method: Try without cookies, just basic HTTP
-            timeout = aiohttp.ClientTimeout(total=15)
-            
-            # Try 1: Basic approach without any session management
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                
-                # Test 1: Maybe we need to call auth differently
-                auth_data = {"method": "auth.login", "params": [password], "id": 1}
-                
-                async with session.post(f"http://{host}:{port}/json", json=auth_data) as resp:
-                    result = await resp.json()
-                    _LOGGER.debug("Alt auth result: %s", result)
-                    
-                    if result.get("result"):
-                        # Try setting config immediately in same request cycle
-                        config_data = {"method": "core.set_config", "params": [speed_config], "id": 2}
-                        
-                        async with session.post(f"http://{host}:{port}/json", json=config_data) as config_resp:
-                            config_result = await config_resp.json()
-                            _LOGGER.debug("Alt config result: %s", config_result)
-                            
-                            if not config_result.get("error"):
-                                _LOGGER.info("✅ Alternative auth method succeeded!")
-                                return
-                            else:
-                                raise HomeAssistantError(f"Alt method failed: {config_result.get('error')}")
-                    else:
-                        raise HomeAssistantError("Alternative auth failed")
-        
-        except Exception as err:
-            _LOGGER.error("Alternative auth method also failed: %s", err)
-            # Final message to user
+        except DelugeApiError as err:
+            _LOGGER.error("Deluge returned error: %s", err)
             raise HomeAssistantError(
-                f"All authentication methods failed. This may be a Deluge configuration issue. "
-                f"Please verify that:\n"
+                f"Could not set Deluge speeds: {err}. Please verify that:\n"
                 f"1. Deluge daemon is running\n"
-                f"2. Web UI is accessible at http://{host}:{port}\n"
+                f"2. Web UI is accessible at http://{self.client.host}:{self.client.port}\n"
                 f"3. Password is correct\n"
                 f"4. No firewall is blocking the connection"
-            )
+            ) from err
+        except Exception as err:
+            _LOGGER.error("Unexpected error setting Deluge speeds: %s", err)
+            raise HomeAssistantError(f"Could not set Deluge speeds: {err}") from err
 
-    async def async_update(self):
-        """Update the switch state and refresh attributes from sensor data."""
-        # The state itself doesn't change from sensors, but this ensures 
-        # attributes are refreshed regularly to show current torrent data
-        _LOGGER.debug("Refreshing switch attributes from sensor data")
-        # The extra_state_attributes property will be called automatically
-        # and will pull fresh data from the sensor entities
+        _LOGGER.info("✅ Successfully set Deluge speeds: %s", applied)
+        await self.coordinator.async_boost()
+        return applied
+
+    def _data_fingerprint(self):
+        """Return the part of the coordinator data this switch displays."""
+        data = self.coordinator.data
+        if not data:
+            return (self.coordinator.last_update_success,)
+        return (
+            self.coordinator.last_update_success,
+            data["download_rate"],
+            data["upload_rate"],
+            data["total_torrents"],
+            data["active_torrents"],
+            data["downloading_torrents"],
+            data["seeding_torrents"],
+            data["status"],
+            tuple(
+                (t.id, t.state, t.progress, t.download_rate, t.upload_rate)
+                for t in data["torrents"][:5]
+            ),
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when the data shown by the switch changed."""
+        # Follow limits set elsewhere (schedule, set_speed, Deluge UI) when they match a preset
+        limits = self.coordinator.speed_limits()
+        if limits is not None and self.coordinator.last_update_success:
+            state = self._state_for_limits(*limits)
+            if state is not None:
+                self._is_on = state
+        # Recover from a failed bootstrap or write as soon as Deluge answers again
+        self._available = self.coordinator.last_update_success
+        fingerprint = (self._is_on, self._available, self._data_fingerprint())
+        if fingerprint == self._shown_data:
+            return
+        self._shown_data = fingerprint
+        self.async_write_ha_state()
 
     @property
     def is_on(self):
@@ -1086,6 +833,13 @@ class DelugeSpeedToggleSwitch(SwitchEntity):
     
     @property
     def extra_state_attributes(self):
+        """Return extra state attributes, rebuilt only when their inputs change."""
+        return self._attributes_cache.get(
+            (self.coordinator.generation, self.coordinator.last_update_success, self._is_on),
+            self._build_attributes,
+        )
+
+    def _build_attributes(self):
         """Return extra state attributes including monitoring data."""
         preset1_down = self.config.get(CONF_PRESET1_DOWNLOAD, DEFAULT_PRESET1_DOWNLOAD)
         preset1_up = self.config.get(CONF_PRESET1_UPLOAD, DEFAULT_PRESET1_UPLOAD)
@@ -1102,56 +856,37 @@ class DelugeSpeedToggleSwitch(SwitchEntity):
             "deluge_host": f"{self.config.get('host', 'localhost')}:{self.config.get('port', 8112)}"
         }
         
-        # Try to get live monitoring data from sensor entities
-        try:
-            # Get sensor states from the registry
-            download_speed_entity = self.hass.states.get("sensor.deluge_download_speed")
-            upload_speed_entity = self.hass.states.get("sensor.deluge_upload_speed")
-            torrent_count_entity = self.hass.states.get("sensor.deluge_torrent_count")
-            active_torrents_entity = self.hass.states.get("sensor.deluge_active_torrents")
-            status_entity = self.hass.states.get("sensor.deluge_status")
+        # Live monitoring data straight from the shared coordinator
+        data = self.coordinator.data
+        if data:
+            download_speed = data["download_rate"]
+            upload_speed = data["upload_rate"]
             
-            if download_speed_entity and download_speed_entity.state not in ["unknown", "unavailable"]:
-                # Add current speeds
-                download_speed = float(download_speed_entity.state) if download_speed_entity.state else 0
-                upload_speed = float(upload_speed_entity.state) if upload_speed_entity and upload_speed_entity.state else 0
-                
-                # Convert bytes/sec to KB/s for better readability
-                download_kbps = round(download_speed / 1024, 2) if download_speed > 0 else 0
-                upload_kbps = round(upload_speed / 1024, 2) if upload_speed > 0 else 0
-                
-                attributes.update({
-                    "current_download_speed": f"{download_kbps} KB/s",
-                    "current_upload_speed": f"{upload_kbps} KB/s",
-                    "download_speed_bytes": download_speed,
-                    "upload_speed_bytes": upload_speed,
-                })
-            
-            if torrent_count_entity and torrent_count_entity.state not in ["unknown", "unavailable"]:
-                # Add torrent counts
-                attributes.update({
-                    "total_torrents": torrent_count_entity.state,
-                    "active_torrents": torrent_count_entity.attributes.get("active_torrents", 0),
-                    "downloading_torrents": torrent_count_entity.attributes.get("downloading", 0),
-                    "seeding_torrents": torrent_count_entity.attributes.get("seeding", 0),
-                })
+            # Convert bytes/sec to KB/s for better readability
+            download_kbps = round(download_speed / 1024, 2) if download_speed > 0 else 0
+            upload_kbps = round(upload_speed / 1024, 2) if upload_speed > 0 else 0
             
-            if active_torrents_entity:
-                # Add active torrents list (up to 5 most recent for display)
-                torrents = active_torrents_entity.attributes.get("torrents", [])
-                if torrents:
-                    attributes["torrent_list"] = torrents[:5]  # Limit to first 5 for display
-                    attributes["torrent_count_display"] = len(torrents)
+            attributes.update({
+                "current_download_speed": f"{download_kbps} KB/s",
+                "current_upload_speed": f"{upload_kbps} KB/s",
+                "download_speed_bytes": download_speed,
+                "upload_speed_bytes": upload_speed,
+                "total_torrents": data["total_torrents"],
+                "active_torrents": data["active_torrents"],
+                "downloading_torrents": data["downloading_torrents"],
+                "seeding_torrents": data["seeding_torrents"],
+            })
             
-            if status_entity:
-                # Add connection status
-                attributes.update({
-                    "connection_status": status_entity.state,
-                    "last_update": status_entity.attributes.get("last_update", "Never"),
-                })
-                
-        except Exception as err:
-            _LOGGER.debug("Could not fetch sensor data for switch attributes: %s", err)
-            # Continue with basic attributes if sensor data unavailable
+            torrents = data["torrents"]
+            if torrents:
+                # Limit to first 5 for display
+                attributes["torrent_list"] = [t.as_dict(SWITCH_TORRENT_FIELDS) for t in torrents[:5]]
+                attributes["torrent_count_display"] = len(torrents)
+        
+        # Add connection status
+        attributes.update({
+            "connection_status": data["status"] if data and self.coordinator.last_update_success else "Disconnected",
+            "last_update": self.coordinator.last_update_success,
+        })
         
         return attributes